@@ -1,9 +1,3 @@
-from .models import Motorista
-
-def stats_context(request):
-    """Adiciona estatísticas globais ao contexto"""
-    if request.user.is_authenticated:
-        return {
-            'global_total_motoristas': Motorista.objects.count(),
-        }
-    return {}
\ No newline at end of file
+# Mantido por compatibilidade: a implementação (preguiçosa e com cache) fica no app drivers.
+# Em settings.TEMPLATES use 'drivers.context_processors.stats_context'.
+from drivers.context_processors import stats_context  # noqa: F401
@@ -1,13 +1,23 @@
 from django.contrib import admin
-from .models import Motorista
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from .forms import ImportarMotoristasForm
+from .importacao import ErroImportacao, importar_motoristas
+from .models import Motorista, NotificacaoPendente, ReportJob, TarefaCadastro
+from .templatetags.fotos import foto_motorista
 
 @admin.register(Motorista)
 class MotoristaAdmin(admin.ModelAdmin):
     list_display = [
-        'nome_completo', 'cpf_formatado', 'mei_numero', 'idade', 'cidade', 'estado',
+        'foto_miniatura', 'nome_completo', 'cpf_formatado', 'mei_numero', 'idade', 'cidade', 'estado',
         'cnh_categoria', 'status', 'created_at'
     ]
+    list_display_links = ['foto_miniatura', 'nome_completo']
     list_filter = ['status', 'estado', 'cnh_categoria', 'created_at']
+    # Ordenação total pelo índice (nome_completo, id); sem isso o admin acrescenta '-pk' e ordena em memória
+    ordering = ['nome_completo', 'id']
     search_fields = ['nome_completo', 'cpf', 'mei_numero', 'cnh_numero', 'cidade']
     readonly_fields = ['created_at', 'updated_at']
     fieldsets = [
@@ -39,7 +49,81 @@ class MotoristaAdmin(admin.ModelAdmin):
         }),
     ]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Usa o índice de busca (FTS5/pg_trgm) em vez de icontains em cada campo
+        if not search_term:
+            return queryset, False
+        return queryset.filtrar(search=search_term), False
+
     def cpf_formatado(self, obj):
         return obj.cpf_formatado
 
-    cpf_formatado.short_description = 'CPF'
\ No newline at end of file
+    cpf_formatado.short_description = 'CPF'
+
+    @admin.display(description='Foto')
+    def foto_miniatura(self, obj):
+        return foto_motorista(obj, 'mini', exibir=32)
+
+    # ✅ Importação em massa (CSV/XLSX) pelo botão "Importar" da lista
+    ERROS_EXIBIDOS = 500
+
+    def get_urls(self):
+        return [
+            path('importar/', self.admin_site.admin_view(self.importar_view), name='drivers_motorista_importar'),
+        ] + super().get_urls()
+
+    def importar_view(self, request):
+        if not self.has_add_permission(request):
+            return redirect('admin:drivers_motorista_changelist')
+
+        resultado = None
+        form = ImportarMotoristasForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            arquivo = form.cleaned_data['arquivo']
+            try:
+                resultado = importar_motoristas(arquivo, arquivo.name, simular=form.cleaned_data['simular'])
+            except ErroImportacao as e:
+                form.add_error('arquivo', str(e))
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Importar motoristas',
+            'form': form,
+            'resultado': resultado,
+            'erros': resultado.erros[:self.ERROS_EXIBIDOS] if resultado else [],
+            'erros_ocultos': max(len(resultado.erros) - self.ERROS_EXIBIDOS, 0) if resultado else 0,
+        }
+        return TemplateResponse(request, 'admin/drivers/motorista/importar.html', context)
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'status', 'solicitado_por', 'tamanho_bytes', 'duracao_segundos', 'created_at']
+    list_filter = ['tipo', 'status']
+    readonly_fields = ['created_at', 'iniciado_em', 'concluido_em', 'duracao_segundos', 'tamanho_bytes']
+
+
+@admin.register(NotificacaoPendente)
+class NotificacaoPendenteAdmin(admin.ModelAdmin):
+    list_display = ['id', 'nome_motorista', 'status', 'tentativas', 'proxima_tentativa', 'created_at', 'enviada_em']
+    list_filter = ['status']
+    search_fields = ['nome_motorista', 'referencia']
+    raw_id_fields = ['motorista']
+    readonly_fields = ['reservado_por', 'reservado_em', 'ultimo_erro', 'created_at', 'enviada_em']
+    actions = ['reenviar']
+
+    @admin.action(description='Reenviar notificações selecionadas')
+    def reenviar(self, request, queryset):
+        total = queryset.exclude(status='PROCESSANDO').update(
+            status='PENDENTE', tentativas=0, proxima_tentativa=timezone.now(), reservado_por='', reservado_em=None
+        )
+        self.message_user(request, f'{total} notificação(ões) devolvida(s) à fila.')
+
+
+@admin.register(TarefaCadastro)
+class TarefaCadastroAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'motorista', 'status', 'tentativas', 'duracao_segundos', 'created_at']
+    list_filter = ['tipo', 'status']
+    raw_id_fields = ['motorista']
+    readonly_fields = ['reservado_por', 'erro', 'created_at', 'iniciada_em', 'concluida_em', 'duracao_segundos']
@@ -0,0 +1,190 @@
+# drivers/api.py
+"""
+API de leitura dos motoristas (/api/motoristas/) para o sistema de despacho.
+
+- Paginação por cursor em (created_at, id), a mesma da lista de motoristas (drivers/paginacao.py).
+- ?fields=id,nome_completo,status: só essas colunas saem do banco (.values() na lista, .only() no detalhe).
+- Lista pelo caminho rápido: as linhas de .values() viram JSON sem instanciar Motorista nem passar
+  campo a campo pelo serializer; só datas, decimais e a foto são convertidos, com as mesmas regras
+  do MotoristaSerializer.
+- Filtros só em colunas indexadas: status, estado, cnh_categoria, cnh_vence_ate e search.
+- ETag pela impressão digital do recorte (quantidade + maior updated_at + parâmetros): quem consulta
+  a lista sem mudança nenhuma recebe 304 depois de uma única consulta agregada.
+"""
+import zlib
+from datetime import date
+from functools import lru_cache
+
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from rest_framework import fields as drf_fields
+from rest_framework import generics, relations
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Motorista
+from .paginacao import paginar_por_cursor
+from .replicas import LeituraReplicaMixin
+from .serializers import MotoristaSerializer
+
+# Campos que o serializer devolve como vieram do banco (o caminho rápido não converte)
+CAMPOS_SEM_CONVERSAO = (
+    drf_fields.CharField, drf_fields.ChoiceField, drf_fields.IntegerField,
+    drf_fields.BooleanField, relations.PrimaryKeyRelatedField,
+)
+
+FILTROS_ESCOLHA = {
+    'status': dict(Motorista.STATUS_CHOICES),
+    'estado': dict(Motorista.ESTADO_CHOICES),
+    'cnh_categoria': dict(Motorista.CATEGORIA_CNH_CHOICES),
+}
+
+
+@lru_cache(maxsize=None)
+def campos_disponiveis():
+    return tuple(MotoristaSerializer().fields)
+
+
+def campos_pedidos(request):
+    """Campos de ?fields= (na ordem do serializer) ou todos. Campo desconhecido é erro 400."""
+    parametro = request.query_params.get('fields')
+    if not parametro:
+        return campos_disponiveis()
+    pedidos = {campo.strip() for campo in parametro.split(',') if campo.strip()}
+    desconhecidos = pedidos - set(campos_disponiveis())
+    if desconhecidos:
+        raise ValidationError({'fields': [f"Campo(s) desconhecido(s): {', '.join(sorted(desconhecidos))}."]})
+    return tuple(campo for campo in campos_disponiveis() if campo in pedidos)
+
+
+def filtrar_motoristas(queryset, parametros):
+    """Aplica os filtros da API; cada um é atendido por um índice de Motorista."""
+    for nome, opcoes in FILTROS_ESCOLHA.items():
+        valor = parametros.get(nome)
+        if valor:
+            if valor not in opcoes:
+                raise ValidationError({nome: [f"Valor inválido: '{valor}'. Opções: {', '.join(opcoes)}."]})
+            queryset = queryset.filter(**{nome: valor})
+
+    vence_ate = parametros.get('cnh_vence_ate')
+    if vence_ate:
+        try:
+            queryset = queryset.filter(cnh_validade__lte=date.fromisoformat(vence_ate))
+        except ValueError:
+            raise ValidationError({'cnh_vence_ate': ['Use o formato AAAA-MM-DD.']})
+
+    return queryset.filtrar(search=parametros.get('search'))
+
+
+def conversores(campos, request):
+    """
+    Para cada campo, a função que o serializer aplicaria ao valor cru de .values(),
+    ou None quando o valor já sai pronto (texto, inteiro, booleano, chave estrangeira).
+    """
+    serializer = MotoristaSerializer(fields=campos, context={'request': request})
+    resultado = []
+    for campo in campos:
+        campo_serializer = serializer.fields[campo]
+        if isinstance(campo_serializer, CAMPOS_SEM_CONVERSAO):
+            resultado.append((campo, None))
+        elif isinstance(campo_serializer, drf_fields.FileField):
+            storage = Motorista._meta.get_field(campo).storage
+            resultado.append((campo, lambda nome: request.build_absolute_uri(storage.url(nome))))
+        else:
+            resultado.append((campo, campo_serializer.to_representation))
+    return resultado
+
+
+def serializar_linhas(linhas, campos, request):
+    """Caminho rápido da lista: dicionários de .values() -> dicionários da resposta."""
+    pares = conversores(campos, request)
+    return [
+        {
+            campo: linha[campo] if converter is None else _converter(converter, linha[campo])
+            for campo, converter in pares
+        }
+        for linha in linhas
+    ]
+
+
+def _converter(converter, valor):
+    # Como no serializer: valor nulo (ou foto vazia) sai como null
+    return None if valor is None or valor == '' else converter(valor)
+
+
+class PaginacaoCursorMotoristas(BasePagination):
+    """Adapta paginar_por_cursor ao DRF: ?cursor= e ?page_size= (até 500)."""
+    tamanho_padrao = 100
+    tamanho_maximo = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            tamanho = int(request.query_params.get('page_size', self.tamanho_padrao))
+        except ValueError:
+            raise ValidationError({'page_size': ['Informe um número inteiro.']})
+        tamanho = max(1, min(tamanho, self.tamanho_maximo))
+        self.pagina = paginar_por_cursor(queryset, request.query_params.get('cursor'), tamanho)
+        return self.pagina.object_list
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), 'cursor', cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self._link(self.pagina.proximo_cursor),
+            'previous': self._link(self.pagina.cursor_anterior),
+            'results': data,
+        })
+
+
+class MotoristaListaAPI(LeituraReplicaMixin, generics.ListAPIView):
+    """GET /api/motoristas/ - lista paginada por cursor, com filtros e campos escolhidos."""
+    serializer_class = MotoristaSerializer
+    pagination_class = PaginacaoCursorMotoristas
+
+    def get_queryset(self):
+        return filtrar_motoristas(Motorista.objects.all(), self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        campos = campos_pedidos(request)
+        queryset = self.get_queryset()
+
+        # O cursor faz parte dos parâmetros: cada página tem a sua ETag
+        parametros = sorted((chave, valores) for chave, valores in request.query_params.lists())
+        etag = f'"{queryset.impressao_digital("api", parametros)}"'
+        nao_modificado = get_conditional_response(request._request, etag=etag)
+        if nao_modificado is not None:
+            nao_modificado['ETag'] = etag
+            return nao_modificado
+
+        # created_at e id sempre vêm do banco: são a posição do cursor
+        colunas = {*campos, 'created_at', 'id'}
+        linhas = self.paginate_queryset(queryset.values(*colunas))
+        response = self.get_paginated_response(serializar_linhas(linhas, campos, request))
+        response['ETag'] = etag
+        return response
+
+
+class MotoristaDetalheAPI(LeituraReplicaMixin, generics.RetrieveAPIView):
+    """GET /api/motoristas/<id>/ - um motorista, com ?fields= e ETag pelo updated_at."""
+    serializer_class = MotoristaSerializer
+
+    def retrieve(self, request, pk, *args, **kwargs):
+        campos = campos_pedidos(request)
+        motorista = get_object_or_404(Motorista.objects.only(*campos, 'updated_at'), pk=pk)
+
+        etag = f'"{pk}-{motorista.updated_at.timestamp()}-{zlib.crc32(",".join(campos).encode()):x}"'
+        nao_modificado = get_conditional_response(request._request, etag=etag)
+        if nao_modificado is not None:
+            nao_modificado['ETag'] = etag
+            return nao_modificado
+
+        serializer = MotoristaSerializer(motorista, fields=campos, context={'request': request})
+        response = Response(serializer.data)
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    # 🚚 Leitura para o sistema de despacho (somente GET, staff)
+    path('motoristas/', api.MotoristaListaAPI.as_view(), name='motorista_list'),
+    path('motoristas/<int:pk>/', api.MotoristaDetalheAPI.as_view(), name='motorista_detail'),
+]
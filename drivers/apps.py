@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class DriversConfig(AppConfig):
@@ -9,4 +10,17 @@ class DriversConfig(AppConfig):
     name = 'drivers'
 
     # Nome que aparecerá no Admin (opcional, mas profissional)
-    verbose_name = 'Cadastro de Motoristas'
\ No newline at end of file
+    verbose_name = 'Cadastro de Motoristas'
+
+    def ready(self):
+        # Registra os signals que mantêm as estatísticas materializadas
+        from . import signals  # noqa: F401
+
+        # Recria o índice de busca se o migrate tiver recriado a tabela de motoristas
+        post_migrate.connect(garantir_indice_busca_apos_migrate, sender=self)
+
+
+def garantir_indice_busca_apos_migrate(sender, using='default', **kwargs):
+    from django.db import connections
+    from .busca import garantir_indice_busca
+    garantir_indice_busca(connections[using])
@@ -0,0 +1,166 @@
+# drivers/busca.py
+"""
+Índice de busca de motoristas.
+
+Cada Motorista guarda em `busca_texto` o nome, a cidade e os documentos (só dígitos)
+sem acentos e em minúsculas. Sobre essa coluna:
+- SQLite: tabela virtual FTS5 (external content) mantida por triggers, com busca por prefixo e ranking bm25;
+- PostgreSQL: índice GIN com pg_trgm, usado pelo LIKE '%termo%' e pela similaridade de trigramas;
+- outros bancos: LIKE '%termo%' simples na coluna normalizada.
+"""
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+
+TABELA_MOTORISTA = 'drivers_motorista'
+TABELA_FTS = 'drivers_motorista_fts'
+INDICE_TRGM = 'drivers_motorista_busca_trgm'
+
+TRIGGERS_FTS = {
+    f'{TABELA_FTS}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_ai AFTER INSERT ON {TABELA_MOTORISTA} BEGIN
+            INSERT INTO {TABELA_FTS}(rowid, busca_texto) VALUES (new.id, new.busca_texto);
+        END""",
+    f'{TABELA_FTS}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_ad AFTER DELETE ON {TABELA_MOTORISTA} BEGIN
+            INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, busca_texto) VALUES ('delete', old.id, old.busca_texto);
+        END""",
+    f'{TABELA_FTS}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_au AFTER UPDATE OF busca_texto ON {TABELA_MOTORISTA} BEGIN
+            INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, busca_texto) VALUES ('delete', old.id, old.busca_texto);
+            INSERT INTO {TABELA_FTS}(rowid, busca_texto) VALUES (new.id, new.busca_texto);
+        END""",
+}
+
+# Pontuação entre dígitos some na normalização, para "123.456.789-09" casar com "12345678909"
+_PONTUACAO_DOCUMENTO = re.compile(r'(?<=\d)[.\-/](?=\d)')
+_TOKENS = re.compile(r'\w+')
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sem acentos e sem pontuação dentro de números (CPF, CNH, MEI)."""
+    texto = unicodedata.normalize('NFKD', str(texto or ''))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return _PONTUACAO_DOCUMENTO.sub('', texto.lower())
+
+
+def montar_texto_busca(nome_completo, cidade, cpf, cnh_numero, mei_numero):
+    return ' '.join(
+        normalizar_texto(parte) for parte in (nome_completo, cidade, cpf, cnh_numero, mei_numero) if parte
+    )
+
+
+def tokens_busca(termo):
+    return _TOKENS.findall(normalizar_texto(termo))
+
+
+def _fts_disponivel(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [TABELA_FTS])
+        return cursor.fetchone() is not None
+
+
+def _expressao_fts(tokens):
+    # Cada token vira um prefixo entre aspas: joao silv -> "joao"* "silv"*
+    return ' '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+
+
+def garantir_indice_busca(connection):
+    """
+    Cria (se necessário) a estrutura de busca do banco. É idempotente e roda após cada migrate,
+    porque o SQLite descarta os triggers quando o Django recria a tabela de motoristas.
+    """
+    with connection.cursor() as cursor:
+        if TABELA_MOTORISTA not in connection.introspection.table_names(cursor):
+            return
+        colunas = {
+            coluna.name for coluna in connection.introspection.get_table_description(cursor, TABELA_MOTORISTA)
+        }
+    if 'busca_texto' not in colunas:
+        # Banco migrado para antes da coluna de busca
+        return
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [TABELA_MOTORISTA]
+            )
+            existentes = {linha[0] for linha in cursor.fetchall()}
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FTS} USING fts5("
+                f"busca_texto, content='{TABELA_MOTORISTA}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            for sql in TRIGGERS_FTS.values():
+                cursor.execute(sql)
+            if not set(TRIGGERS_FTS) <= existentes:
+                # Triggers ausentes: o índice pode estar desatualizado, reconstrói a partir da tabela
+                cursor.execute(f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')")
+
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {INDICE_TRGM} ON {TABELA_MOTORISTA} '
+                f'USING gin (busca_texto gin_trgm_ops)'
+            )
+
+
+def remover_indice_busca(connection):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for nome in TRIGGERS_FTS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {nome}')
+            cursor.execute(f'DROP TABLE IF EXISTS {TABELA_FTS}')
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX IF EXISTS {INDICE_TRGM}')
+
+
+def reconstruir_indice_busca(connection):
+    """Reconstrói o índice FTS5 a partir da coluna busca_texto (no PostgreSQL o GIN é mantido pelo banco)."""
+    garantir_indice_busca(connection)
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')")
+
+
+def filtrar_busca(queryset, termo):
+    """Filtra o queryset pelos motoristas que casam com todos os termos (por prefixo)."""
+    tokens = tokens_busca(termo)
+    if not tokens:
+        return queryset.none()
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'sqlite' and _fts_disponivel(connection):
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s', [_expressao_fts(tokens)]
+        ))
+
+    # PostgreSQL (índice de trigramas) e demais bancos
+    for token in tokens:
+        queryset = queryset.filter(busca_texto__contains=token)
+    return queryset
+
+
+def anotar_relevancia(queryset, termo):
+    """Anota `relevancia` (maior = mais relevante) para ordenar resultados de busca."""
+    tokens = tokens_busca(termo)
+    connection = connections[queryset.db]
+
+    if tokens and connection.vendor == 'sqlite' and _fts_disponivel(connection):
+        return queryset.annotate(relevancia=RawSQL(
+            f'SELECT -rank FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s '
+            f'AND {TABELA_FTS}.rowid = {TABELA_MOTORISTA}.id',
+            [_expressao_fts(tokens)],
+            output_field=FloatField(),
+        ))
+
+    if tokens and connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        return queryset.annotate(relevancia=TrigramWordSimilarity(' '.join(tokens), 'busca_texto'))
+
+    return queryset.annotate(relevancia=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,124 @@
+# drivers/cache_relatorios.py
+"""
+Cache em disco dos relatórios gerados, endereçado pelo conteúdo.
+
+Cada arquivo é guardado em MEDIA_ROOT/relatorios/cache/<impressão digital>.<extensão>. A impressão
+digital resume tudo o que muda o relatório: tipo, filtros, quantidade de motoristas do recorte,
+maior updated_at e a data de hoje (idades e o "Gerado em" dependem dela). Enquanto nenhum motorista
+for criado, alterado ou excluído no mesmo dia, o mesmo pedido aponta para o mesmo arquivo e nada é
+gerado de novo.
+
+Quando a pasta passa de RELATORIOS_CACHE_MAX_MB, os arquivos acessados há mais tempo são removidos
+(LRU): o atime é gravado explicitamente a cada download e o mtime guarda a data da geração.
+"""
+import os
+import tempfile
+import time
+from datetime import date
+
+from django.conf import settings
+
+from .models import Motorista
+
+PASTA_CACHE = os.path.join('relatorios', 'cache')
+EXTENSOES = {'EXCEL': '.xlsx', 'PDF': '.pdf', 'ESTATISTICAS': '.xlsx'}
+
+# Incrementar quando o layout de algum relatório mudar (invalida todos os arquivos guardados)
+VERSAO_FORMATO = 2
+
+
+def _pasta():
+    return os.path.join(settings.MEDIA_ROOT, PASTA_CACHE)
+
+
+def normalizar_parametros(parametros):
+    return {chave: valor for chave, valor in sorted((parametros or {}).items()) if valor}
+
+
+def impressao_digital(tipo, parametros):
+    """Hash (sha256) do tipo, dos filtros, da data e do estado atual dos motoristas do recorte (uma consulta)."""
+    parametros = normalizar_parametros(parametros)
+    if tipo == 'ESTATISTICAS':
+        queryset = Motorista.objects.all()
+    else:
+        queryset = Motorista.objects.filtrar(status=parametros.get('status'), search=parametros.get('search'))
+    return queryset.impressao_digital(VERSAO_FORMATO, tipo, parametros, date.today().isoformat())
+
+
+def nome_em_cache(tipo, impressao):
+    """Nome relativo a MEDIA_ROOT (o mesmo gravado em ReportJob.arquivo)."""
+    return os.path.join(PASTA_CACHE, f'{impressao}{EXTENSOES[tipo]}')
+
+
+def buscar(tipo, impressao):
+    """Caminho do arquivo guardado para esta impressão digital, ou None. Marca o acesso para o LRU."""
+    caminho = os.path.join(settings.MEDIA_ROOT, nome_em_cache(tipo, impressao))
+    try:
+        marcar_acesso(caminho)
+    except FileNotFoundError:
+        return None
+    return caminho
+
+
+def marcar_acesso(caminho):
+    os.utime(caminho, (time.time(), os.stat(caminho).st_mtime))
+
+
+def guardar(tipo, impressao, arquivo):
+    """
+    Copia o arquivo gerado (aberto, posicionado no início) para o cache e remove os menos usados
+    se a pasta passar do limite. Retorna o nome relativo a MEDIA_ROOT.
+    """
+    pasta = _pasta()
+    os.makedirs(pasta, exist_ok=True)
+    nome = nome_em_cache(tipo, impressao)
+    destino = os.path.join(settings.MEDIA_ROOT, nome)
+    # Grava num temporário da mesma pasta e troca de uma vez: nenhum download vê um arquivo pela metade
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.parcial')
+    try:
+        with os.fdopen(descritor, 'wb') as saida:
+            while bloco := arquivo.read(1024 * 1024):
+                saida.write(bloco)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    despejar(manter=destino)
+    return nome
+
+
+def despejar(manter=None, limite_bytes=None):
+    """Remove os arquivos acessados há mais tempo até a pasta caber no limite. Retorna quantos removeu."""
+    if limite_bytes is None:
+        limite_bytes = settings.RELATORIOS_CACHE_MAX_MB * 1024 * 1024
+    try:
+        # Os .parcial ainda estão sendo gravados por outro processo
+        entradas = [
+            entrada for entrada in os.scandir(_pasta())
+            if entrada.is_file() and not entrada.name.endswith('.parcial')
+        ]
+    except FileNotFoundError:
+        return 0
+
+    arquivos = []
+    for entrada in entradas:
+        try:
+            info = entrada.stat()
+        except FileNotFoundError:
+            continue
+        arquivos.append((info.st_atime, info.st_size, entrada.path))
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+
+    removidos = 0
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite_bytes:
+            break
+        if caminho == manter:
+            continue
+        try:
+            os.unlink(caminho)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+        removidos += 1
+    return removidos
@@ -1,15 +1,27 @@
 from django.conf import settings
-from .models import Motorista
+from django.utils.functional import SimpleLazyObject
+
+from .services_estatisticas import contadores_globais
 
 
 def stats_context(request):
-    """Adiciona estatísticas globais ao contexto"""
-    return {
-        'global_total_motoristas': Motorista.objects.count(),
-        'global_motoristas_ativos': Motorista.objects.filter(status='ATIVO').count(),
-        'app_name': settings.MOTORISTA_POWER_CONFIG['APP_NAME'],
-        'app_version': settings.MOTORISTA_POWER_CONFIG['VERSION'],
+    """
+    Adiciona estatísticas globais ao contexto.
+    Os contadores são preguiçosos: só consultam (o cache ou o banco) se o template os exibir,
+    e nem são oferecidos a visitantes anônimos (ex.: página de login).
+    """
+    config = getattr(settings, 'MOTORISTA_POWER_CONFIG', {})
+    contexto = {
+        'app_name': config.get('APP_NAME', 'MotoristaPower'),
+        'app_version': config.get('VERSION', ''),
     }
+    usuario = getattr(request, 'user', None)
+    if usuario is not None and usuario.is_authenticated:
+        contexto.update({
+            'global_total_motoristas': SimpleLazyObject(lambda: contadores_globais()['total']),
+            'global_motoristas_ativos': SimpleLazyObject(lambda: contadores_globais()['ativos']),
+        })
+    return contexto
 
 
 def mobile_context(request):
@@ -20,4 +32,4 @@ def mobile_context(request):
         'is_mobile': user_agent.is_mobile if user_agent else False,
         'is_tablet': user_agent.is_tablet if user_agent else False,
         'is_touch_capable': user_agent.is_touch_capable if user_agent else False,
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,107 @@
+# drivers/despachante.py
+"""
+Despachante assíncrono da fila de notificações.
+
+Reserva lotes da tabela NotificacaoPendente e envia cada item pelo transporte escolhido
+(drivers/transportes.py) com asyncio: até `concorrencia` envios simultâneos, respeitando
+o limite de envios por segundo e o timeout do transporte. O acesso ao banco roda em thread
+(sync_to_async), então vários despachantes podem consumir a mesma fila em paralelo.
+"""
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+from .services_notificacoes import liberar_travadas, marcar_enviadas, registrar_falha, reservar_notificacoes
+
+logger = logging.getLogger(__name__)
+
+
+class LimiteTaxa:
+    """Espaça as chamadas de aguardar() para no máximo `por_segundo` por segundo."""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo
+        self.proximo = 0.0
+        self.trava = asyncio.Lock()
+
+    async def aguardar(self):
+        async with self.trava:
+            agora = asyncio.get_running_loop().time()
+            espera = self.proximo - agora
+            self.proximo = max(agora, self.proximo) + self.intervalo
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+def _registrar_resultados(enviadas, falhas):
+    marcar_enviadas(enviadas)
+    for notificacao, erro in falhas:
+        registrar_falha(notificacao, erro)
+
+
+async def _enviar_um(transporte, notificacao, semaforo, limite):
+    async with semaforo:
+        if limite:
+            await limite.aguardar()
+        try:
+            await asyncio.wait_for(transporte.enviar(notificacao), timeout=transporte.timeout)
+        except asyncio.TimeoutError:
+            return notificacao, f'Timeout de {transporte.timeout}s no transporte {transporte.nome}'
+        except Exception as e:
+            return notificacao, f'{e.__class__.__name__}: {e}'
+        return notificacao, None
+
+
+async def despachar(transporte, concorrencia=None, lote=200, continuo=False, intervalo=2.0):
+    """
+    Esvazia a fila (ou, com continuo=True, fica aguardando novas notificações).
+    Retorna um dict com enviadas, falhas, duração e taxa de envio.
+    """
+    concorrencia = min(concorrencia or transporte.concorrencia, transporte.concorrencia)
+    semaforo = asyncio.Semaphore(concorrencia)
+    limite = LimiteTaxa(transporte.por_segundo) if transporte.por_segundo else None
+    total_enviadas = total_falhas = 0
+    inicio = time.monotonic()
+
+    await transporte.abrir()
+    try:
+        await sync_to_async(liberar_travadas)()
+        while True:
+            notificacoes = await sync_to_async(reservar_notificacoes)(lote)
+            if not notificacoes:
+                if not continuo:
+                    break
+                await asyncio.sleep(intervalo)
+                await sync_to_async(liberar_travadas)()
+                continue
+
+            resultados = await asyncio.gather(*(
+                _enviar_um(transporte, notificacao, semaforo, limite) for notificacao in notificacoes
+            ))
+            enviadas = [notificacao for notificacao, erro in resultados if erro is None]
+            falhas = [(notificacao, erro) for notificacao, erro in resultados if erro is not None]
+            for notificacao, erro in falhas:
+                logger.warning('Falha ao enviar notificação %s: %s', notificacao.pk, erro)
+
+            await sync_to_async(_registrar_resultados)(enviadas, falhas)
+            total_enviadas += len(enviadas)
+            total_falhas += len(falhas)
+    finally:
+        await transporte.fechar()
+        await sync_to_async(connections.close_all)()
+
+    duracao = time.monotonic() - inicio
+    return {
+        'enviadas': total_enviadas,
+        'falhas': total_falhas,
+        'duracao': duracao,
+        'por_segundo': total_enviadas / duracao if duracao else 0,
+    }
+
+
+def despachar_notificacoes(transporte, **opcoes):
+    """Versão síncrona de despachar() para comandos e scripts."""
+    return asyncio.run(despachar(transporte, **opcoes))
@@ -1,5 +1,6 @@
 from django import forms
 from .models import Motorista
+from .validators.cpf_validators import MENSAGENS, verificar_cpf
 from datetime import date
 import re
 
@@ -55,6 +56,9 @@ class MotoristaForm(forms.ModelForm):
         if cpf:
             if not re.match(r'^\d{3}\.\d{3}\.\d{3}-\d{2}$', cpf):
                 raise forms.ValidationError('CPF deve estar no formato: 000.000.000-00 (14 caracteres)')
+            erro = verificar_cpf(cpf)
+            if erro:
+                raise forms.ValidationError(MENSAGENS[erro])
             return cpf
         return cpf
 
@@ -93,4 +97,19 @@ class MotoristaForm(forms.ModelForm):
                 self.add_error('cnh_emissao', 'Data de emissão deve ser anterior à data de validade.')
                 self.add_error('cnh_validade', 'Data de validade deve ser posterior à data de emissão.')
 
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+
+
+class ImportarMotoristasForm(forms.Form):
+    arquivo = forms.FileField(
+        label='Arquivo CSV ou XLSX',
+        help_text='Primeira linha com os nomes ou rótulos dos campos (ex.: nome_completo ou "Nome Completo").',
+        widget=forms.ClearableFileInput(attrs={'accept': '.csv,.xlsx'}),
+    )
+    simular = forms.BooleanField(label='Só validar (não gravar)', required=False)
+
+    def clean_arquivo(self):
+        arquivo = self.cleaned_data['arquivo']
+        if not arquivo.name.lower().endswith(('.csv', '.txt', '.xlsx')):
+            raise forms.ValidationError('Envie um arquivo .csv ou .xlsx.')
+        return arquivo
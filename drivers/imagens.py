@@ -0,0 +1,110 @@
+# drivers/imagens.py
+"""
+Versões reduzidas (renditions) das fotos de motoristas.
+
+Cada foto ganha miniaturas em WebP e JPEG limitadas por tamanho, sem EXIF, gravadas no mesmo
+storage com nomes determinísticos (hash do nome do arquivo original + versão, seguido do tamanho).
+Elas são geradas pela tarefa pós-cadastro FOTO, agendada sempre que a foto muda (signals.py), ou
+pelo comando gerar_renditions para as fotos antigas. Enquanto não existem, os templates usam a foto
+original: nenhuma imagem é redimensionada durante a renderização.
+"""
+import hashlib
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# nome -> maior lado em pixels (o dobro do tamanho exibido, para telas de alta densidade)
+TAMANHOS = {
+    'mini': 96,
+    'pequena': 400,
+    'media': 800,
+}
+FORMATOS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+# Miniaturas de avatar são recortadas em quadrado; as demais mantêm a proporção
+RECORTE_QUADRADO = {'mini'}
+DIRETORIO = 'motorista_fotos/renditions'
+# Mude para regerar todas as renditions (ex.: após alterar qualidade ou tamanhos)
+VERSAO = 1
+
+
+def nome_rendition(nome_original, tamanho, formato):
+    chave = hashlib.sha1(f'{nome_original}|{VERSAO}'.encode()).hexdigest()[:20]
+    extensao = 'jpg' if formato == 'jpeg' else formato
+    return posixpath.join(DIRETORIO, f'{chave}_{tamanho}.{extensao}')
+
+
+def _abrir_original(foto, maior_lado):
+    with foto.storage.open(foto.name, 'rb') as arquivo:
+        imagem = Image.open(arquivo)
+        # JPEG: decodifica já reduzido (1/2, 1/4, 1/8), bem mais rápido em fotos de 12 MP
+        imagem.draft('RGB', (maior_lado * 2, maior_lado * 2))
+        # Aplica a rotação do EXIF antes de descartá-lo (fotos de celular vêm "deitadas")
+        imagem = ImageOps.exif_transpose(imagem)
+        imagem.load()
+    return imagem
+
+
+def _codificar(imagem, tamanho, formato):
+    pil_formato, opcoes = FORMATOS[formato]
+    lado = TAMANHOS[tamanho]
+    if tamanho in RECORTE_QUADRADO:
+        copia = ImageOps.fit(imagem, (lado, lado), Image.Resampling.LANCZOS)
+    else:
+        copia = imagem.copy()
+        copia.thumbnail((lado, lado), Image.Resampling.LANCZOS)
+    if formato == 'jpeg' or copia.mode not in ('RGB', 'RGBA'):
+        copia = copia.convert('RGB')
+    saida = BytesIO()
+    # Sem exif=..., o Pillow não grava metadados (GPS, modelo do celular etc.)
+    copia.save(saida, pil_formato, **opcoes)
+    return saida.getvalue(), copia.size
+
+
+def gerar_renditions(foto, tamanhos=None, formatos=None):
+    """
+    Gera as renditions que ainda não existem para a foto (FieldFile). Abre o original uma vez só.
+    Retorna a lista de nomes gravados.
+    """
+    if not foto:
+        return []
+    pendentes = [
+        (tamanho, formato)
+        for tamanho in (tamanhos or TAMANHOS)
+        for formato in (formatos or FORMATOS)
+        if not foto.storage.exists(nome_rendition(foto.name, tamanho, formato))
+    ]
+    if not pendentes:
+        return []
+
+    imagem = _abrir_original(foto, max(TAMANHOS[tamanho] for tamanho, _ in pendentes))
+    gravados = []
+    for tamanho, formato in pendentes:
+        conteudo, _ = _codificar(imagem, tamanho, formato)
+        nome = nome_rendition(foto.name, tamanho, formato)
+        if not foto.storage.exists(nome):
+            foto.storage.save(nome, ContentFile(conteudo))
+        gravados.append(nome)
+    return gravados
+
+
+def url_rendition(foto, tamanho='mini', formato='jpeg'):
+    """URL da rendition, ou a da foto original enquanto a tarefa FOTO ainda não a gerou."""
+    if not foto:
+        return ''
+    nome = nome_rendition(foto.name, tamanho, formato)
+    if not foto.storage.exists(nome):
+        return foto.url
+    return foto.storage.url(nome)
+
+
+def remover_renditions(nome_original, storage):
+    for tamanho in TAMANHOS:
+        for formato in FORMATOS:
+            nome = nome_rendition(nome_original, tamanho, formato)
+            if storage.exists(nome):
+                storage.delete(nome)
@@ -0,0 +1,373 @@
+# drivers/importacao.py
+"""
+Importação em massa de motoristas a partir de CSV ou XLSX (frota de parceiros).
+
+O arquivo é lido em streaming (csv.DictReader / openpyxl read-only), cada linha passa pelas
+mesmas regras do MotoristaForm sem consultar o banco, e os duplicados de CPF, CNH e MEI são
+detectados contra conjuntos carregados uma única vez (banco + linhas anteriores do arquivo).
+As linhas válidas entram com bulk_create em lotes, cada lote na sua transação, junto com os
+deltas das estatísticas materializadas (bulk_create não dispara os signals).
+"""
+import csv
+import io
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from .busca import normalizar_texto
+from .models import Motorista, calcular_idade
+from .services_cache import invalidar_cache_motoristas_apos_commit
+from .services_estatisticas import registrar_delta
+from .validators.cpf_validators import MENSAGENS as MENSAGENS_CPF, verificar_cpf
+
+TAMANHO_LOTE = 1000
+
+CAMPOS_IMPORTACAO = (
+    'nome_completo', 'cpf', 'mei_numero', 'data_nascimento', 'email', 'telefone',
+    'cep', 'endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado',
+    'cnh_numero', 'cnh_categoria', 'cnh_validade', 'cnh_emissao',
+    'status', 'salario', 'observacoes',
+)
+CAMPOS_OBRIGATORIOS = (
+    'nome_completo', 'cpf', 'data_nascimento', 'email', 'telefone', 'cep', 'endereco', 'numero',
+    'bairro', 'cidade', 'estado', 'cnh_numero', 'cnh_categoria', 'cnh_validade', 'cnh_emissao',
+)
+CAMPOS_DATA = ('data_nascimento', 'cnh_validade', 'cnh_emissao')
+CAMPOS_UNICOS = ('cpf', 'cnh_numero', 'mei_numero')
+
+# Mesmos formatos exigidos pelo MotoristaForm e pelos validators do model
+FORMATOS = {
+    'cpf': (re.compile(r'^\d{3}\.\d{3}\.\d{3}-\d{2}$'), 'CPF deve estar no formato: 000.000.000-00'),
+    'mei_numero': (re.compile(r'^\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}$'),
+                   'MEI deve estar no formato: 00.000.000/0000-00'),
+    'telefone': (re.compile(r'^\(\d{2}\)\s?\d{4,5}-\d{4}$'), 'Telefone deve estar no formato: (00) 00000-0000'),
+}
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d')
+
+ESTADOS = {sigla for sigla, _ in Motorista.ESTADO_CHOICES}
+CATEGORIAS = {sigla for sigla, _ in Motorista.CATEGORIA_CNH_CHOICES}
+STATUS = {sigla for sigla, _ in Motorista.STATUS_CHOICES}
+# DecimalValidator do campo: recusa NaN/Infinity e valores que não cabem em max_digits/decimal_places
+VALIDADORES_SALARIO = Motorista._meta.get_field('salario').validators
+
+
+class ErroImportacao(Exception):
+    """Arquivo ilegível ou sem as colunas obrigatórias (erro do arquivo todo, não de uma linha)."""
+
+
+@dataclass
+class ResultadoImportacao:
+    lidas: int = 0
+    importadas: int = 0
+    simulado: bool = False
+    # (número da linha no arquivo, campo, mensagem)
+    erros: list = field(default_factory=list)
+
+    @property
+    def rejeitadas(self):
+        return len({linha for linha, _, _ in self.erros})
+
+
+def _chave_coluna(titulo):
+    return re.sub(r'\W+', '_', normalizar_texto(titulo).strip()).strip('_')
+
+
+def _mapa_colunas():
+    """Aceita no cabeçalho tanto o nome do campo (cnh_numero) quanto o rótulo (Número da CNH)."""
+    mapa = {}
+    for nome in CAMPOS_IMPORTACAO:
+        campo = Motorista._meta.get_field(nome)
+        mapa[_chave_coluna(nome)] = nome
+        mapa[_chave_coluna(campo.verbose_name)] = nome
+    return mapa
+
+
+def _indices_cabecalho(cabecalho):
+    mapa = _mapa_colunas()
+    indices = {}
+    for posicao, titulo in enumerate(cabecalho):
+        nome = mapa.get(_chave_coluna(titulo or ''))
+        if nome and nome not in indices:
+            indices[nome] = posicao
+    faltando = [nome for nome in CAMPOS_OBRIGATORIOS if nome not in indices]
+    if faltando:
+        raise ErroImportacao(f"Coluna(s) obrigatória(s) ausente(s): {', '.join(faltando)}")
+    return indices
+
+
+def _linhas_csv(arquivo):
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+    amostra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=';,\t')
+    except csv.Error:
+        dialeto = csv.excel
+    leitor = csv.reader(texto, dialeto)
+    try:
+        yield from leitor
+    finally:
+        # Não fecha o arquivo do chamador junto com o wrapper
+        texto.detach()
+
+
+def _linhas_xlsx(arquivo):
+    from openpyxl import load_workbook
+
+    try:
+        planilha = load_workbook(arquivo, read_only=True, data_only=True)
+    except Exception as e:
+        raise ErroImportacao(f'Planilha XLSX inválida: {e}')
+    try:
+        yield from planilha.active.iter_rows(values_only=True)
+    finally:
+        planilha.close()
+
+
+def ler_linhas(arquivo, nome_arquivo):
+    """
+    Percorre o arquivo (binário) linha a linha.
+    Gera (número da linha no arquivo, dict campo -> valor bruto), pulando linhas em branco.
+    """
+    if nome_arquivo.lower().endswith('.xlsx'):
+        linhas = _linhas_xlsx(arquivo)
+    elif nome_arquivo.lower().endswith(('.csv', '.txt')):
+        linhas = _linhas_csv(arquivo)
+    else:
+        raise ErroImportacao('Formato não suportado: envie um arquivo .csv ou .xlsx')
+
+    # Fecha o gerador aqui, com o arquivo do chamador ainda aberto (inclusive quando o cabeçalho
+    # é inválido); deixado para o coletor de lixo, o detach() do CSV rodaria com o arquivo já fechado
+    try:
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            raise ErroImportacao('Arquivo vazio.')
+        indices = _indices_cabecalho(cabecalho)
+
+        for numero, valores in enumerate(linhas, start=2):
+            if not any(valor not in (None, '') for valor in valores):
+                continue
+            yield numero, {
+                nome: valores[posicao] if posicao < len(valores) else None
+                for nome, posicao in indices.items()
+            }
+    finally:
+        linhas.close()
+
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        # Excel guarda números como float: 123.0 -> "123"
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def _data(valor):
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise ValueError
+
+
+def validar_linha(bruto, hoje=None):
+    """
+    Converte e valida uma linha com as regras do MotoristaForm (sem unicidade, que é checada em lote).
+    Retorna (dados, erros), com erros como lista de (campo, mensagem).
+    """
+    hoje = hoje or date.today()
+    dados = {}
+    erros = []
+
+    for nome in CAMPOS_IMPORTACAO:
+        valor = bruto.get(nome)
+        if nome in CAMPOS_DATA:
+            if valor in (None, ''):
+                dados[nome] = None
+            else:
+                try:
+                    dados[nome] = _data(valor if isinstance(valor, date) else _texto(valor))
+                except ValueError:
+                    dados[nome] = None
+                    erros.append((nome, 'Data inválida (use DD/MM/AAAA ou AAAA-MM-DD).'))
+                    continue
+        else:
+            dados[nome] = _texto(valor)
+        if nome in CAMPOS_OBRIGATORIOS and dados[nome] in (None, ''):
+            erros.append((nome, 'Este campo é obrigatório.'))
+
+    for nome, (regex, mensagem) in FORMATOS.items():
+        if dados.get(nome) and not regex.match(dados[nome]):
+            erros.append((nome, mensagem))
+
+    if dados['cpf'] and not any(campo == 'cpf' for campo, _ in erros):
+        erro_cpf = verificar_cpf(dados['cpf'])
+        if erro_cpf:
+            erros.append(('cpf', MENSAGENS_CPF[erro_cpf]))
+
+    for nome in CAMPOS_IMPORTACAO:
+        texto = dados.get(nome)
+        limite = Motorista._meta.get_field(nome).max_length
+        if limite and isinstance(texto, str) and len(texto) > limite:
+            erros.append((nome, f'Máximo de {limite} caracteres.'))
+
+    if dados['email']:
+        try:
+            validate_email(dados['email'])
+        except ValidationError:
+            erros.append(('email', 'E-mail inválido.'))
+
+    dados['estado'] = dados['estado'].upper()
+    if dados['estado'] and dados['estado'] not in ESTADOS:
+        erros.append(('estado', f"UF inválida: {dados['estado']}"))
+    dados['cnh_categoria'] = dados['cnh_categoria'].upper()
+    if dados['cnh_categoria'] and dados['cnh_categoria'] not in CATEGORIAS:
+        erros.append(('cnh_categoria', f"Categoria inválida: {dados['cnh_categoria']}"))
+    dados['status'] = dados['status'].upper() or 'ATIVO'
+    if dados['status'] not in STATUS:
+        erros.append(('status', f"Status inválido: {dados['status']}"))
+
+    if dados['salario']:
+        try:
+            dados['salario'] = Decimal(dados['salario'].replace('.', '').replace(',', '.')
+                                       if ',' in dados['salario'] else dados['salario'])
+        except InvalidOperation:
+            erros.append(('salario', 'Salário inválido.'))
+        else:
+            try:
+                for validador in VALIDADORES_SALARIO:
+                    validador(dados['salario'])
+            except ValidationError as e:
+                erros.append(('salario', f"Salário inválido: {' '.join(e.messages)}"))
+    else:
+        dados['salario'] = None
+    dados['mei_numero'] = dados['mei_numero'] or None
+
+    nascimento, emissao, validade = dados['data_nascimento'], dados['cnh_emissao'], dados['cnh_validade']
+    if nascimento and calcular_idade(nascimento, hoje) < 18:
+        erros.append(('data_nascimento', 'Motorista deve ter pelo menos 18 anos.'))
+    if validade and validade < hoje:
+        erros.append(('cnh_validade', 'A validade da CNH não pode ser uma data passada.'))
+    if emissao and validade and emissao >= validade:
+        erros.append(('cnh_emissao', 'Data de emissão deve ser anterior à data de validade.'))
+
+    return dados, erros
+
+
+def _documentos_existentes():
+    """Um conjunto por campo único, carregado com uma consulta cada (só a coluna, sem instâncias)."""
+    return {
+        nome: set(Motorista.objects.exclude(**{f'{nome}__isnull': True}).values_list(nome, flat=True).order_by())
+        for nome in CAMPOS_UNICOS
+    }
+
+
+def _deltas_estatisticas(motoristas):
+    deltas = Counter()
+    for motorista in motoristas:
+        chave = (motorista.status, motorista.estado, motorista.cnh_categoria)
+        deltas[chave, 'total'] += 1
+        if motorista.salario is not None:
+            deltas[chave, 'total_com_salario'] += 1
+            deltas[chave, 'soma_salarios'] += motorista.salario
+    chaves = {chave for chave, _ in deltas}
+    return [
+        (chave, deltas[chave, 'total'], deltas[chave, 'total_com_salario'], deltas[chave, 'soma_salarios'])
+        for chave in chaves
+    ]
+
+
+def _gravar_lote(pendentes, resultado, batch_size):
+    """
+    Insere o lote numa transação. Se outro cadastro ocupou um CPF/CNH/MEI depois da carga
+    dos conjuntos, refaz o lote linha a linha para apontar quais linhas conflitaram.
+    """
+    motoristas = [motorista for _, motorista in pendentes]
+    try:
+        with transaction.atomic():
+            Motorista.objects.bulk_create(motoristas, batch_size=batch_size)
+            for chave, total, com_salario, soma in _deltas_estatisticas(motoristas):
+                registrar_delta(*chave, total, com_salario, soma)
+            invalidar_cache_motoristas_apos_commit()
+        resultado.importadas += len(motoristas)
+        return
+    except IntegrityError:
+        pass
+
+    for numero, motorista in pendentes:
+        motorista.pk = None
+        motorista._state.adding = True
+        try:
+            with transaction.atomic():
+                Motorista.objects.bulk_create([motorista])
+                for chave, total, com_salario, soma in _deltas_estatisticas([motorista]):
+                    registrar_delta(*chave, total, com_salario, soma)
+                invalidar_cache_motoristas_apos_commit()
+            resultado.importadas += 1
+        except IntegrityError:
+            resultado.erros.append((numero, 'cpf/cnh_numero/mei_numero', 'Documento já cadastrado.'))
+
+
+def importar_motoristas(arquivo, nome_arquivo, lote=TAMANHO_LOTE, simular=False, ao_gravar_lote=None):
+    """
+    Importa o arquivo e devolve um ResultadoImportacao com o relatório de erros por linha.
+    Com simular=True só valida (nada é gravado). Levanta ErroImportacao se o arquivo for inválido.
+    """
+    resultado = ResultadoImportacao(simulado=simular)
+    existentes = _documentos_existentes()
+    hoje = date.today()
+    pendentes = []
+
+    for numero, bruto in ler_linhas(arquivo, nome_arquivo):
+        resultado.lidas += 1
+        dados, erros = validar_linha(bruto, hoje)
+        if not erros:
+            for nome in CAMPOS_UNICOS:
+                if dados[nome] and dados[nome] in existentes[nome]:
+                    erros.append((nome, f'{Motorista._meta.get_field(nome).verbose_name} já cadastrado(a).'))
+        if erros:
+            resultado.erros.extend((numero, campo, mensagem) for campo, mensagem in erros)
+            continue
+
+        for nome in CAMPOS_UNICOS:
+            if dados[nome]:
+                existentes[nome].add(dados[nome])
+        if simular:
+            resultado.importadas += 1
+            continue
+
+        motorista = Motorista(**dados)
+        # bulk_create não chama save(): o texto de busca precisa ser montado aqui
+        motorista.atualizar_busca_texto()
+        pendentes.append((numero, motorista))
+        if len(pendentes) >= lote:
+            _gravar_lote(pendentes, resultado, lote)
+            pendentes = []
+            if ao_gravar_lote:
+                ao_gravar_lote(resultado)
+
+    if pendentes:
+        _gravar_lote(pendentes, resultado, lote)
+        if ao_gravar_lote:
+            ao_gravar_lote(resultado)
+    return resultado
+
+
+def escrever_relatorio_erros(resultado, saida):
+    """Grava o relatório de erros (linha;campo;mensagem) num arquivo texto aberto."""
+    escritor = csv.writer(saida, delimiter=';')
+    escritor.writerow(['linha', 'campo', 'mensagem'])
+    escritor.writerows(resultado.erros)
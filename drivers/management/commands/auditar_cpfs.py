@@ -0,0 +1,63 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.models import Motorista
+from drivers.validators.cpf_validators import MENSAGENS, carregar_numpy, validar_cpfs, verificar_cpf
+
+COLUNAS_RELATORIO = ['id', 'nome_completo', 'cpf', 'status', 'motivo']
+
+
+class Command(BaseCommand):
+    help = 'Confere o dígito verificador de todos os CPFs cadastrados, em lotes, e lista os inválidos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=50000,
+                            help='Motoristas lidos e validados por vez (padrão: 50000).')
+        parser.add_argument('--csv', metavar='ARQUIVO', help='Grava os registros inválidos em um arquivo CSV.')
+        parser.add_argument('--mostrar', type=int, default=20, help='Registros exibidos no terminal (padrão: 20).')
+        parser.add_argument('--falhar', action='store_true',
+                            help='Termina com erro se houver CPF inválido (para usar em CI/cron).')
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser maior que zero.')
+
+        inicio = time.monotonic()
+        total = 0
+        invalidos = []
+        ultimo_id = 0
+        # Paginação por id (chave primária): cada lote é uma busca no índice, sem OFFSET
+        queryset = Motorista.objects.order_by('id').values_list('id', 'nome_completo', 'cpf', 'status')
+        while True:
+            linhas = list(queryset.filter(id__gt=ultimo_id)[:options['lote']])
+            if not linhas:
+                break
+            total += len(linhas)
+            ultimo_id = linhas[-1][0]
+            resultados = validar_cpfs(cpf for _, _, cpf, _ in linhas)
+            for linha, valido in zip(linhas, resultados):
+                if not valido:
+                    invalidos.append((*linha, MENSAGENS[verificar_cpf(linha[2])]))
+            if options['verbosity'] > 1:
+                self.stdout.write(f'   🔎 {total} verificado(s), {len(invalidos)} inválido(s)')
+
+        duracao = time.monotonic() - inicio
+        for pk, nome, cpf, status, motivo in invalidos[:options['mostrar']]:
+            self.stdout.write(f'   ❌ #{pk} {nome} - {cpf or "(vazio)"}: {motivo}')
+        if len(invalidos) > options['mostrar']:
+            self.stdout.write(f"   ... e mais {len(invalidos) - options['mostrar']} registro(s)")
+
+        if options['csv']:
+            with open(options['csv'], 'w', newline='', encoding='utf-8') as arquivo:
+                escritor = csv.writer(arquivo)
+                escritor.writerow(COLUNAS_RELATORIO)
+                escritor.writerows(invalidos)
+            self.stdout.write(f"   📄 Relatório gravado em {options['csv']}")
+
+        motor = 'NumPy' if carregar_numpy() else 'Python puro'
+        mensagem = f'{total} CPF(s) verificado(s) em {duracao:.2f}s ({motor}): {len(invalidos)} inválido(s).'
+        if invalidos and options['falhar']:
+            raise CommandError(mensagem)
+        self.stdout.write(self.style.SUCCESS(f'✅ {mensagem}') if not invalidos else f'⚠️  {mensagem}')
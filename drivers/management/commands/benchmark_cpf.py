@@ -0,0 +1,100 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.validators.cpf_validators import carregar_numpy, validar_cpfs, verificar_cpf
+
+
+def calc_cpf_digit(nums):
+    """Dígito verificador do CPF como a implementação anterior calculava (legado e gerar_cpfs)."""
+    # O range gera os pesos (10 a 2 ou 11 a 2)
+    s = sum(int(n) * w for n, w in zip(nums, range(len(nums) + 1, 1, -1)))
+    r = (s * 10) % 11
+    return r if r < 10 else 0
+
+
+def _validar_legado_validators(valor):
+    """Implementação anterior de drivers/validators.py (laço por caractere), mantida só para comparação."""
+    cpf = re.sub(r'[^0-9]', '', str(valor))
+    if len(cpf) != 11 or re.match(r'^(\d)\1+$', cpf):
+        return False
+    soma = 0
+    for i in range(9):
+        soma += int(cpf[i]) * (10 - i)
+    resto = soma % 11
+    if (0 if resto < 2 else 11 - resto) != int(cpf[9]):
+        return False
+    soma = 0
+    for i in range(10):
+        soma += int(cpf[i]) * (11 - i)
+    resto = soma % 11
+    return (0 if resto < 2 else 11 - resto) == int(cpf[10])
+
+
+def _validar_legado_cpf_validators(valor):
+    """Implementação anterior de cpf_validators.validate_cpf (re.sub + calc_cpf_digit)."""
+    cpf = re.sub(r'\D', '', valor or '')
+    if len(cpf) != 11 or cpf == cpf[0] * 11:
+        return False
+    primeiro = calc_cpf_digit(cpf[:9])
+    segundo = calc_cpf_digit(cpf[:9] + str(primeiro))
+    return int(cpf[9]) == primeiro and int(cpf[10]) == segundo
+
+
+def gerar_cpfs(quantidade, proporcao_invalidos=0.1, semente=42):
+    """CPFs formatados (000.000.000-00), com uma fração de dígitos verificadores errados."""
+    aleatorio = random.Random(semente)
+    cpfs = []
+    for _ in range(quantidade):
+        base = f'{aleatorio.randrange(10 ** 9):09d}'
+        primeiro = calc_cpf_digit(base)
+        segundo = calc_cpf_digit(base + str(primeiro))
+        if aleatorio.random() < proporcao_invalidos:
+            segundo = (segundo + 1) % 10
+        numeros = f'{base}{primeiro}{segundo}'
+        cpfs.append(f'{numeros[:3]}.{numeros[3:6]}.{numeros[6:9]}-{numeros[9:]}')
+    return cpfs
+
+
+class Command(BaseCommand):
+    help = 'Compara a validação de CPF em lote (NumPy) com o caminho escalar e com as implementações anteriores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantidade', type=int, default=1_000_000, help='CPFs gerados (padrão: 1.000.000).')
+        parser.add_argument('--invalidos', type=float, default=0.1,
+                            help='Fração de CPFs com dígito errado (padrão: 0.1).')
+
+    def _medir(self, nome, funcao, cpfs):
+        inicio = time.perf_counter()
+        resultado = funcao(cpfs)
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(
+            f'   {nome:<34} {duracao:7.3f}s  {len(cpfs) / duracao:>12,.0f} CPF/s  '
+            f'({resultado.count(False)} inválido(s))'
+        )
+        return resultado, duracao
+
+    def handle(self, *args, **options):
+        quantidade = options['quantidade']
+        if quantidade < 1:
+            raise CommandError('--quantidade deve ser maior que zero.')
+
+        self.stdout.write(f'🧪 Gerando {quantidade:,} CPFs...')
+        cpfs = gerar_cpfs(quantidade, options['invalidos'])
+
+        referencia, tempo_legado = self._medir(
+            'anterior (validators.py)', lambda lista: [_validar_legado_validators(c) for c in lista], cpfs)
+        candidatos = [
+            ('anterior (cpf_validators.py)', lambda lista: [_validar_legado_cpf_validators(c) for c in lista]),
+            ('escalar (verificar_cpf)', lambda lista: [verificar_cpf(c) is None for c in lista]),
+            ('lote (validar_cpfs, ' + ('NumPy' if carregar_numpy() else 'sem NumPy') + ')', validar_cpfs),
+        ]
+        for nome, funcao in candidatos:
+            resultado, duracao = self._medir(nome, funcao, cpfs)
+            if resultado != referencia:
+                raise CommandError(f'{nome} divergiu da implementação anterior.')
+            self.stdout.write(f'      {tempo_legado / duracao:.1f}x a velocidade de validators.py')
+
+        self.stdout.write(self.style.SUCCESS('✅ Todas as implementações concordam em todos os CPFs.'))
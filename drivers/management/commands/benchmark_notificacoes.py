@@ -0,0 +1,94 @@
+import logging
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from drivers.despachante import despachar_notificacoes
+from drivers.models import NotificacaoPendente
+from drivers.services_notificacoes import enfileirar_notificacoes
+from drivers.stub_webhook import StubWebhook
+from drivers.transportes import TransporteMemoria, TransporteWebhook
+
+PREFIXO = 'benchmark:'
+
+
+class Command(BaseCommand):
+    help = 'Mede a vazão e as novas tentativas do despachante de notificações contra o stub local.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantidade', type=int, default=2000, help='Notificações a enfileirar (padrão: 2000).')
+        parser.add_argument('--transporte', choices=['webhook', 'memoria'], default='webhook')
+        parser.add_argument('--concorrencia', type=int, default=20)
+        parser.add_argument('--por-segundo', type=float, help='Limite de envios por segundo.')
+        parser.add_argument('--falhas', type=float, default=0.05, help='Fração de erros simulados (padrão: 0.05).')
+        parser.add_argument('--atraso', type=float, default=0.02,
+                            help='Latência simulada do destino em segundos (padrão: 0.02).')
+        parser.add_argument('--rodadas', type=int, default=3,
+                            help='Rodadas de envio; entre elas as falhas são liberadas sem esperar o backoff.')
+        parser.add_argument('--forcar', action='store_true',
+                            help='Roda mesmo com notificações reais pendentes (elas também seriam consumidas).')
+
+    def handle(self, *args, **options):
+        # As falhas simuladas são esperadas: não polui a saída com um aviso por mensagem
+        logging.getLogger('drivers.despachante').setLevel(logging.ERROR)
+
+        reais = NotificacaoPendente.objects.filter(status__in=['PENDENTE', 'PROCESSANDO']).exclude(
+            referencia__startswith=PREFIXO
+        ).count()
+        if reais and not options['forcar']:
+            raise CommandError(f'Há {reais} notificação(ões) real(is) na fila; o benchmark as enviaria ao stub.')
+
+        execucao = f'{PREFIXO}{uuid.uuid4().hex[:8]}:'
+        enfileirar_notificacoes(
+            {'nome_motorista': f'Motorista {i}', 'mensagem': f'Mensagem de teste {i}', 'referencia': f'{execucao}{i}'}
+            for i in range(options['quantidade'])
+        )
+        minhas = NotificacaoPendente.objects.filter(referencia__startswith=execucao)
+
+        servidor = None
+        if options['transporte'] == 'webhook':
+            servidor = StubWebhook(taxa_falhas=options['falhas'], atraso=options['atraso']).iniciar_em_thread()
+
+        self.stdout.write(
+            f"📨 {options['quantidade']} notificações via {options['transporte']}, "
+            f"concorrência {options['concorrencia']}"
+        )
+        try:
+            for rodada in range(1, options['rodadas'] + 1):
+                if servidor:
+                    transporte = TransporteWebhook(url=servidor.url, concorrencia=options['concorrencia'],
+                                                   por_segundo=options['por_segundo'], timeout=10)
+                else:
+                    transporte = TransporteMemoria(
+                        atraso=options['atraso'], concorrencia=options['concorrencia'],
+                        por_segundo=options['por_segundo'],
+                        falhar_a_cada=round(1 / options['falhas']) if options['falhas'] else 0,
+                    )
+                resultado = despachar_notificacoes(transporte, concorrencia=options['concorrencia'])
+                self.stdout.write(
+                    f"   Rodada {rodada}: {resultado['enviadas']} enviada(s), {resultado['falhas']} falha(s) "
+                    f"em {resultado['duracao']:.2f}s → {resultado['por_segundo']:.0f} msg/s "
+                    f"({resultado['por_segundo'] * 3600:,.0f} msg/h)"
+                )
+                if not minhas.filter(status='PENDENTE').exists():
+                    break
+                # Antecipa o backoff para medir as novas tentativas sem esperar
+                minhas.filter(status='PENDENTE').update(proxima_tentativa=timezone.now())
+
+            enviadas = minhas.filter(status='ENVIADA').count()
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {enviadas}/{options['quantidade']} entregues; "
+                f"{minhas.filter(status='PENDENTE').count()} ainda pendente(s), "
+                f"{minhas.filter(status='FALHOU').count()} desistida(s)"
+            ))
+            if servidor:
+                self.stdout.write(
+                    f'   Stub: {servidor.requisicoes} requisições, {servidor.falhas} erro(s), '
+                    f'{len(servidor.chaves)} mensagem(ns) distinta(s)'
+                )
+        finally:
+            if servidor:
+                servidor.shutdown()
+                servidor.server_close()
+            minhas.delete()
@@ -0,0 +1,181 @@
+import multiprocessing
+import os
+import queue
+import sqlite3
+import tempfile
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+# Configuração antiga: rollback journal, DEFERRED e o timeout padrão do sqlite3 (5 s)
+MODO_PADRAO = {'journal_mode': 'DELETE', 'opcoes': {}}
+
+
+def _modo_otimizado():
+    return {'journal_mode': 'WAL', 'opcoes': getattr(settings, 'SQLITE_OPCOES', {})}
+
+
+def _usar_banco(caminho, opcoes):
+    """Aponta a conexão default deste processo para o banco do benchmark."""
+    connections.close_all()
+    connection.settings_dict['NAME'] = caminho
+    connection.settings_dict['OPTIONS'] = opcoes
+
+
+def _trabalhador(papel, indice, caminho, opcoes, duracao, resultados):
+    """Processo escritor (cadastros, como o cadastro_motorista) ou leitor (lista + relatório completo)."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django.db import OperationalError, transaction
+
+    from drivers.models import Motorista
+
+    _usar_banco(caminho, opcoes)
+    operacoes = erros_lock = outros_erros = 0
+    latencia_maxima = 0.0
+    fim = time.monotonic() + duracao
+    while time.monotonic() < fim:
+        inicio = time.monotonic()
+        try:
+            if papel == 'escritor':
+                numero = f'8{indice:02d}{operacoes:08d}'
+                with transaction.atomic():
+                    Motorista.objects.create(
+                        nome_completo=f'Benchmark {indice}-{operacoes}',
+                        cpf=f'{numero[:3]}.{numero[3:6]}.{numero[6:9]}-{numero[9:]}', cnh_numero=numero,
+                        data_nascimento=date(1985, 1, 1), email='benchmark@exemplo.com',
+                        telefone='(11) 90000-0000', endereco='Rua', numero='1', bairro='Centro',
+                        cidade='São Paulo', estado='SP', cnh_categoria='B',
+                        cnh_validade=date(2035, 1, 1), cnh_emissao=date(2020, 1, 1),
+                    )
+            else:
+                list(Motorista.objects.filtrar(status='ATIVO').order_by('-created_at', '-id')[:20])
+                # Leitura longa, como a geração de um relatório
+                for _ in Motorista.objects.values_list('id', 'nome_completo', 'cpf').iterator(chunk_size=2000):
+                    pass
+            operacoes += 1
+        except OperationalError as e:
+            if 'locked' in str(e) or 'busy' in str(e):
+                erros_lock += 1
+            else:
+                outros_erros += 1
+        except Exception:
+            outros_erros += 1
+        latencia_maxima = max(latencia_maxima, time.monotonic() - inicio)
+    connections.close_all()
+    resultados.put({
+        'papel': papel, 'operacoes': operacoes, 'erros_lock': erros_lock,
+        'outros_erros': outros_erros, 'latencia_maxima': latencia_maxima,
+    })
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara o SQLite padrão (rollback journal) com o modo de produção (WAL, busy_timeout, BEGIN IMMEDIATE) '
+        'com N processos escritores e M leitores concorrentes, numa cópia do banco.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escritores', type=int, default=4)
+        parser.add_argument('--leitores', type=int, default=4)
+        parser.add_argument('--duracao', type=float, default=10, help='Segundos por modo (padrão: 10).')
+        parser.add_argument('--motoristas', type=int, default=20000,
+                            help='Tamanho mínimo da tabela na cópia, para as leituras pesarem (padrão: 20000).')
+        parser.add_argument('--modo', choices=['ambos', 'padrao', 'otimizado'], default='ambos')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Este benchmark só se aplica ao SQLite.')
+        original = dict(connection.settings_dict)
+
+        with tempfile.TemporaryDirectory(prefix='benchmark_sqlite_') as pasta:
+            base = os.path.join(pasta, 'base.sqlite3')
+            self._preparar_base(base, options['motoristas'])
+
+            modos = [('padrao', MODO_PADRAO), ('otimizado', _modo_otimizado())]
+            try:
+                for nome, modo in modos:
+                    if options['modo'] in ('ambos', nome):
+                        caminho = os.path.join(pasta, f'{nome}.sqlite3')
+                        self._copiar(base, caminho, modo['journal_mode'])
+                        self._rodar(nome, caminho, modo['opcoes'], options)
+            finally:
+                connections.close_all()
+                connection.settings_dict.update(NAME=original['NAME'], OPTIONS=original['OPTIONS'])
+
+    def _preparar_base(self, base, minimo):
+        from drivers.models import Motorista
+
+        connections.close_all()
+        self._copiar(str(connection.settings_dict['NAME']), base, 'DELETE')
+        _usar_banco(base, {})
+        try:
+            faltando = minimo - Motorista.objects.count()
+            if faltando > 0:
+                self.stdout.write(f'🧱 Completando a cópia com {faltando} motoristas...')
+                motoristas = []
+                for i in range(faltando):
+                    numero = f'99{i:09d}'
+                    motorista = Motorista(
+                        nome_completo=f'Carga {i}', cpf=f'{numero[:3]}.{numero[3:6]}.{numero[6:9]}-{numero[9:]}',
+                        cnh_numero=numero, data_nascimento=date(1980, 1, 1), email='carga@exemplo.com',
+                        telefone='(11) 90000-0000', endereco='Rua', numero='1', bairro='Centro',
+                        cidade='Curitiba', estado='PR', cnh_categoria='C', status='ATIVO',
+                        cnh_validade=date(2035, 1, 1), cnh_emissao=date(2020, 1, 1),
+                    )
+                    motorista.atualizar_busca_texto()
+                    motoristas.append(motorista)
+                Motorista.objects.bulk_create(motoristas, batch_size=2000)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def _copiar(origem, destino, journal_mode):
+        """Cópia consistente pela API de backup do SQLite (funciona mesmo com o banco em uso)."""
+        with sqlite3.connect(origem) as fonte, sqlite3.connect(destino) as copia:
+            fonte.backup(copia)
+            copia.execute(f'PRAGMA journal_mode={journal_mode}')
+        fonte.close()
+        copia.close()
+
+    def _rodar(self, nome, caminho, opcoes, options):
+        # Nenhuma conexão aberta atravessa o fork
+        connections.close_all()
+        contexto = multiprocessing.get_context()
+        resultados = contexto.Queue()
+        processos = [
+            contexto.Process(target=_trabalhador, args=(papel, i, caminho, opcoes, options['duracao'], resultados))
+            for papel, quantidade in (('escritor', options['escritores']), ('leitor', options['leitores']))
+            for i in range(quantidade)
+        ]
+        for processo in processos:
+            processo.start()
+        try:
+            relatorios = [resultados.get(timeout=options['duracao'] + 120) for _ in processos]
+        except queue.Empty:
+            raise CommandError('Um dos processos do benchmark não respondeu (veja o erro acima).')
+        finally:
+            for processo in processos:
+                processo.join(timeout=5)
+                if processo.is_alive():
+                    processo.terminate()
+
+        self.stdout.write(f"\n🗄️  Modo {nome} ({options['escritores']} escritor(es), {options['leitores']} leitor(es), "
+                          f"{options['duracao']:.0f}s)")
+        for papel in ('escritor', 'leitor'):
+            do_papel = [r for r in relatorios if r['papel'] == papel]
+            if not do_papel:
+                continue
+            operacoes = sum(r['operacoes'] for r in do_papel)
+            erros_lock = sum(r['erros_lock'] for r in do_papel)
+            outros = sum(r['outros_erros'] for r in do_papel)
+            latencia = max(r['latencia_maxima'] for r in do_papel)
+            linha = (f"   {papel + 'es':<11} {operacoes:>7} op ({operacoes / options['duracao']:>8.1f} op/s)  "
+                     f"'database is locked': {erros_lock:<5} outros erros: {outros:<3} pior latência: {latencia:.2f}s")
+            self.stdout.write(self.style.ERROR(linha) if erros_lock or outros else linha)
@@ -0,0 +1,43 @@
+import os
+import secrets
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria o superusuário inicial se ele ainda não existir (rodar uma vez por deploy, depois do migrate). '
+        'Usa ADMIN_USERNAME, ADMIN_EMAIL e ADMIN_PASSWORD do ambiente.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', default=os.environ.get('ADMIN_USERNAME', 'admin'))
+        parser.add_argument('--email', default=os.environ.get('ADMIN_EMAIL', 'admin@example.com'))
+        parser.add_argument('--redefinir-senha', action='store_true',
+                            help='Se o usuário já existir, redefine a senha para ADMIN_PASSWORD.')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        senha = os.environ.get('ADMIN_PASSWORD')
+        usuario = User.objects.filter(username=options['username']).first()
+
+        if usuario is not None:
+            if options['redefinir_senha'] and senha:
+                usuario.set_password(senha)
+                usuario.save(update_fields=['password'])
+                self.stdout.write(self.style.SUCCESS(f"🔐 Senha de '{usuario.username}' redefinida."))
+            else:
+                self.stdout.write(f"ℹ️  Superusuário '{usuario.username}' já existe; nada a fazer.")
+            return
+
+        senha_gerada = not senha
+        if senha_gerada:
+            # Nunca uma senha fixa: sem ADMIN_PASSWORD, gera uma aleatória e mostra só desta vez
+            senha = secrets.token_urlsafe(16)
+        User.objects.create_superuser(username=options['username'], email=options['email'], password=senha)
+        self.stdout.write(self.style.SUCCESS(f"🎉 Superusuário '{options['username']}' criado."))
+        if senha_gerada:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  ADMIN_PASSWORD não definido. Senha gerada (não será exibida de novo): {senha}'
+            ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.despachante import despachar_notificacoes
+from drivers.transportes import TRANSPORTES, criar_transporte
+
+
+class Command(BaseCommand):
+    help = 'Envia a fila de notificações pelo transporte escolhido, com envios concorrentes (asyncio).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transporte', choices=list(TRANSPORTES),
+                            help='Padrão: NOTIFICACOES_TRANSPORTE (console).')
+        parser.add_argument('--url', help='URL do webhook (padrão: NOTIFICACOES_WEBHOOK_URL).')
+        parser.add_argument('--concorrencia', type=int, help='Máximo de envios simultâneos.')
+        parser.add_argument('--por-segundo', type=float, help='Máximo de envios por segundo.')
+        parser.add_argument('--timeout', type=float, help='Segundos até desistir de um envio.')
+        parser.add_argument('--lote', type=int, default=200, help='Notificações reservadas por vez (padrão: 200).')
+        parser.add_argument('--continuo', action='store_true',
+                            help='Continua aguardando novas notificações em vez de encerrar com a fila vazia.')
+        parser.add_argument('--intervalo', type=float, default=2.0,
+                            help='Segundos entre verificações da fila vazia no modo contínuo (padrão: 2).')
+
+    def handle(self, *args, **options):
+        opcoes = {'por_segundo': options['por_segundo'], 'timeout': options['timeout']}
+        if options['transporte'] == 'webhook' and options['url']:
+            opcoes['url'] = options['url']
+        try:
+            transporte = criar_transporte(options['transporte'], **opcoes)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'📨 Despachando notificações via {transporte.nome}')
+        try:
+            resultado = despachar_notificacoes(
+                transporte,
+                concorrencia=options['concorrencia'],
+                lote=options['lote'],
+                continuo=options['continuo'],
+                intervalo=options['intervalo'],
+            )
+        except KeyboardInterrupt:
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {resultado['enviadas']} enviada(s), {resultado['falhas']} falha(s) em "
+            f"{resultado['duracao']:.1f}s ({resultado['por_segundo']:.0f}/s)"
+        ))
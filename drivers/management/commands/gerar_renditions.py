@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from PIL import Image, UnidentifiedImageError
+
+from drivers.imagens import gerar_renditions
+from drivers.models import Motorista
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera as fotos reduzidas (renditions) que ainda faltam, em lotes por id. '
+        'Use após o deploy ou ao mudar imagens.VERSAO; as já existentes são mantidas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=200, help='Motoristas por lote (padrão: 200).')
+
+    def handle(self, *args, **options):
+        fotos = Motorista.objects.exclude(foto__isnull=True).exclude(foto='').only('id', 'foto').order_by('id')
+        ultimo_id = 0
+        verificadas = gravadas = falhas = 0
+        while True:
+            # Paginação por id: cada lote é uma consulta curta, sem OFFSET crescente
+            lote = list(fotos.filter(id__gt=ultimo_id)[:options['lote']])
+            if not lote:
+                break
+            for motorista in lote:
+                try:
+                    gravadas += len(gerar_renditions(motorista.foto))
+                except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+                    falhas += 1
+                    self.stderr.write(f'   ⚠️  Motorista {motorista.id} ({motorista.foto.name}): {e}')
+            verificadas += len(lote)
+            ultimo_id = lote[-1].id
+            self.stdout.write(f'   📷 {verificadas} foto(s) verificada(s), {gravadas} rendition(s) gravada(s)')
+
+        estilo = self.style.WARNING if falhas else self.style.SUCCESS
+        self.stdout.write(estilo(
+            f'✅ Renditions em dia: {verificadas} foto(s), {gravadas} arquivo(s) novo(s), {falhas} falha(s).'
+        ))
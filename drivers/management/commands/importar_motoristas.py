@@ -0,0 +1,58 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.importacao import TAMANHO_LOTE, ErroImportacao, escrever_relatorio_erros, importar_motoristas
+
+
+class Command(BaseCommand):
+    help = 'Importa motoristas em massa de um arquivo CSV ou XLSX (cabeçalho com os nomes ou rótulos dos campos).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Arquivo .csv (separado por ; ou ,) ou .xlsx.')
+        parser.add_argument('--lote', type=int, default=TAMANHO_LOTE,
+                            help=f'Motoristas gravados por transação (padrão: {TAMANHO_LOTE}).')
+        parser.add_argument('--simular', action='store_true',
+                            help='Só valida o arquivo e mostra os erros, sem gravar nada.')
+        parser.add_argument('--relatorio', metavar='ARQUIVO',
+                            help='Grava o relatório de erros por linha em CSV (padrão: só mostra os primeiros).')
+        parser.add_argument('--mostrar', type=int, default=20, help='Erros exibidos no terminal (padrão: 20).')
+
+    def handle(self, *args, **options):
+        caminho = options['arquivo']
+        if not os.path.exists(caminho):
+            raise CommandError(f'Arquivo não encontrado: {caminho}')
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser maior que zero.')
+
+        def ao_gravar_lote(resultado):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'   💾 {resultado.importadas} gravado(s) de {resultado.lidas} lido(s)')
+
+        inicio = time.monotonic()
+        try:
+            with open(caminho, 'rb') as arquivo:
+                resultado = importar_motoristas(
+                    arquivo, caminho, lote=options['lote'], simular=options['simular'],
+                    ao_gravar_lote=ao_gravar_lote,
+                )
+        except ErroImportacao as e:
+            raise CommandError(str(e))
+        duracao = time.monotonic() - inicio
+
+        for linha, campo, mensagem in resultado.erros[:options['mostrar']]:
+            self.stdout.write(f'   ⚠️  Linha {linha} - {campo}: {mensagem}')
+        if len(resultado.erros) > options['mostrar']:
+            self.stdout.write(f"   ... e mais {len(resultado.erros) - options['mostrar']} erro(s)")
+
+        if options['relatorio']:
+            with open(options['relatorio'], 'w', newline='', encoding='utf-8') as saida:
+                escrever_relatorio_erros(resultado, saida)
+            self.stdout.write(f"   📄 Relatório de erros gravado em {options['relatorio']}")
+
+        acao = 'válido(s) (simulação, nada gravado)' if resultado.simulado else 'importado(s)'
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {resultado.lidas} linha(s) lida(s) em {duracao:.1f}s: {resultado.importadas} motorista(s) {acao}, '
+            f'{resultado.rejeitadas} linha(s) rejeitada(s).'
+        ))
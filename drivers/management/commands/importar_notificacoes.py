@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.enviar_pendentes import NOTIFICACOES_FILE
+from drivers.services_notificacoes import importar_notificacoes_json
+
+
+class Command(BaseCommand):
+    help = 'Importa o arquivo legado notificacoes_pendentes.json para a fila de notificações (tabela).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--arquivo', default=NOTIFICACOES_FILE,
+                            help=f'Arquivo JSON a importar (padrão: {NOTIFICACOES_FILE}).')
+        parser.add_argument('--incluir-enviadas', action='store_true',
+                            help='Importa também as já enviadas, como histórico.')
+        parser.add_argument('--renomear', action='store_true',
+                            help='Renomeia o arquivo para .importado depois de importar.')
+
+    def handle(self, *args, **options):
+        arquivo = options['arquivo']
+        if not os.path.exists(arquivo):
+            raise CommandError(f'Arquivo não encontrado: {arquivo}')
+
+        importadas, ignoradas = importar_notificacoes_json(arquivo, options['incluir_enviadas'])
+        if options['renomear']:
+            os.replace(arquivo, arquivo + '.importado')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {importadas} notificação(ões) importada(s), {ignoradas} ignorada(s) (enviadas ou já importadas).'
+        ))
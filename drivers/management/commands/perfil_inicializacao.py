@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# O que um worker do gunicorn carrega antes de atender a primeira requisição
+MODULOS_PADRAO = ['fleet.wsgi', 'fleet.urls']
+
+# Bibliotecas que não deveriam aparecer no boot (são carregadas só quando um relatório é gerado)
+PESADAS = ['openpyxl', 'reportlab', 'selenium', 'numpy']
+
+
+def medir_importacao(modulos):
+    """
+    Importa os módulos num processo novo com `python -X importtime` e devolve
+    (tempo total em ms, lista de (módulo, próprio_us, acumulado_us, nível)).
+    """
+    codigo = ';'.join(f'import {modulo}' for modulo in modulos)
+    ambiente = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'fleet.settings')}
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=settings.BASE_DIR, env=ambiente, capture_output=True, text=True,
+    )
+    total_ms = (time.perf_counter() - inicio) * 1000
+    if processo.returncode != 0:
+        raise CommandError(f'Falha ao importar {", ".join(modulos)}:\n{processo.stderr[-2000:]}')
+
+    registros = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|', 2)
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        registros.append((nome.strip(), int(proprio), int(acumulado), nivel))
+    return total_ms, registros
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de importação na inicialização de um worker (python -X importtime) e resume por pacote.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modulos', nargs='*', default=MODULOS_PADRAO,
+                            help=f"Módulos a importar (padrão: {' '.join(MODULOS_PADRAO)}).")
+        parser.add_argument('--top', type=int, default=15, help='Linhas em cada ranking (padrão: 15).')
+        parser.add_argument('--limite-ms', type=float,
+                            help='Falha se o tempo de importação passar deste valor (para CI).')
+        parser.add_argument('--json', metavar='ARQUIVO', help='Grava o resumo em JSON para comparar entre versões.')
+
+    def handle(self, *args, **options):
+        total_ms, registros = medir_importacao(options['modulos'])
+
+        importacao_ms = sum(acumulado for _, _, acumulado, nivel in registros if nivel == 0) / 1000
+        por_pacote = defaultdict(int)
+        for nome, proprio, _, _ in registros:
+            por_pacote[nome.split('.')[0]] += proprio
+        pacotes = sorted(por_pacote.items(), key=lambda item: item[1], reverse=True)
+        modulos = sorted(registros, key=lambda registro: registro[2], reverse=True)
+        pesadas = sorted({nome.split('.')[0] for nome, _, _, _ in registros} & set(PESADAS))
+
+        self.stdout.write(f"⏱️  Importação de {', '.join(options['modulos'])}")
+        self.stdout.write(f'   Processo completo: {total_ms:.0f} ms | importações: {importacao_ms:.0f} ms '
+                          f'| {len(registros)} módulo(s)')
+        self.stdout.write('\n📦 Pacotes (tempo próprio somado):')
+        for pacote, proprio in pacotes[:options['top']]:
+            self.stdout.write(f'   {proprio / 1000:8.1f} ms  {pacote}')
+        self.stdout.write('\n🐢 Módulos mais lentos (acumulado):')
+        for nome, _, acumulado, nivel in modulos[:options['top']]:
+            self.stdout.write(f"   {acumulado / 1000:8.1f} ms  {'  ' * nivel}{nome}")
+        if pesadas:
+            self.stdout.write(self.style.WARNING(
+                f"\n⚠️  Bibliotecas pesadas carregadas no boot: {', '.join(pesadas)}"
+            ))
+
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as arquivo:
+                json.dump({
+                    'modulos': options['modulos'],
+                    'processo_ms': round(total_ms, 1),
+                    'importacao_ms': round(importacao_ms, 1),
+                    'pacotes_ms': {pacote: round(proprio / 1000, 1) for pacote, proprio in pacotes},
+                    'pesadas': pesadas,
+                }, arquivo, ensure_ascii=False, indent=2)
+            self.stdout.write(f"   📄 Resumo gravado em {options['json']}")
+
+        if options['limite_ms'] and importacao_ms > options['limite_ms']:
+            raise CommandError(f"Importação levou {importacao_ms:.0f} ms (limite: {options['limite_ms']:.0f} ms).")
+        self.stdout.write(self.style.SUCCESS(f'✅ {importacao_ms:.0f} ms de importação.'))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from drivers.services_relatorios import processar_job, reenfileirar_travados, reservar_proximo_job
+
+
+class Command(BaseCommand):
+    help = 'Worker que gera em segundo plano os relatórios PDF/Excel solicitados pelas views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true',
+                            help='Processa a fila atual e encerra, em vez de continuar aguardando.')
+        parser.add_argument('--intervalo', type=float, default=2.0,
+                            help='Segundos de espera quando a fila está vazia (padrão: 2).')
+        parser.add_argument('--timeout-travados', type=int, default=30,
+                            help='Minutos após os quais um job em processamento volta para a fila (padrão: 30).')
+
+    def handle(self, *args, **options):
+        self.stdout.write('📄 Worker de relatórios iniciado')
+        try:
+            while True:
+                reenfileirados = reenfileirar_travados(options['timeout_travados'])
+                if reenfileirados:
+                    self.stdout.write(f'🔁 {reenfileirados} job(s) travado(s) devolvido(s) à fila')
+
+                job = reservar_proximo_job()
+                if job is None:
+                    if options['uma_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+                    continue
+
+                processar_job(job)
+                if job.status == 'CONCLUIDO':
+                    self.stdout.write(self.style.SUCCESS(
+                        f'✅ {job}: {job.tamanho_bytes} bytes em {job.duracao_segundos:.2f}s'
+                    ))
+                else:
+                    self.stdout.write(self.style.ERROR(f'❌ {job}: {job.erro}'))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('👋 Worker de relatórios encerrado')
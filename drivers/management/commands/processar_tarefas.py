@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from drivers.pos_cadastro import executar_tarefa, metricas_tarefas, reenfileirar_travadas, tarefas_prontas
+
+
+class Command(BaseCommand):
+    help = 'Worker das tarefas pós-cadastro que não rodaram após o commit (fila cheia, processo reiniciado, falhas).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true',
+                            help='Processa as tarefas prontas e encerra, em vez de continuar aguardando.')
+        parser.add_argument('--intervalo', type=float, default=5.0,
+                            help='Segundos de espera quando não há tarefas (padrão: 5).')
+        parser.add_argument('--timeout-travadas', type=int, default=15,
+                            help='Minutos após os quais uma tarefa em processamento volta para a fila (padrão: 15).')
+        parser.add_argument('--metricas', action='store_true',
+                            help='Só mostra contagens, duração e espera das tarefas por tipo e status.')
+
+    def handle(self, *args, **options):
+        if options['metricas']:
+            self._mostrar_metricas()
+            return
+
+        self.stdout.write('⚙️  Worker de tarefas pós-cadastro iniciado')
+        while True:
+            reenfileiradas = reenfileirar_travadas(options['timeout_travadas'])
+            if reenfileiradas:
+                self.stdout.write(f'🔁 {reenfileiradas} tarefa(s) travada(s) devolvida(s) à fila')
+
+            ids = tarefas_prontas()
+            for pk in ids:
+                if executar_tarefa(pk):
+                    self.stdout.write(self.style.SUCCESS(f'✅ Tarefa {pk} concluída'))
+                else:
+                    self.stdout.write(self.style.WARNING(f'⚠️  Tarefa {pk} falhou ou foi pega por outro executor'))
+
+            if not ids:
+                if options['uma_vez']:
+                    break
+                time.sleep(options['intervalo'])
+
+    def _mostrar_metricas(self):
+        linhas = metricas_tarefas()
+        if not linhas:
+            self.stdout.write('Nenhuma tarefa registrada.')
+            return
+        for linha in linhas:
+            espera = linha['espera_media'].total_seconds() if linha['espera_media'] is not None else None
+            self.stdout.write(
+                f"{linha['tipo']:<15} {linha['status']:<12} {linha['total']:>7} tarefa(s)"
+                f" | duração média {self._segundos(linha['duracao_media'])}"
+                f" máx {self._segundos(linha['duracao_maxima'])}"
+                f" | espera média {self._segundos(espera)}"
+            )
+
+    @staticmethod
+    def _segundos(valor):
+        return f'{valor:.3f}s' if valor is not None else '-'
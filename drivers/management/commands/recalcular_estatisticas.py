@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.services_estatisticas import recalcular_snapshot, verificar_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói as estatísticas materializadas de motoristas e verifica divergências.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verificar',
+            action='store_true',
+            help='Apenas compara os contadores com a tabela de motoristas, sem reconstruir.',
+        )
+
+    def handle(self, *args, **options):
+        divergencias = verificar_snapshot()
+        for item in divergencias:
+            status, estado, categoria = item['chave']
+            self.stdout.write(
+                f"⚠️  {status}/{estado}/{categoria} - {item['campo']}: "
+                f"esperado {item['esperado']}, encontrado {item['atual']}"
+            )
+
+        if options['verificar']:
+            if divergencias:
+                raise CommandError(f'{len(divergencias)} divergência(s) encontrada(s).')
+            self.stdout.write(self.style.SUCCESS('✅ Estatísticas consistentes.'))
+            return
+
+        total = recalcular_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Estatísticas reconstruídas: {total} combinação(ões), '
+            f'{len(divergencias)} divergência(s) corrigida(s).'
+        ))
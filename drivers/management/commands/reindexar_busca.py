@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from drivers.busca import reconstruir_indice_busca
+from drivers.models import Motorista
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o texto de busca dos motoristas e reconstrói o índice de busca (FTS5/pg_trgm).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=2000, help='Motoristas por lote (padrão: 2000).')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        database = options['database']
+        lote = []
+        total = 0
+        campos = ('id', 'nome_completo', 'cidade', 'cpf', 'cnh_numero', 'mei_numero', 'busca_texto')
+        for motorista in Motorista.objects.using(database).only(*campos).iterator(chunk_size=options['lote']):
+            anterior = motorista.busca_texto
+            motorista.atualizar_busca_texto()
+            if motorista.busca_texto != anterior:
+                lote.append(motorista)
+            if len(lote) >= options['lote']:
+                total += self._gravar(lote, database)
+                lote = []
+        if lote:
+            total += self._gravar(lote, database)
+
+        reconstruir_indice_busca(connections[database])
+        self.stdout.write(self.style.SUCCESS(f'✅ Índice de busca reconstruído ({total} texto(s) atualizado(s)).'))
+
+    def _gravar(self, lote, database):
+        with transaction.atomic(using=database):
+            Motorista.objects.using(database).bulk_update(lote, ['busca_texto'])
+        return len(lote)
@@ -0,0 +1,71 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand
+
+from drivers.models import DIAS_AVISO_CNH, Motorista
+from drivers.services_cnh import varrer_cnh_vencimento
+
+COLUNAS_RELATORIO = ['id', 'nome_completo', 'cpf', 'telefone', 'estado', 'cnh_categoria', 'cnh_validade',
+                     'dias_restantes', 'status']
+
+
+class Command(BaseCommand):
+    help = 'Varre as CNHs vencidas e a vencer, em lotes, e emite um relatório (rodar diariamente).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=DIAS_AVISO_CNH,
+                            help=f'Janela de aviso em dias a partir de hoje (padrão: {DIAS_AVISO_CNH}).')
+        parser.add_argument('--lote', type=int, default=1000,
+                            help='Motoristas lidos por consulta (padrão: 1000).')
+        parser.add_argument('--status-vencidas', choices=[valor for valor, _ in Motorista.STATUS_CHOICES],
+                            help='Altera para este status os motoristas com CNH já vencida (ex.: AFASTADO).')
+        parser.add_argument('--notificar', action='store_true',
+                            help='Enfileira uma notificação por motorista na fila de notificações.')
+        parser.add_argument('--csv', metavar='ARQUIVO',
+                            help='Grava a lista de motoristas encontrados em um arquivo CSV.')
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        arquivo = open(options['csv'], 'w', newline='', encoding='utf-8') if options['csv'] else None
+        try:
+            escritor = None
+            if arquivo:
+                escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS_RELATORIO, extrasaction='ignore')
+                escritor.writeheader()
+
+            def ao_encontrar(linha):
+                if escritor:
+                    escritor.writerow(linha)
+                if options['verbosity'] > 1:
+                    self.stdout.write(
+                        f"   {linha['cnh_validade']:%d/%m/%Y} ({linha['dias_restantes']:+d} dias) "
+                        f"{linha['nome_completo']} - {linha['cnh_categoria']}/{linha['estado']}"
+                    )
+
+            resumo = varrer_cnh_vencimento(
+                dias=options['dias'],
+                lote=options['lote'],
+                status_vencidas=options['status_vencidas'],
+                notificar=options['notificar'],
+                ao_encontrar=ao_encontrar,
+            )
+        finally:
+            if arquivo:
+                arquivo.close()
+
+        self.stdout.write(f"🪪 Varredura de CNH em {resumo['hoje']:%d/%m/%Y} (janela de {resumo['dias']} dias)")
+        self.stdout.write(f"   ❌ Vencidas: {resumo['vencidas']}")
+        self.stdout.write(f"   ⏳ Vencendo: {resumo['vencendo']}")
+        for categoria, contagem in sorted(resumo['por_categoria'].items()):
+            self.stdout.write(
+                f"      Categoria {categoria}: {contagem['vencidas']} vencida(s), {contagem['vencendo']} vencendo"
+            )
+        if options['status_vencidas']:
+            self.stdout.write(f"   🔁 Status alterado para {options['status_vencidas']}: {resumo['status_alterados']}")
+        if options['notificar']:
+            self.stdout.write(f"   📱 Notificações enfileiradas: {resumo['notificacoes']}")
+        if options['csv']:
+            self.stdout.write(f"   📄 Relatório gravado em {options['csv']}")
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Concluído em {time.monotonic() - inicio:.2f}s'))
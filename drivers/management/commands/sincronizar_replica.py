@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from drivers.replicas import ALIAS_REPLICA
+
+# Páginas copiadas por passo da API de backup: entre os passos o primário fica livre para os cadastros
+PAGINAS_POR_PASSO = 1024
+
+
+class Command(BaseCommand):
+    help = (
+        'Atualiza a réplica SQLite local (REPLICA_SQLITE=True) com uma cópia consistente do banco principal. '
+        'Roda em laço a cada --intervalo segundos; use --uma-vez no cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float, default=10,
+                            help='Segundos entre sincronizações (padrão: 10).')
+        parser.add_argument('--uma-vez', action='store_true', help='Sincroniza uma vez e sai.')
+
+    def handle(self, *args, **options):
+        if ALIAS_REPLICA not in connections.databases:
+            raise CommandError('Nenhuma réplica configurada (defina REPLICA_SQLITE=True ou DATABASE_REPLICA_URL).')
+        primario = connections['default'].settings_dict
+        replica = connections[ALIAS_REPLICA].settings_dict
+        if 'sqlite3' not in primario['ENGINE'] or 'sqlite3' not in replica['ENGINE']:
+            raise CommandError(
+                'sincronizar_replica só copia SQLite para SQLite; '
+                'no PostgreSQL a réplica é mantida pela streaming replication.'
+            )
+
+        self.stdout.write(f"🔁 Sincronizando {primario['NAME']} -> {replica['NAME']}")
+        while True:
+            inicio = time.monotonic()
+            paginas = self._copiar(str(primario['NAME']), str(replica['NAME']))
+            self.stdout.write(f'   ✅ {paginas} página(s) copiada(s) em {time.monotonic() - inicio:.2f}s')
+            if options['uma_vez']:
+                break
+            time.sleep(options['intervalo'])
+
+    @staticmethod
+    def _copiar(origem, destino):
+        """Backup online do SQLite: os leitores da réplica veem a cópia anterior até o fim da transação."""
+        fonte = sqlite3.connect(origem, timeout=20)
+        copia = sqlite3.connect(destino, timeout=20)
+        try:
+            copia.execute('PRAGMA journal_mode=WAL')
+            fonte.backup(copia, pages=PAGINAS_POR_PASSO)
+            return copia.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            fonte.close()
+            copia.close()
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from drivers.stub_webhook import StubWebhook
+
+
+class Command(BaseCommand):
+    help = 'Sobe um webhook HTTP local que imita um gateway de notificações (para testes offline).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--porta', type=int, default=8765)
+        parser.add_argument('--falhas', type=float, default=0.0,
+                            help='Fração das requisições respondidas com HTTP 500 (ex.: 0.1).')
+        parser.add_argument('--atraso', type=float, default=0.0,
+                            help='Segundos de espera antes de cada resposta (ex.: 0.05).')
+
+    def handle(self, *args, **options):
+        servidor = StubWebhook(options['host'], options['porta'], options['falhas'], options['atraso'])
+        self.stdout.write(f'🌐 Stub de webhook em {servidor.url} (Ctrl+C para encerrar)')
+        self.stdout.write(f'   Use: NOTIFICACOES_TRANSPORTE=webhook NOTIFICACOES_WEBHOOK_URL={servidor.url}')
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+        self.stdout.write(
+            f'🔒 {servidor.requisicoes} requisição(ões), {servidor.falhas} com erro, '
+            f'{len(servidor.chaves)} mensagem(ns) distinta(s) recebida(s)'
+        )
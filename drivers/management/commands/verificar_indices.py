@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from drivers.models import Motorista
+
+
+def _consultas():
+    """
+    Formato das consultas quentes das views, do admin e dos relatórios,
+    com o índice que cada uma deve usar.
+    """
+    agora = timezone.now()
+    hoje = date.today()
+    return [
+        (
+            'Dashboard: últimos cadastros',
+            Motorista.objects.order_by('-created_at', '-id')[:5],
+            'motorista_created_id',
+        ),
+        (
+            'Lista: primeira página',
+            Motorista.objects.order_by('-created_at', '-id')[:11],
+            'motorista_created_id',
+        ),
+        (
+            'Lista: página seguinte (cursor)',
+            Motorista.objects.filter(
+                Q(created_at__lt=agora) | Q(created_at=agora, id__lt=1000)
+            ).order_by('-created_at', '-id')[:11],
+            'motorista_created_id',
+        ),
+        (
+            'Lista: filtro por status',
+            Motorista.objects.filtrar(status='ATIVO').order_by('-created_at', '-id')[:11],
+            'motorista_status_created',
+        ),
+        (
+            'Admin: lista ordenada por nome',
+            Motorista.objects.order_by('nome_completo', 'id')[:100],
+            'motorista_nome_id',
+        ),
+        (
+            'Admin: filtro por estado',
+            Motorista.objects.filter(estado='SP').order_by('nome_completo', 'id')[:100],
+            'motorista_estado',
+        ),
+        (
+            'Admin: filtro por categoria CNH',
+            Motorista.objects.filter(cnh_categoria='E').order_by('nome_completo', 'id')[:100],
+            'motorista_cnh_categoria',
+        ),
+        (
+            'CNH vencendo nos próximos 30 dias',
+            Motorista.objects.filter(cnh_validade__range=(hoje, hoje + timedelta(days=30))),
+            'motorista_cnh_validade',
+        ),
+        (
+            'Relatórios: exportação por nome',
+            Motorista.objects.filtrar(status='ATIVO').order_by('nome_completo', 'id'),
+            'motorista_status_created',
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Roda EXPLAIN nas consultas quentes de motoristas e confere se cada uma usa o índice esperado.'
+
+    def handle(self, *args, **options):
+        faltando = []
+        for descricao, queryset, indice in _consultas():
+            plano = queryset.explain()
+            if indice in plano:
+                self.stdout.write(self.style.SUCCESS(f'✅ {descricao}: {indice}'))
+            else:
+                faltando.append(descricao)
+                self.stdout.write(self.style.WARNING(f'⚠️  {descricao}: não usa {indice}'))
+
+            if options['verbosity'] > 1 or indice not in plano:
+                for linha in plano.splitlines():
+                    self.stdout.write(f'      {linha}')
+
+        if faltando:
+            # No PostgreSQL, com poucas linhas o planejador prefere varrer a tabela: rode após ANALYZE com dados reais
+            raise CommandError(f'{len(faltando)} consulta(s) sem o índice esperado.')
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+NAVEGADORES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+CONTATO = 'Equipe Frota'
+
+
+def navegador_disponivel():
+    return any(shutil.which(nome) for nome in NAVEGADORES)
+
+
+class Command(BaseCommand):
+    help = (
+        'Verificação automática da SessaoWhatsApp contra drivers/whatsapp_stub.html: envio com confirmação, '
+        'reaproveitamento da conversa aberta e recuperação depois que a página é fechada. '
+        'É pulada (sem erro) quando selenium ou o Chrome não estão instalados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--visivel', action='store_true', help='Abre o Chrome com janela.')
+        parser.add_argument('--timeout', type=float, default=10.0,
+                            help='Segundos de espera por elemento (padrão: 10).')
+
+    def handle(self, *args, **options):
+        try:
+            from drivers.services_whatsapp import STUB_WHATSAPP, SessaoWhatsApp
+        except ImportError as e:
+            self.stdout.write(self.style.WARNING(f'⏭️  Verificação pulada: {e} (instale selenium e webdriver-manager).'))
+            return
+        if not navegador_disponivel():
+            self.stdout.write(self.style.WARNING('⏭️  Verificação pulada: Chrome/Chromium não encontrado no PATH.'))
+            return
+        if not os.environ.get('CHROMEDRIVER_PATH') and shutil.which('chromedriver'):
+            # Evita que o webdriver-manager baixe outro chromedriver
+            os.environ['CHROMEDRIVER_PATH'] = shutil.which('chromedriver')
+
+        self.falhas = []
+        with tempfile.TemporaryDirectory() as perfil:
+            sessao = SessaoWhatsApp(
+                url=f'{STUB_WHATSAPP.as_uri()}?login=500', contato=CONTATO, headless=not options['visivel'],
+                session_dir=perfil, timeout_login=options['timeout'] * 3, timeout=options['timeout'],
+            )
+            try:
+                self._verificar_envio(sessao)
+                self._verificar_conversa_reaproveitada(sessao)
+                self._verificar_recuperacao(sessao)
+            finally:
+                sessao.encerrar()
+
+        if self.falhas:
+            raise CommandError(f'{len(self.falhas)} verificação(ões) falharam: {"; ".join(self.falhas)}')
+        self.stdout.write(self.style.SUCCESS('✅ SessaoWhatsApp ok contra o stub.'))
+
+    def _conferir(self, descricao, obtido, esperado):
+        if obtido == esperado:
+            self.stdout.write(f'   ✅ {descricao}')
+        else:
+            self.falhas.append(descricao)
+            self.stdout.write(self.style.ERROR(f'   ❌ {descricao}: esperado {esperado!r}, obtido {obtido!r}'))
+
+    @staticmethod
+    def _enviadas(sessao):
+        return sessao.driver.execute_script('return window.enviadas')
+
+    def _verificar_envio(self, sessao):
+        self.stdout.write('📤 Envio e confirmação')
+        mensagem = 'Novo motorista\nJoão da Silva'
+        self._conferir('enviar() confirma o envio', sessao.enviar(mensagem), True)
+        # Duas linhas numa mensagem só: Shift+Enter não pode disparar o envio
+        self._conferir('mensagem chega inteira ao stub', self._enviadas(sessao), [mensagem])
+        caixa = sessao.driver.execute_script("return document.getElementById('caixa').innerText")
+        self._conferir('caixa de texto vazia após o envio', caixa.strip(), '')
+        self._conferir('conversa registrada como aberta', sessao.conversa_aberta, CONTATO)
+
+    def _verificar_conversa_reaproveitada(self, sessao):
+        self.stdout.write('💬 Conversa reaproveitada')
+        sessao.driver.execute_script(
+            "window.buscas = 0;"
+            "document.getElementById('busca').addEventListener('input', () => window.buscas++);"
+        )
+        sessao.enviar('Segunda mensagem')
+        self._conferir('segunda mensagem enviada', self._enviadas(sessao)[-1:], ['Segunda mensagem'])
+        self._conferir('contato não foi buscado de novo', sessao.driver.execute_script('return window.buscas'), 0)
+        self._conferir('navegador não foi reiniciado', sessao.reinicios, 0)
+
+    def _verificar_recuperacao(self, sessao):
+        self.stdout.write('🔁 Recuperação da sessão')
+        # Página fechada: a única janela some e o driver perde a sessão
+        sessao.driver.close()
+        self._conferir('health check detecta a página fechada', sessao.saudavel(), False)
+        sessao.enviar('Após fechar a página')
+        self._conferir('navegador reiniciado uma vez', sessao.reinicios, 1)
+        self._conferir('mensagem enviada pela nova sessão', self._enviadas(sessao), ['Após fechar a página'])
+
+        # Sessão "deslogada": a página continua aberta, mas sem a caixa de busca
+        sessao.driver.get('about:blank')
+        sessao.enviar('Após perder o login')
+        self._conferir('navegador reiniciado após perder o login', sessao.reinicios, 2)
+        self._conferir('mensagem enviada após o novo login', self._enviadas(sessao), ['Após perder o login'])
+        self._conferir('total de mensagens enviadas', sessao.mensagens_enviadas, 4)
@@ -0,0 +1,96 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drivers.services_notificacoes import (
+    devolver_notificacoes, liberar_travadas, marcar_enviada, registrar_falha, reservar_notificacoes,
+)
+
+
+class Command(BaseCommand):
+    help = 'Mantém uma sessão do WhatsApp Web aberta e envia em sequência as notificações pendentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Endereço do WhatsApp Web (padrão: WHATSAPP_URL ou web.whatsapp.com).')
+        parser.add_argument('--stub', action='store_true',
+                            help='Usa a página local drivers/whatsapp_stub.html no lugar do WhatsApp Web.')
+        parser.add_argument('--contato', help='Conversa de destino (padrão: WHATSAPP_CONTATO ou "Eu").')
+        parser.add_argument('--visivel', action='store_true', help='Abre o Chrome com janela (para escanear o QR Code).')
+        parser.add_argument('--uma-vez', action='store_true', help='Envia as pendentes atuais e encerra.')
+        parser.add_argument('--intervalo', type=float, default=5.0,
+                            help='Segundos entre verificações da fila vazia (padrão: 5).')
+        parser.add_argument('--health-check', type=float, default=60.0,
+                            help='Segundos entre verificações da sessão com a fila vazia (padrão: 60).')
+        parser.add_argument('--lote', type=int, default=20,
+                            help='Notificações reservadas por vez (padrão: 20).')
+
+    def handle(self, *args, **options):
+        try:
+            from selenium.common.exceptions import WebDriverException
+            from drivers.services_whatsapp import STUB_WHATSAPP, SessaoWhatsApp, SessaoWhatsAppErro
+        except ImportError as e:
+            raise CommandError(f'Dependência do WhatsApp ausente ({e}). Instale selenium e webdriver-manager.')
+
+        url = STUB_WHATSAPP.as_uri() if options['stub'] else options['url']
+        sessao = SessaoWhatsApp(url=url, contato=options['contato'], headless=not options['visivel'])
+
+        self.stdout.write('📱 Daemon do WhatsApp iniciado')
+        falhas = 0
+        ultimo_health_check = 0.0
+        try:
+            while True:
+                try:
+                    liberar_travadas()
+                    enviadas = self._enviar_lote(sessao, options['lote'], (SessaoWhatsAppErro, WebDriverException))
+                    if enviadas:
+                        falhas = 0
+                        continue
+                    if options['uma_vez']:
+                        break
+
+                    if time.monotonic() - ultimo_health_check >= options['health_check']:
+                        sessao.garantir()
+                        ultimo_health_check = time.monotonic()
+                    time.sleep(options['intervalo'])
+
+                except (SessaoWhatsAppErro, WebDriverException) as e:
+                    # ✅ Recuperação automática: fecha o navegador e tenta de novo com espera crescente
+                    falhas += 1
+                    espera = min(2 ** falhas, 300)
+                    self.stdout.write(self.style.ERROR(f'❌ {e}'.strip()))
+                    self.stdout.write(f'🔁 Reiniciando sessão em {espera}s (falha {falhas})')
+                    sessao.encerrar()
+                    if options['uma_vez'] and falhas >= 3:
+                        raise CommandError('Sessão do WhatsApp indisponível.')
+                    time.sleep(espera)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sessao.encerrar()
+            self.stdout.write(
+                f'🔒 Daemon encerrado: {sessao.mensagens_enviadas} mensagem(ns) enviada(s), '
+                f'{sessao.reinicios} reinício(s) de sessão'
+            )
+
+    def _enviar_lote(self, sessao, tamanho, erros_sessao):
+        """
+        Reserva um lote da fila e envia em sequência pela mesma sessão.
+        Se a sessão cair, a mensagem atual conta como falha (com backoff), o resto do lote volta
+        para a fila sem perder tentativa e o erro sobe para o loop reiniciar o navegador.
+        """
+        lote = reservar_notificacoes(tamanho)
+        enviadas = 0
+        for posicao, notificacao in enumerate(lote):
+            inicio = time.monotonic()
+            try:
+                sessao.enviar(notificacao.mensagem)
+            except erros_sessao as e:
+                registrar_falha(notificacao, e)
+                devolver_notificacoes(lote[posicao + 1:])
+                raise
+            marcar_enviada(notificacao)
+            enviadas += 1
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {notificacao.nome_motorista} ({time.monotonic() - inicio:.1f}s)"
+            ))
+        return enviadas
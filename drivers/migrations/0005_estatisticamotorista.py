@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:51
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def popular_estatisticas(apps, schema_editor):
+    Motorista = apps.get_model('drivers', 'Motorista')
+    EstatisticaMotorista = apps.get_model('drivers', 'EstatisticaMotorista')
+    linhas = (
+        Motorista.objects.order_by()
+        .values('status', 'estado', 'cnh_categoria')
+        .annotate(total=Count('id'), total_com_salario=Count('salario'), soma_salarios=Sum('salario'))
+    )
+    EstatisticaMotorista.objects.bulk_create([
+        EstatisticaMotorista(
+            status=linha['status'],
+            estado=linha['estado'],
+            cnh_categoria=linha['cnh_categoria'],
+            total=linha['total'],
+            total_com_salario=linha['total_com_salario'],
+            soma_salarios=linha['soma_salarios'] or 0,
+        )
+        for linha in linhas
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0004_motorista_mei_numero'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstatisticaMotorista',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=10, verbose_name='Status')),
+                ('estado', models.CharField(max_length=2, verbose_name='Estado')),
+                ('cnh_categoria', models.CharField(max_length=2, verbose_name='Categoria CNH')),
+                ('total', models.IntegerField(default=0, verbose_name='Total de Motoristas')),
+                ('total_com_salario', models.IntegerField(default=0, verbose_name='Motoristas com Salário')),
+                ('soma_salarios', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Soma dos Salários')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Atualização')),
+            ],
+            options={
+                'verbose_name': 'Estatística de Motoristas',
+                'verbose_name_plural': 'Estatísticas de Motoristas',
+                'constraints': [models.UniqueConstraint(fields=('status', 'estado', 'cnh_categoria'), name='estatistica_motorista_chave')],
+            },
+        ),
+        migrations.RunPython(popular_estatisticas, migrations.RunPython.noop),
+    ]
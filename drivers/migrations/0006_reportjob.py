@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0005_estatisticamotorista'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('EXCEL', 'Excel Completo'), ('PDF', 'PDF Resumido'), ('ESTATISTICAS', 'Estatísticas Excel')], max_length=20, verbose_name='Tipo')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Na fila'), ('PROCESSANDO', 'Processando'), ('CONCLUIDO', 'Concluído'), ('ERRO', 'Erro')], default='PENDENTE', max_length=15, verbose_name='Status')),
+                ('parametros', models.JSONField(blank=True, default=dict, verbose_name='Filtros')),
+                ('arquivo', models.FileField(blank=True, upload_to='relatorios/', verbose_name='Arquivo')),
+                ('tamanho_bytes', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Tamanho (bytes)')),
+                ('duracao_segundos', models.FloatField(blank=True, null=True, verbose_name='Duração (s)')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Solicitado em')),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Relatório em Segundo Plano',
+                'verbose_name_plural': 'Relatórios em Segundo Plano',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reportjob_status_created')],
+            },
+        ),
+    ]
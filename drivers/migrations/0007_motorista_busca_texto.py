@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:55
+
+from django.db import migrations, models
+
+from drivers.busca import garantir_indice_busca, montar_texto_busca, remover_indice_busca
+
+
+def popular_busca_texto(apps, schema_editor):
+    Motorista = apps.get_model('drivers', 'Motorista')
+    lote = []
+    for motorista in Motorista.objects.only(
+            'id', 'nome_completo', 'cidade', 'cpf', 'cnh_numero', 'mei_numero').iterator(chunk_size=2000):
+        motorista.busca_texto = montar_texto_busca(
+            motorista.nome_completo, motorista.cidade, motorista.cpf, motorista.cnh_numero, motorista.mei_numero
+        )
+        lote.append(motorista)
+        if len(lote) >= 2000:
+            Motorista.objects.bulk_update(lote, ['busca_texto'])
+            lote = []
+    if lote:
+        Motorista.objects.bulk_update(lote, ['busca_texto'])
+
+
+def criar_indice_busca(apps, schema_editor):
+    garantir_indice_busca(schema_editor.connection)
+
+
+def apagar_indice_busca(apps, schema_editor):
+    remover_indice_busca(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0006_reportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='motorista',
+            name='busca_texto',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Texto de Busca'),
+        ),
+        migrations.RunPython(popular_busca_texto, migrations.RunPython.noop),
+        migrations.RunPython(criar_indice_busca, apagar_indice_busca),
+    ]
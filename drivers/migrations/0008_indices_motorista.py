@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0007_motorista_busca_texto'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='motorista_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['created_at', 'id'], name='motorista_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['estado'], name='motorista_estado'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['cnh_categoria'], name='motorista_cnh_categoria'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['cnh_validade'], name='motorista_cnh_validade'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['nome_completo', 'id'], name='motorista_nome_id'),
+        ),
+    ]
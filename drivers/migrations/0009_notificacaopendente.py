@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0008_indices_motorista'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacaoPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome_motorista', models.CharField(max_length=100, verbose_name='Motorista (nome)')),
+                ('destino', models.CharField(blank=True, max_length=100, verbose_name='Destino')),
+                ('mensagem', models.TextField(verbose_name='Mensagem')),
+                ('referencia', models.CharField(blank=True, max_length=200, null=True, unique=True, verbose_name='Referência')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Enviando'), ('ENVIADA', 'Enviada'), ('FALHOU', 'Falhou')], default='PENDENTE', max_length=15, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa')),
+                ('reservado_por', models.CharField(blank=True, max_length=32, verbose_name='Reservado por')),
+                ('reservado_em', models.DateTimeField(blank=True, null=True, verbose_name='Reservado em')),
+                ('ultimo_erro', models.TextField(blank=True, verbose_name='Último erro')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Criada em')),
+                ('enviada_em', models.DateTimeField(blank=True, null=True, verbose_name='Enviada em')),
+                ('motorista', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notificacoes', to='drivers.motorista', verbose_name='Motorista')),
+            ],
+            options={
+                'verbose_name': 'Notificação Pendente',
+                'verbose_name_plural': 'Notificações Pendentes',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa', 'id'], name='notificacao_status_proxima'), models.Index(fields=['reservado_por'], name='notificacao_reservado_por')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0009_notificacaopendente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaCadastro',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=30, verbose_name='Tipo')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('CONCLUIDA', 'Concluída'), ('ERRO', 'Erro')], default='PENDENTE', max_length=15, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa')),
+                ('reservado_por', models.CharField(blank=True, max_length=32, verbose_name='Reservado por')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Criada em')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('duracao_segundos', models.FloatField(blank=True, null=True, verbose_name='Duração (s)')),
+                ('motorista', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tarefas', to='drivers.motorista', verbose_name='Motorista')),
+            ],
+            options={
+                'verbose_name': 'Tarefa Pós-Cadastro',
+                'verbose_name_plural': 'Tarefas Pós-Cadastro',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa', 'id'], name='tarefa_status_proxima')],
+            },
+        ),
+    ]
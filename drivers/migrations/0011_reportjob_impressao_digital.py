@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0010_tarefacadastro'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='impressao_digital',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Impressão digital'),
+        ),
+    ]
@@ -1,8 +1,76 @@
+import hashlib
+import json
+
 from django.db import models
+from django.utils import timezone
 from django.core.validators import RegexValidator
-from datetime import date
+from datetime import date, timedelta
 from django.contrib.auth.models import User
 
+from .busca import anotar_relevancia, filtrar_busca, montar_texto_busca
+
+
+def calcular_idade(data_nascimento, hoje=None):
+    if not data_nascimento:
+        return None
+    hoje = hoje or date.today()
+    return hoje.year - data_nascimento.year - (
+            (hoje.month, hoje.day) < (data_nascimento.month, data_nascimento.day)
+    )
+
+
+def formatar_cpf(cpf):
+    numeros = (cpf or '').replace('.', '').replace('-', '')
+    if numeros and len(numeros) == 11:
+        return f'{numeros[:3]}.{numeros[3:6]}.{numeros[6:9]}-{numeros[9:]}'
+    return cpf or ''
+
+
+DIAS_AVISO_CNH = 30
+
+
+class MotoristaQuerySet(models.QuerySet):
+    def filtrar(self, status=None, search=None):
+        """Aplica os filtros de status e busca usados na lista de motoristas e nas exportações"""
+        queryset = self
+        if status:
+            queryset = queryset.filter(status=status)
+        if search:
+            # Nome, cidade, CPF, CNH e MEI pelo índice de busca (sem acentos, por prefixo)
+            queryset = filtrar_busca(queryset, search)
+        return queryset
+
+    def impressao_digital(self, *extras):
+        """
+        Hash que muda sempre que um motorista do recorte é criado, alterado ou excluído: quantidade de
+        linhas e maior updated_at (uma consulta), mais os `extras` (filtros, tipo, versão de formato).
+        Base das ETags da API e do cache de relatórios.
+        """
+        estado = self.aggregate(total=models.Count('id'), ultima_alteracao=models.Max('updated_at'))
+        base = json.dumps([
+            estado['total'],
+            estado['ultima_alteracao'].isoformat() if estado['ultima_alteracao'] else None,
+            *extras,
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(base.encode()).hexdigest()
+
+    def por_relevancia(self, search):
+        """Ordena os resultados de uma busca do mais para o menos relevante"""
+        return anotar_relevancia(self, search).order_by('-relevancia', '-created_at')
+
+    def cnh_vencendo_ate(self, dias=DIAS_AVISO_CNH, hoje=None):
+        """CNHs vencidas ou que vencem nos próximos `dias` dias (um único range no índice de cnh_validade)"""
+        hoje = hoje or date.today()
+        return self.filter(cnh_validade__lte=hoje + timedelta(days=dias))
+
+    def cnh_vencendo(self, dias=DIAS_AVISO_CNH, hoje=None):
+        """CNHs ainda válidas que vencem nos próximos `dias` dias"""
+        hoje = hoje or date.today()
+        return self.filter(cnh_validade__range=(hoje, hoje + timedelta(days=dias)))
+
+    def cnh_vencida(self, hoje=None):
+        return self.filter(cnh_validade__lt=hoje or date.today())
+
 
 class Motorista(models.Model):
     CATEGORIA_CNH_CHOICES = [
@@ -93,37 +161,220 @@ class Motorista(models.Model):
     salario = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name='Salário')
     observacoes = models.TextField(blank=True, verbose_name='Observações')
 
+    # Nome, cidade e documentos normalizados (sem acentos) para o índice de busca
+    busca_texto = models.TextField(blank=True, default='', editable=False, verbose_name='Texto de Busca')
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Data de Cadastro')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Última Atualização')
 
+    objects = MotoristaQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Motorista'
         verbose_name_plural = 'Motoristas'
         ordering = ['nome_completo']
+        # ✅ Índices casados com as consultas da lista, do dashboard, do admin e dos relatórios
+        # (o comando verificar_indices confere no EXPLAIN que cada consulta usa o seu)
+        indexes = [
+            models.Index(fields=['status', 'created_at', 'id'], name='motorista_status_created'),
+            models.Index(fields=['created_at', 'id'], name='motorista_created_id'),
+            models.Index(fields=['estado'], name='motorista_estado'),
+            models.Index(fields=['cnh_categoria'], name='motorista_cnh_categoria'),
+            models.Index(fields=['cnh_validade'], name='motorista_cnh_validade'),
+            models.Index(fields=['nome_completo', 'id'], name='motorista_nome_id'),
+        ]
 
     def __str__(self):
         return self.nome_completo
 
+    def atualizar_busca_texto(self):
+        self.busca_texto = montar_texto_busca(
+            self.nome_completo, self.cidade, self.cpf, self.cnh_numero, self.mei_numero
+        )
+
+    def save(self, *args, **kwargs):
+        self.atualizar_busca_texto()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'busca_texto' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['busca_texto']
+        super().save(*args, **kwargs)
+
     @property
     def idade(self):
-        if not self.data_nascimento:
-            return None
-        today = date.today()
-        return today.year - self.data_nascimento.year - (
-                (today.month, today.day) < (self.data_nascimento.month, self.data_nascimento.day)
-        )
+        return calcular_idade(self.data_nascimento)
 
     @property
     def cpf_formatado(self):
-        cpf = self.cpf.replace('.', '').replace('-', '')
-        if cpf and len(cpf) == 11:
-            return f'{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}'
-        return self.cpf or ''
+        return formatar_cpf(self.cpf)
 
     def cnh_proxima_vencer(self):
         if not self.cnh_validade:
             return False
         today = date.today()
         days_until_expiry = (self.cnh_validade - today).days
-        return 0 <= days_until_expiry <= 30
\ No newline at end of file
+        return 0 <= days_until_expiry <= DIAS_AVISO_CNH
+
+
+class EstatisticaMotorista(models.Model):
+    """
+    Contadores materializados por (status, estado, categoria CNH).
+    Mantidos pelos signals de Motorista e reconstruídos pelo comando recalcular_estatisticas.
+    """
+    status = models.CharField(max_length=10, verbose_name='Status')
+    estado = models.CharField(max_length=2, verbose_name='Estado')
+    cnh_categoria = models.CharField(max_length=2, verbose_name='Categoria CNH')
+    total = models.IntegerField(default=0, verbose_name='Total de Motoristas')
+    total_com_salario = models.IntegerField(default=0, verbose_name='Motoristas com Salário')
+    soma_salarios = models.DecimalField(max_digits=16, decimal_places=2, default=0, verbose_name='Soma dos Salários')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Última Atualização')
+
+    class Meta:
+        verbose_name = 'Estatística de Motoristas'
+        verbose_name_plural = 'Estatísticas de Motoristas'
+        constraints = [
+            models.UniqueConstraint(fields=['status', 'estado', 'cnh_categoria'], name='estatistica_motorista_chave'),
+        ]
+
+    def __str__(self):
+        return f'{self.status}/{self.estado}/{self.cnh_categoria}: {self.total}'
+
+
+class ReportJob(models.Model):
+    """Relatório gerado em segundo plano pelo comando processar_relatorios."""
+    TIPO_CHOICES = [
+        ('EXCEL', 'Excel Completo'),
+        ('PDF', 'PDF Resumido'),
+        ('ESTATISTICAS', 'Estatísticas Excel'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Na fila'),
+        ('PROCESSANDO', 'Processando'),
+        ('CONCLUIDO', 'Concluído'),
+        ('ERRO', 'Erro'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, verbose_name='Tipo')
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='PENDENTE', verbose_name='Status')
+    parametros = models.JSONField(default=dict, blank=True, verbose_name='Filtros')
+    solicitado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='Solicitado por'
+    )
+
+    arquivo = models.FileField(upload_to='relatorios/', blank=True, verbose_name='Arquivo')
+    impressao_digital = models.CharField(max_length=64, blank=True, db_index=True, verbose_name='Impressão digital')
+    tamanho_bytes = models.PositiveBigIntegerField(null=True, blank=True, verbose_name='Tamanho (bytes)')
+    duracao_segundos = models.FloatField(null=True, blank=True, verbose_name='Duração (s)')
+    erro = models.TextField(blank=True, verbose_name='Erro')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Solicitado em')
+    iniciado_em = models.DateTimeField(null=True, blank=True, verbose_name='Iniciado em')
+    concluido_em = models.DateTimeField(null=True, blank=True, verbose_name='Concluído em')
+
+    class Meta:
+        verbose_name = 'Relatório em Segundo Plano'
+        verbose_name_plural = 'Relatórios em Segundo Plano'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='reportjob_status_created'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_tipo_display()} #{self.pk} ({self.get_status_display()})'
+
+    @property
+    def finalizado(self):
+        return self.status in ('CONCLUIDO', 'ERRO')
+
+
+class NotificacaoPendente(models.Model):
+    """
+    Fila (outbox) de notificações a enviar. Vários senders podem consumir em paralelo:
+    cada um reserva um lote com reservar_notificacoes() e só ele marca o resultado.
+    """
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('PROCESSANDO', 'Enviando'),
+        ('ENVIADA', 'Enviada'),
+        ('FALHOU', 'Falhou'),
+    ]
+
+    motorista = models.ForeignKey(
+        Motorista,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notificacoes',
+        verbose_name='Motorista'
+    )
+    nome_motorista = models.CharField(max_length=100, verbose_name='Motorista (nome)')
+    destino = models.CharField(max_length=100, blank=True, verbose_name='Destino')
+    mensagem = models.TextField(verbose_name='Mensagem')
+    # Evita enfileirar duas vezes o mesmo aviso (ex.: "cnh:<id>:<validade>:vencendo")
+    referencia = models.CharField(max_length=200, unique=True, null=True, blank=True, verbose_name='Referência')
+
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='PENDENTE', verbose_name='Status')
+    tentativas = models.PositiveIntegerField(default=0, verbose_name='Tentativas')
+    proxima_tentativa = models.DateTimeField(default=timezone.now, verbose_name='Próxima tentativa')
+    reservado_por = models.CharField(max_length=32, blank=True, verbose_name='Reservado por')
+    reservado_em = models.DateTimeField(null=True, blank=True, verbose_name='Reservado em')
+    ultimo_erro = models.TextField(blank=True, verbose_name='Último erro')
+
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='Criada em')
+    enviada_em = models.DateTimeField(null=True, blank=True, verbose_name='Enviada em')
+
+    class Meta:
+        verbose_name = 'Notificação Pendente'
+        verbose_name_plural = 'Notificações Pendentes'
+        ordering = ['-created_at']
+        indexes = [
+            # Reserva do próximo lote: WHERE status = 'PENDENTE' AND proxima_tentativa <= agora
+            models.Index(fields=['status', 'proxima_tentativa', 'id'], name='notificacao_status_proxima'),
+            models.Index(fields=['reservado_por'], name='notificacao_reservado_por'),
+        ]
+
+    def __str__(self):
+        return f'{self.nome_motorista} ({self.get_status_display()})'
+
+
+class TarefaCadastro(models.Model):
+    """
+    Efeito colateral de um cadastro (notificação, processamento da foto...) executado fora da requisição.
+    Criada na mesma transação do motorista e executada após o commit por drivers/pos_cadastro.py;
+    o que não rodar ali (fila cheia, processo reiniciado) é pego pelo comando processar_tarefas.
+    """
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('PROCESSANDO', 'Processando'),
+        ('CONCLUIDA', 'Concluída'),
+        ('ERRO', 'Erro'),
+    ]
+
+    motorista = models.ForeignKey(Motorista, on_delete=models.CASCADE, related_name='tarefas', verbose_name='Motorista')
+    tipo = models.CharField(max_length=30, verbose_name='Tipo')
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='PENDENTE', verbose_name='Status')
+    tentativas = models.PositiveIntegerField(default=0, verbose_name='Tentativas')
+    proxima_tentativa = models.DateTimeField(default=timezone.now, verbose_name='Próxima tentativa')
+    reservado_por = models.CharField(max_length=32, blank=True, verbose_name='Reservado por')
+    erro = models.TextField(blank=True, verbose_name='Erro')
+
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='Criada em')
+    iniciada_em = models.DateTimeField(null=True, blank=True, verbose_name='Iniciada em')
+    concluida_em = models.DateTimeField(null=True, blank=True, verbose_name='Concluída em')
+    duracao_segundos = models.FloatField(null=True, blank=True, verbose_name='Duração (s)')
+
+    class Meta:
+        verbose_name = 'Tarefa Pós-Cadastro'
+        verbose_name_plural = 'Tarefas Pós-Cadastro'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa', 'id'], name='tarefa_status_proxima'),
+        ]
+
+    def __str__(self):
+        return f'{self.tipo} #{self.pk} ({self.get_status_display()})'
@@ -0,0 +1,100 @@
+# drivers/paginacao.py
+"""
+Paginação por cursor (keyset) sobre (created_at, id).
+
+Em vez de OFFSET, cada página começa logo após a última linha da página anterior,
+então a página 1.000 custa o mesmo que a primeira e não há COUNT(*) por página.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def codificar_cursor(created_at, pk, direcao):
+    """Gera o token opaco de navegação. direcao: 'p' (próxima página) ou 'a' (anterior)."""
+    dados = json.dumps([created_at.isoformat(), pk, direcao], separators=(',', ':'))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(token):
+    """Devolve (created_at, id, direcao) ou None se o token for inválido."""
+    if not token:
+        return None
+    try:
+        dados = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, pk, direcao = json.loads(dados)
+        if direcao not in ('p', 'a'):
+            return None
+        return datetime.fromisoformat(created_at), int(pk), direcao
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+
+class PaginaCursor:
+    """Página de resultados com os tokens para a próxima e a anterior (None quando não existem)."""
+
+    def __init__(self, object_list, proximo_cursor, cursor_anterior):
+        self.object_list = object_list
+        self.proximo_cursor = proximo_cursor
+        self.cursor_anterior = cursor_anterior
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.proximo_cursor is not None
+
+    def has_previous(self):
+        return self.cursor_anterior is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _posicao(linha):
+    """(created_at, id) de um objeto ou de uma linha de .values() (que precisa trazer os dois campos)."""
+    if isinstance(linha, dict):
+        return linha['created_at'], linha['id']
+    return linha.created_at, linha.pk
+
+
+def paginar_por_cursor(queryset, token, tamanho):
+    """
+    Busca uma página de `tamanho` motoristas em ordem (-created_at, -id) a partir do token.
+    Lê uma linha a mais para saber se existe página seguinte. Aceita querysets de .values().
+    """
+    cursor = decodificar_cursor(token)
+
+    if cursor is None:
+        linhas = list(queryset.order_by('-created_at', '-id')[:tamanho + 1])
+        tem_mais = len(linhas) > tamanho
+        linhas = linhas[:tamanho]
+        tem_proxima, tem_anterior = tem_mais, False
+    else:
+        created_at, pk, direcao = cursor
+        if direcao == 'p':
+            linhas = list(
+                queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+                .order_by('-created_at', '-id')[:tamanho + 1]
+            )
+            tem_mais = len(linhas) > tamanho
+            linhas = linhas[:tamanho]
+            tem_proxima, tem_anterior = tem_mais, True
+        else:
+            linhas = list(
+                queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+                .order_by('created_at', 'id')[:tamanho + 1]
+            )
+            tem_mais = len(linhas) > tamanho
+            linhas = linhas[:tamanho][::-1]
+            tem_proxima, tem_anterior = True, tem_mais
+
+    proximo = codificar_cursor(*_posicao(linhas[-1]), 'p') if linhas and tem_proxima else None
+    anterior = codificar_cursor(*_posicao(linhas[0]), 'a') if linhas and tem_anterior else None
+    return PaginaCursor(linhas, proximo, anterior)
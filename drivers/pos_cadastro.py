@@ -0,0 +1,179 @@
+# drivers/pos_cadastro.py
+"""
+Pipeline pós-cadastro: efeitos colaterais de um novo motorista executados fora da requisição.
+
+agendar_pos_cadastro() grava uma TarefaCadastro por efeito na mesma transação do motorista e,
+após o commit, entrega as tarefas a um pool de threads limitado. Se o pool estiver cheio ou o
+processo reiniciar, as tarefas continuam na tabela e o comando processar_tarefas as executa
+(semântica at-least-once: cada tarefa precisa poder rodar mais de uma vez).
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max
+from django.utils import timezone
+
+from .models import TarefaCadastro
+
+logger = logging.getLogger(__name__)
+
+MAX_TENTATIVAS = 5
+ESPERA_BASE_SEGUNDOS = 30
+
+# tipo -> função(motorista); registradas com @tarefa_pos_cadastro
+TAREFAS = {}
+
+_executor = None
+_vagas = None
+_trava_executor = threading.Lock()
+
+
+def tarefa_pos_cadastro(tipo):
+    """Registra uma função como tarefa do pipeline. Ela recebe o Motorista e deve ser idempotente."""
+    def registrar(funcao):
+        TAREFAS[tipo] = funcao
+        return funcao
+    return registrar
+
+
+def _pool():
+    global _executor, _vagas
+    with _trava_executor:
+        if _executor is None:
+            threads = getattr(settings, 'POS_CADASTRO_THREADS', 2)
+            _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='pos-cadastro')
+            # Limite de tarefas em espera no pool: acima disso ficam só na tabela para o worker
+            _vagas = threading.BoundedSemaphore(getattr(settings, 'POS_CADASTRO_FILA_MAXIMA', 100))
+    return _executor, _vagas
+
+
+def agendar_pos_cadastro(motorista, tipos=None):
+    """
+    Cria as tarefas do motorista e agenda a execução para depois do commit.
+    Chamar dentro da transação do cadastro: se ela for desfeita, nada é executado.
+    """
+    tipos = list(tipos or TAREFAS)
+    tarefas = TarefaCadastro.objects.bulk_create([
+        TarefaCadastro(motorista=motorista, tipo=tipo) for tipo in tipos
+    ])
+    ids = [tarefa.pk for tarefa in tarefas]
+    if getattr(settings, 'POS_CADASTRO_EM_THREAD', True):
+        transaction.on_commit(lambda: submeter(ids))
+    return tarefas
+
+
+def submeter(ids):
+    """Entrega as tarefas ao pool sem nunca bloquear a requisição."""
+    executor, vagas = _pool()
+    for pk in ids:
+        if not vagas.acquire(blocking=False):
+            logger.warning('Fila do pipeline pós-cadastro cheia; tarefa %s fica para o worker', pk)
+            continue
+        executor.submit(_executar_no_pool, pk, vagas)
+
+
+def _executar_no_pool(pk, vagas):
+    try:
+        executar_tarefa(pk)
+    except Exception:
+        logger.exception('Erro inesperado na tarefa pós-cadastro %s', pk)
+    finally:
+        vagas.release()
+        close_old_connections()
+
+
+def _reservar(pk, token):
+    """UPDATE condicional: só um executor (thread ou worker) pega a tarefa."""
+    return TarefaCadastro.objects.filter(
+        pk=pk, status='PENDENTE', proxima_tentativa__lte=timezone.now()
+    ).update(status='PROCESSANDO', reservado_por=token, iniciada_em=timezone.now())
+
+
+def executar_tarefa(pk, token=None):
+    """Executa uma tarefa pendente. Retorna True se concluiu, False se falhou ou já estava com outro."""
+    token = token or uuid.uuid4().hex
+    if not _reservar(pk, token):
+        return False
+
+    tarefa = TarefaCadastro.objects.select_related('motorista').get(pk=pk)
+    inicio = time.monotonic()
+    try:
+        TAREFAS[tarefa.tipo](tarefa.motorista)
+    except Exception as e:
+        tentativas = tarefa.tentativas + 1
+        campos = {'tentativas': tentativas, 'erro': f'{e.__class__.__name__}: {e}'[:2000],
+                  'duracao_segundos': time.monotonic() - inicio, 'reservado_por': ''}
+        if tentativas >= MAX_TENTATIVAS:
+            campos['status'] = 'ERRO'
+        else:
+            campos.update(status='PENDENTE', proxima_tentativa=timezone.now() + timedelta(
+                seconds=ESPERA_BASE_SEGUNDOS * 2 ** (tentativas - 1)
+            ))
+        TarefaCadastro.objects.filter(pk=pk, reservado_por=token).update(**campos)
+        logger.warning('Tarefa pós-cadastro %s (%s) falhou: %s', pk, tarefa.tipo, e)
+        return False
+
+    TarefaCadastro.objects.filter(pk=pk, reservado_por=token).update(
+        status='CONCLUIDA', concluida_em=timezone.now(), duracao_segundos=time.monotonic() - inicio,
+        tentativas=F('tentativas') + 1, erro='',
+    )
+    logger.info('Tarefa pós-cadastro %s (%s) concluída em %.3fs', pk, tarefa.tipo, time.monotonic() - inicio)
+    return True
+
+
+def tarefas_prontas(limite=100):
+    return list(
+        TarefaCadastro.objects.filter(status='PENDENTE', proxima_tentativa__lte=timezone.now())
+        .order_by('proxima_tentativa', 'id').values_list('id', flat=True)[:limite]
+    )
+
+
+def reenfileirar_travadas(minutos=15):
+    """Devolve à fila tarefas de um processo que morreu no meio da execução."""
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return TarefaCadastro.objects.filter(status='PROCESSANDO', iniciada_em__lt=limite).update(
+        status='PENDENTE', reservado_por=''
+    )
+
+
+def metricas_tarefas():
+    """Contagem por tipo e status, duração média/máxima e espera média entre o cadastro e o início."""
+    linhas = (
+        TarefaCadastro.objects.order_by().values('tipo', 'status')
+        .annotate(
+            total=Count('id'),
+            duracao_media=Avg('duracao_segundos'),
+            duracao_maxima=Max('duracao_segundos'),
+            espera_media=Avg(ExpressionWrapper(F('iniciada_em') - F('created_at'), output_field=DurationField())),
+        )
+        .order_by('tipo', 'status')
+    )
+    return list(linhas)
+
+
+# ✅ Tarefas registradas
+
+@tarefa_pos_cadastro('NOTIFICACAO')
+def notificar_novo_cadastro(motorista):
+    """Enfileira o aviso de novo cadastro (a referência evita duplicar se a tarefa rodar de novo)."""
+    from .services_notificacoes import enfileirar_notificacao, mensagem_novo_motorista
+
+    enfileirar_notificacao(
+        mensagem_novo_motorista(motorista.nome_completo),
+        motorista=motorista,
+        referencia=f'cadastro:{motorista.pk}',
+    )
+
+
+@tarefa_pos_cadastro('FOTO')
+def gerar_fotos_reduzidas(motorista):
+    """Gera as miniaturas WebP/JPEG da foto (as já existentes são mantidas)."""
+    from .imagens import gerar_renditions
+
+    gerar_renditions(motorista.foto)
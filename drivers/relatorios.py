@@ -0,0 +1,339 @@
+# drivers/relatorios.py
+import csv
+import json
+from datetime import date, datetime
+
+# openpyxl e reportlab são importados dentro das funções que geram arquivos: este módulo também
+# serve as exportações CSV/NDJSON e é carregado pelas views, onde essas bibliotecas só pesariam no boot
+
+from .models import Motorista, calcular_idade, formatar_cpf
+from .services_estatisticas import calcular_distribuicao_idades, calcular_estatisticas
+
+# Projeção usada pelas exportações: só as colunas necessárias, sem instanciar Motorista
+CAMPOS_EXPORTACAO = (
+    'id', 'nome_completo', 'cpf', 'data_nascimento', 'telefone', 'cidade', 'estado',
+    'cnh_numero', 'cnh_categoria', 'status', 'salario', 'created_at',
+)
+
+CABECALHO_EXCEL = ['ID', 'Nome', 'CPF', 'Data Nasc.', 'Idade', 'Telefone', 'Cidade/UF',
+                   'CNH', 'Categoria', 'Status', 'Salário', 'Data Cadastro']
+
+LARGURAS_EXCEL = [8, 30, 15, 12, 8, 15, 15, 15, 10, 12, 12, 18]
+
+STATUS_DISPLAY = dict(Motorista.STATUS_CHOICES)
+
+TAMANHO_LOTE = 2000
+
+
+def linhas_motoristas(queryset, chunk_size=TAMANHO_LOTE):
+    """
+    Percorre o queryset em lotes (cursor do servidor no PostgreSQL) devolvendo
+    as linhas já formatadas para exportação, uma por vez.
+    """
+    hoje = date.today()
+    for (pk, nome, cpf, data_nascimento, telefone, cidade, estado,
+         cnh_numero, cnh_categoria, status, salario, created_at) in (
+            queryset.values_list(*CAMPOS_EXPORTACAO).iterator(chunk_size=chunk_size)):
+        yield [
+            pk,
+            nome or 'NÃO INFORMADO',
+            formatar_cpf(cpf),
+            data_nascimento.strftime('%d/%m/%Y') if data_nascimento else '',
+            calcular_idade(data_nascimento, hoje),
+            telefone or '',
+            f"{cidade or ''}/{estado or ''}",
+            cnh_numero or '',
+            cnh_categoria or '',
+            STATUS_DISPLAY.get(status, status),
+            float(salario) if salario else 0,
+            created_at.strftime('%d/%m/%Y %H:%M'),
+        ]
+
+
+CAMPOS_DADOS = (
+    'id', 'nome_completo', 'cpf', 'data_nascimento', 'idade', 'telefone', 'cidade', 'estado',
+    'cnh_numero', 'cnh_categoria', 'cnh_validade', 'status', 'status_display', 'salario', 'created_at',
+)
+
+LINHAS_POR_BLOCO = 500
+
+
+def registros_motoristas(queryset, chunk_size=TAMANHO_LOTE):
+    """
+    Versão "dados brutos" das linhas de exportação (datas ISO, salário sem formatação),
+    usada pelos endpoints CSV e NDJSON.
+    """
+    hoje = date.today()
+    for (pk, nome, cpf, data_nascimento, telefone, cidade, estado, cnh_numero,
+         cnh_categoria, cnh_validade, status, salario, created_at) in (
+            queryset.values_list(
+                'id', 'nome_completo', 'cpf', 'data_nascimento', 'telefone', 'cidade', 'estado',
+                'cnh_numero', 'cnh_categoria', 'cnh_validade', 'status', 'salario', 'created_at',
+            ).iterator(chunk_size=chunk_size)):
+        yield (
+            pk,
+            nome,
+            formatar_cpf(cpf),
+            data_nascimento.isoformat() if data_nascimento else None,
+            calcular_idade(data_nascimento, hoje),
+            telefone,
+            cidade,
+            estado,
+            cnh_numero,
+            cnh_categoria,
+            cnh_validade.isoformat() if cnh_validade else None,
+            status,
+            STATUS_DISPLAY.get(status, status),
+            str(salario) if salario is not None else None,
+            created_at.isoformat(),
+        )
+
+
+def _em_blocos(linhas, tamanho=LINHAS_POR_BLOCO):
+    """Junta várias linhas em um único bloco para não enviar um pedaço por linha ao servidor WSGI."""
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= tamanho:
+            yield ''.join(bloco)
+            bloco = []
+    if bloco:
+        yield ''.join(bloco)
+
+
+class _Eco:
+    """Pseudo-arquivo para o csv.writer: devolve a linha em vez de gravá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def stream_csv_motoristas(queryset):
+    writer = csv.writer(_Eco())
+
+    def linhas():
+        yield writer.writerow(CAMPOS_DADOS)
+        for registro in registros_motoristas(queryset):
+            yield writer.writerow(registro)
+
+    return _em_blocos(linhas())
+
+
+def stream_ndjson_motoristas(queryset):
+    def linhas():
+        for registro in registros_motoristas(queryset):
+            yield json.dumps(dict(zip(CAMPOS_DADOS, registro)), ensure_ascii=False) + '\n'
+
+    return _em_blocos(linhas())
+
+
+def gerar_excel_motoristas(arquivo, queryset):
+    """
+    Gera o relatório completo de motoristas em modo write-only do openpyxl:
+    as linhas vão direto para o arquivo, sem manter a planilha em memória.
+    Retorna o total de motoristas exportados.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Relatório Motoristas")
+
+    for col, largura in enumerate(LARGURAS_EXCEL, 1):
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = largura
+
+    def celula(valor, **estilos):
+        cell = WriteOnlyCell(ws, value=valor)
+        for nome, estilo in estilos.items():
+            setattr(cell, nome, estilo)
+        return cell
+
+    center_align = Alignment(horizontal='center', vertical='center')
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+
+    ws.append([celula("RELATÓRIO DE MOTORISTAS - MOTORISTAPOWER",
+                      font=Font(bold=True, size=16, color="366092"))])
+    ws.append([celula(f"Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}")])
+    ws.append([])
+    ws.append([celula(header, font=header_font, fill=header_fill, alignment=center_align)
+               for header in CABECALHO_EXCEL])
+
+    total = 0
+    for linha in linhas_motoristas(queryset):
+        ws.append(linha)
+        total += 1
+
+    ws.append([])
+    ws.append([celula(f"TOTAL DE MOTORISTAS: {total}", font=Font(bold=True, color="366092"))])
+
+    wb.save(arquivo)
+    return total
+
+
+def gerar_pdf_motoristas(arquivo, queryset):
+    """Gera o relatório resumido de motoristas em PDF. Retorna o total de motoristas exportados."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    doc = SimpleDocTemplate(arquivo, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='Center',
+        alignment=1,
+        fontSize=14,
+        spaceAfter=30
+    ))
+
+    elements = []
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.HexColor('#366092'),
+        alignment=1,
+        spaceAfter=30
+    )
+
+    elements.append(Paragraph("RELATÓRIO DE MOTORISTAS", title_style))
+    elements.append(Paragraph(f"<b>MotoristaPower</b> - Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}",
+                              styles['Center']))
+    elements.append(Spacer(1, 20))
+
+    data = [['ID', 'Nome', 'CPF', 'Idade', 'Cidade/UF', 'Status', 'CNH']]
+    for linha in linhas_motoristas(queryset):
+        data.append([
+            str(linha[0]),
+            linha[1],
+            linha[2],
+            str(linha[4]),
+            linha[6],
+            linha[9],
+            linha[8] or 'N/I',
+        ])
+
+    total = len(data) - 1
+    if total:
+        table = Table(data, colWidths=[0.5 * inch, 2 * inch, 1.2 * inch, 0.6 * inch, 1 * inch, 0.8 * inch, 0.6 * inch])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('GRID', (0, 0), (0, -1), 1, colors.black),
+            ('GRID', (1, 0), (-1, -1), 1, colors.black)
+        ]))
+
+        elements.append(table)
+        elements.append(Spacer(1, 20))
+
+        stats = calcular_estatisticas(queryset)
+        elements.append(Paragraph(f"<b>Total de Motoristas:</b> {stats['total_motoristas']}", styles['Normal']))
+        elements.append(Paragraph(f"<b>Ativos:</b> {stats['motoristas_ativos']}", styles['Normal']))
+        elements.append(Paragraph(f"<b>Inativos:</b> {stats['motoristas_inativos']}", styles['Normal']))
+
+    else:
+        elements.append(Paragraph("Nenhum motorista cadastrado.", styles['Normal']))
+
+    doc.build(elements)
+    return total
+
+
+def gerar_excel_estatisticas(arquivo):
+    """Gera a planilha de estatísticas a partir dos contadores materializados e da análise de idade."""
+    import openpyxl
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Estatísticas"
+
+    header_font = Font(bold=True, color="FFFFFF", size=14)
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    center_align = Alignment(horizontal='center', vertical='center')
+
+    ws.merge_cells('A1:E1')
+    ws['A1'] = "RELATÓRIO ESTATÍSTICO - MOTORISTAPOWER"
+    ws['A1'].font = header_font
+    ws['A1'].fill = header_fill
+    ws['A1'].alignment = center_align
+
+    ws.merge_cells('A2:E2')
+    ws['A2'] = f"Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
+    ws['A2'].alignment = center_align
+
+    stats = calcular_estatisticas()
+
+    ws['A4'] = "ESTATÍSTICAS GERAIS"
+    ws['A4'].font = Font(bold=True, size=12)
+
+    total_salarios_formatado = f'R$ {stats["total_salarios"]:,.2f}'
+
+    data_geral = [
+        ['Total de Motoristas', stats['total_motoristas']],
+        ['Motoristas Ativos', stats['motoristas_ativos']],
+        ['Motoristas Inativos', stats['motoristas_inativos']],
+        ['Folha de Pagamento Total', total_salarios_formatado],
+    ]
+
+    for row, (label, value) in enumerate(data_geral, 5):
+        ws.cell(row=row, column=1, value=label)
+        ws.cell(row=row, column=2, value=value)
+        ws.cell(row=row, column=1).font = Font(bold=True)
+
+    ws['A10'] = "DISTRIBUIÇÃO POR ESTADO"
+    ws['A10'].font = Font(bold=True, size=12)
+
+    for row, estado in enumerate(stats['estado_stats'], 11):
+        ws.cell(row=row, column=1, value=estado['estado'] or 'NÃO INFORMADO')
+        ws.cell(row=row, column=2, value=estado['total'])
+
+    ws['D10'] = "DISTRIBUIÇÃO POR CATEGORIA CNH"
+    ws['D10'].font = Font(bold=True, size=12)
+
+    for row, categoria in enumerate(stats['categoria_stats'], 11):
+        ws.cell(row=row, column=4, value=categoria['cnh_categoria'] or 'NÃO INFORMADA')
+        ws.cell(row=row, column=5, value=categoria['total'])
+
+    idades = calcular_distribuicao_idades()
+
+    ws['G4'] = "ANÁLISE DE IDADE"
+    ws['G4'].font = Font(bold=True, size=12)
+
+    data_idade = [
+        ['Idade Média', round(idades['idade_media'], 1) if idades['idade_media'] is not None else '-'],
+        ['Idade Mediana', idades['idade_mediana'] if idades['idade_mediana'] is not None else '-'],
+    ]
+
+    for row, (label, value) in enumerate(data_idade, 5):
+        ws.cell(row=row, column=7, value=label)
+        ws.cell(row=row, column=8, value=value)
+        ws.cell(row=row, column=7).font = Font(bold=True)
+
+    ws['G10'] = "DISTRIBUIÇÃO POR FAIXA ETÁRIA"
+    ws['G10'].font = Font(bold=True, size=12)
+
+    for row, faixa in enumerate(idades['faixas_etarias'], 11):
+        ws.cell(row=row, column=7, value=faixa['faixa'])
+        ws.cell(row=row, column=8, value=faixa['total'])
+
+    ws.column_dimensions['A'].width = 25
+    ws.column_dimensions['B'].width = 15
+    ws.column_dimensions['D'].width = 25
+    ws.column_dimensions['E'].width = 15
+    ws.column_dimensions['G'].width = 30
+    ws.column_dimensions['H'].width = 15
+
+    wb.save(arquivo)
+    return stats['total_motoristas']
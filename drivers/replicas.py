@@ -0,0 +1,119 @@
+# drivers/replicas.py
+"""
+Leituras pesadas (dashboard, lista, relatórios) no banco réplica.
+
+Só vão para o alias 'replica' as leituras de Motorista e EstatisticaMotorista feitas dentro de
+views marcadas com @ler_da_replica / LeituraReplicaMixin (ou do bloco `with lendo_da_replica()`).
+Todo o resto (escritas, sessão, usuário, ReportJob, MotoristaUpdateView) fica no primário.
+
+Depois de uma escrita o usuário lê do primário por REPLICA_JANELA_PRIMARIO segundos (cookie),
+para não ver a própria alteração sumir enquanto a réplica não sincroniza; dentro da mesma
+requisição, qualquer escrita também manda as leituras seguintes para o primário.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import router
+
+ALIAS_REPLICA = 'replica'
+COOKIE_PRIMARIO = 'mp_ler_primario'
+MODELOS_REPLICA = {'drivers.motorista', 'drivers.estatisticamotorista'}
+METODOS_SEGUROS = {'GET', 'HEAD', 'OPTIONS', 'TRACE'}
+
+_usar_replica = ContextVar('usar_replica', default=False)
+_forcar_primario = ContextVar('forcar_primario', default=False)
+
+
+def replica_configurada():
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+def janela_primario():
+    return getattr(settings, 'REPLICA_JANELA_PRIMARIO', 30)
+
+
+@contextmanager
+def lendo_da_replica():
+    """Bloco (ou função decorada) cujas leituras de relatório podem ir para a réplica. Usado pelo worker."""
+    token = _usar_replica.set(True)
+    try:
+        yield
+    finally:
+        _usar_replica.reset(token)
+
+
+def ler_da_replica(view):
+    """Marca uma view baseada em função; o ReplicaMiddleware liga a réplica durante toda a requisição."""
+    view.ler_da_replica = True
+    return view
+
+
+class LeituraReplicaMixin:
+    """Mesmo efeito de @ler_da_replica para views baseadas em classe."""
+    ler_da_replica = True
+
+
+def banco_leitura(model):
+    """
+    Alias escolhido agora para as leituras de `model`. Use com .using() em respostas em streaming,
+    cujo queryset só é percorrido depois que a view (e o middleware) já terminaram.
+    """
+    return router.db_for_read(model) or 'default'
+
+
+class RoteadorReplica:
+    def db_for_read(self, model, **hints):
+        if (
+            _usar_replica.get()
+            and not _forcar_primario.get()
+            and model._meta.label_lower in MODELOS_REPLICA
+            and replica_configurada()
+        ):
+            return ALIAS_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # A partir da primeira escrita, o resto da requisição (ou do bloco) lê do primário
+        if _usar_replica.get():
+            _forcar_primario.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e primário têm os mesmos dados: relações entre objetos lidos de cada um são válidas
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A réplica é uma cópia do primário (sincronizar_replica ou replicação do PostgreSQL)
+        return db != ALIAS_REPLICA
+
+
+def _view_usa_replica(view_func):
+    if getattr(view_func, 'ler_da_replica', False):
+        return True
+    return getattr(getattr(view_func, 'view_class', None), 'ler_da_replica', False)
+
+
+class ReplicaMiddleware:
+    """Liga a réplica nas views marcadas e mantém o usuário no primário logo após uma escrita."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token_replica = _usar_replica.set(False)
+        token_primario = _forcar_primario.set(COOKIE_PRIMARIO in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            _usar_replica.reset(token_replica)
+            _forcar_primario.reset(token_primario)
+
+        if request.method not in METODOS_SEGUROS and replica_configurada():
+            response.set_cookie(COOKIE_PRIMARIO, '1', max_age=janela_primario(), httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if _view_usa_replica(view_func):
+            _usar_replica.set(True)
+        return None
@@ -6,7 +6,20 @@ from rest_framework import serializers
 from .models import Motorista
 
 
-class MotoristaSerializer(serializers.ModelSerializer):
+class CamposDinamicosMixin:
+    """
+    Aceita fields=[...] no construtor e mantém só esses campos (sparse fieldsets da API,
+    ex.: ?fields=id,nome_completo,status).
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for nome in set(self.fields) - set(fields):
+                self.fields.pop(nome)
+
+
+class MotoristaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     # Aplica o validador à chave 'cpf'. Isso garante que o CPF será validado
     # usando a função validate_cpf sempre que um objeto for criado ou atualizado.
     cpf = serializers.CharField(validators=[validate_cpf])
@@ -14,8 +27,9 @@ class MotoristaSerializer(serializers.ModelSerializer):
     class Meta:
         # Define o modelo que este serializador vai manipular
         model = Motorista
-        # Inclui todos os campos do modelo (nome, cpf, data_nascimento, created_at)
-        fields = '__all__'
+        # Inclui todos os campos do modelo (nome, cpf, data_nascimento, created_at),
+        # menos o texto normalizado do índice de busca, que é interno
+        exclude = ['busca_texto']
         # Se você quiser que o CPF seja somente leitura após a criação (recomendado),
         # adicione 'cpf' aqui:
         # read_only_fields = ('cpf',)
\ No newline at end of file
@@ -0,0 +1,78 @@
+# drivers/services_cache.py
+"""
+Cache das páginas públicas e dos blocos do dashboard.
+
+Os blocos que dependem dos motoristas usam a versão dos dados (versao_motoristas) na chave:
+qualquer cadastro, edição ou exclusão incrementa a versão e as chaves antigas simplesmente
+deixam de ser lidas (expiram pelo TTL), sem precisar apagar chave por chave.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+CHAVE_VERSAO = 'motoristas:versao'
+
+
+def versao_motoristas():
+    """Versão atual dos dados de motoristas (começa em 1 quando o cache está vazio)."""
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        cache.add(CHAVE_VERSAO, 1, timeout=None)
+        versao = cache.get(CHAVE_VERSAO, 1)
+    return versao
+
+
+def invalidar_cache_motoristas():
+    """Incrementa a versão: fragmentos e estatísticas em cache passam a ser recalculados."""
+    try:
+        cache.incr(CHAVE_VERSAO)
+    except ValueError:
+        # Chave ausente (cache reiniciado ou expulsa por LRU)
+        cache.add(CHAVE_VERSAO, 1, timeout=None)
+
+
+def invalidar_cache_motoristas_apos_commit():
+    # Antes do commit outra requisição ainda leria (e guardaria) os dados antigos com a versão nova
+    transaction.on_commit(invalidar_cache_motoristas)
+
+
+def estatisticas_em_cache():
+    """calcular_estatisticas() guardado pela versão dos dados: o dashboard não consulta o banco a cada acesso."""
+    from .services_estatisticas import calcular_estatisticas
+
+    chave = f'motoristas:estatisticas:{versao_motoristas()}'
+    return cache.get_or_set(chave, calcular_estatisticas, timeout=settings.CACHE_FRAGMENTOS_TTL)
+
+
+def cache_pagina_anonima(view):
+    """
+    Guarda a página inteira servida a visitantes anônimos em GET/HEAD.
+    Usuários logados (menu e botões diferentes) e respostas que não são 200 passam direto.
+    A chave é só o caminho: as páginas públicas não leem a query string, e usá-la deixaria qualquer
+    visitante criar entradas sem limite (?x=1, ?x=2, ...) e expulsar as verdadeiras.
+    """
+    @wraps(view)
+    def _view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        chave = f'pagina_anonima:{request.path}'
+        guardada = cache.get(chave)
+        if guardada is not None:
+            conteudo, content_type = guardada
+            response = HttpResponse(conteudo, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+        else:
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(chave, (response.content, response['Content-Type']), settings.CACHE_PAGINAS_TTL)
+            response['X-Cache'] = 'MISS'
+        # A mesma URL muda para quem está logado
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    return _view
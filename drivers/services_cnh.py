@@ -0,0 +1,145 @@
+# drivers/services_cnh.py
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DIAS_AVISO_CNH, Motorista
+from .services_cache import invalidar_cache_motoristas_apos_commit
+from .services_estatisticas import registrar_delta
+from .services_notificacoes import enfileirar_notificacoes
+
+CAMPOS_VARREDURA = (
+    'id', 'nome_completo', 'cpf', 'telefone', 'estado', 'cnh_categoria', 'cnh_validade', 'status', 'salario',
+)
+
+
+def lotes_cnh_vencendo(dias=DIAS_AVISO_CNH, lote=1000, hoje=None):
+    """
+    Percorre as CNHs vencidas ou a vencer em lotes de `lote` linhas, paginando por (cnh_validade, id):
+    cada lote é uma busca no índice de cnh_validade, sem OFFSET e sem carregar instâncias.
+    """
+    queryset = Motorista.objects.cnh_vencendo_ate(dias, hoje).order_by('cnh_validade', 'id')
+    ultimo = None
+    while True:
+        pagina = queryset
+        if ultimo is not None:
+            pagina = pagina.filter(
+                Q(cnh_validade__gt=ultimo['cnh_validade']) |
+                Q(cnh_validade=ultimo['cnh_validade'], id__gt=ultimo['id'])
+            )
+        linhas = list(pagina.values(*CAMPOS_VARREDURA)[:lote])
+        if not linhas:
+            return
+        yield linhas
+        if len(linhas) < lote:
+            return
+        ultimo = linhas[-1]
+
+
+def _mensagem_cnh(linha, dias_restantes):
+    if dias_restantes < 0:
+        situacao = f"⚠️ *CNH VENCIDA* há {-dias_restantes} dia(s)"
+    elif dias_restantes == 0:
+        situacao = "⚠️ *CNH VENCE HOJE*"
+    else:
+        situacao = f"🔔 *CNH vence em {dias_restantes} dia(s)*"
+    return (
+        f"{situacao}\n\n"
+        f"👤 *Nome:* {linha['nome_completo']}\n"
+        f"🪪 *Categoria:* {linha['cnh_categoria']}\n"
+        f"📅 *Validade:* {linha['cnh_validade'].strftime('%d/%m/%Y')}\n\n"
+        f"🔔 *Sistema:* MotoristaPower"
+    )
+
+
+@transaction.atomic
+def _alterar_status(linhas, novo_status):
+    """
+    Altera o status de um lote com um único UPDATE e aplica às estatísticas materializadas
+    os mesmos deltas que os signals aplicariam (o .update() não dispara signals).
+
+    As linhas da varredura foram lidas fora desta transação: os valores usados nos deltas são
+    relidos aqui com select_for_update (em ordem de id), só dos motoristas que vão mudar, para que
+    uma edição concorrente de status, estado ou categoria não desalinhe os contadores.
+    """
+    atuais = list(
+        Motorista.objects.select_for_update()
+        .filter(id__in=[linha['id'] for linha in linhas])
+        .exclude(status=novo_status)
+        .order_by('id')
+        .values('id', 'status', 'estado', 'cnh_categoria', 'salario')
+    )
+    if not atuais:
+        return 0
+    # updated_at entra na impressão digital dos relatórios em cache (o .update() não aplica o auto_now)
+    alterados = Motorista.objects.filter(id__in=[linha['id'] for linha in atuais]).update(
+        status=novo_status, updated_at=timezone.now(),
+    )
+
+    deltas = {}
+    for linha in atuais:
+        for status, sinal in ((linha['status'], -1), (novo_status, 1)):
+            chave = (status, linha['estado'], linha['cnh_categoria'])
+            total, com_salario, soma = deltas.get(chave, (0, 0, 0))
+            if linha['salario'] is not None:
+                com_salario += sinal
+                soma += sinal * linha['salario']
+            deltas[chave] = (total + sinal, com_salario, soma)
+    for (status, estado, cnh_categoria), (total, com_salario, soma) in deltas.items():
+        registrar_delta(status, estado, cnh_categoria, total, com_salario, soma)
+    invalidar_cache_motoristas_apos_commit()
+    return alterados
+
+
+def varrer_cnh_vencimento(dias=DIAS_AVISO_CNH, lote=1000, hoje=None, status_vencidas=None, notificar=False,
+                          ao_encontrar=None):
+    """
+    Classifica as CNHs vencidas e a vencer nos próximos `dias` dias.
+    Opcionalmente muda o status dos motoristas com CNH vencida e enfileira uma notificação por motorista;
+    `ao_encontrar(linha)` é chamado para cada motorista (ex.: gravar o relatório em CSV).
+    Retorna o resumo da varredura com as contagens.
+    """
+    hoje = hoje or date.today()
+    resumo = {
+        'hoje': hoje,
+        'dias': dias,
+        'vencidas': 0,
+        'vencendo': 0,
+        'por_categoria': {},
+        'status_alterados': 0,
+        'notificacoes': 0,
+    }
+
+    for linhas in lotes_cnh_vencendo(dias, lote, hoje):
+        notificacoes = []
+        mudar_status = []
+        for linha in linhas:
+            dias_restantes = (linha['cnh_validade'] - hoje).days
+            linha['dias_restantes'] = dias_restantes
+            situacao = 'vencidas' if dias_restantes < 0 else 'vencendo'
+            resumo[situacao] += 1
+            por_categoria = resumo['por_categoria'].setdefault(linha['cnh_categoria'], {'vencidas': 0, 'vencendo': 0})
+            por_categoria[situacao] += 1
+            if dias_restantes < 0 and status_vencidas and linha['status'] != status_vencidas:
+                mudar_status.append(linha)
+            if ao_encontrar:
+                ao_encontrar(linha)
+
+            if notificar:
+                notificacoes.append({
+                    'motorista_id': linha['id'],
+                    'nome_motorista': linha['nome_completo'],
+                    'destino': linha['telefone'],
+                    'mensagem': _mensagem_cnh(linha, dias_restantes),
+                    # Uma notificação por motorista e validade, mesmo rodando a varredura todo dia
+                    'referencia': f"cnh:{linha['id']}:{linha['cnh_validade'].isoformat()}:{situacao}",
+                })
+
+        if mudar_status:
+            resumo['status_alterados'] += _alterar_status(mudar_status, status_vencidas)
+        if notificacoes:
+            resumo['notificacoes'] += enfileirar_notificacoes(notificacoes)
+
+    return resumo
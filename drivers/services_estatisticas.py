@@ -0,0 +1,292 @@
+# drivers/services_estatisticas.py
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import ExtractYear
+
+from .models import EstatisticaMotorista, Motorista
+
+CAMPOS_CHAVE = ('status', 'estado', 'cnh_categoria')
+
+FAIXAS_ETARIAS = [(18, 25), (26, 35), (36, 45), (46, 55), (56, 65), (66, None)]
+
+
+def _linhas_agrupadas(queryset):
+    """
+    Uma única consulta GROUP BY (status, estado, cnh_categoria) com contagem e soma de salários.
+    O número de linhas retornadas depende apenas da quantidade de combinações, não do tamanho da tabela.
+    """
+    return (
+        queryset.order_by()
+        .values(*CAMPOS_CHAVE)
+        .annotate(
+            total=Count('id'),
+            total_com_salario=Count('salario'),
+            soma_salarios=Sum('salario'),
+        )
+    )
+
+
+def consolidar_estatisticas(linhas):
+    """
+    Consolida as linhas agrupadas por (status, estado, cnh_categoria) em totais
+    por status, por estado, por categoria e na folha de pagamento.
+    """
+    por_status = {}
+    por_estado = {}
+    por_categoria = {}
+    total_motoristas = 0
+    total_com_salario = 0
+    total_salarios = 0
+
+    for linha in linhas:
+        total = linha['total']
+        if not total:
+            continue
+
+        total_motoristas += total
+        total_com_salario += linha['total_com_salario']
+        total_salarios += linha['soma_salarios'] or 0
+
+        por_status[linha['status']] = por_status.get(linha['status'], 0) + total
+        por_estado[linha['estado']] = por_estado.get(linha['estado'], 0) + total
+        por_categoria[linha['cnh_categoria']] = por_categoria.get(linha['cnh_categoria'], 0) + total
+
+    salario_medio = total_salarios / total_com_salario if total_com_salario else 0
+
+    def ordenar(contagens, campo):
+        return [
+            {campo: chave, 'total': total}
+            for chave, total in sorted(contagens.items(), key=lambda item: -item[1])
+        ]
+
+    return {
+        'total_motoristas': total_motoristas,
+        'motoristas_ativos': por_status.get('ATIVO', 0),
+        'motoristas_inativos': por_status.get('INATIVO', 0),
+        'por_status': por_status,
+        'status_stats': ordenar(por_status, 'status'),
+        'estado_stats': ordenar(por_estado, 'estado'),
+        'categoria_stats': ordenar(por_categoria, 'cnh_categoria'),
+        'total_salarios': total_salarios,
+        'salario_medio': salario_medio,
+    }
+
+
+def calcular_estatisticas(queryset=None):
+    """
+    Calcula todas as estatísticas de motoristas (totais por status, estado e categoria CNH,
+    soma e média de salários).
+    Sem queryset, lê a tabela materializada EstatisticaMotorista (uma linha por combinação);
+    com um queryset filtrado, faz uma única passada GROUP BY sobre ele.
+    """
+    if queryset is None:
+        linhas = EstatisticaMotorista.objects.filter(total__gt=0).values(
+            *CAMPOS_CHAVE, 'total', 'total_com_salario', 'soma_salarios'
+        )
+        return consolidar_estatisticas(linhas)
+    return consolidar_estatisticas(_linhas_agrupadas(queryset))
+
+
+def registrar_delta(status, estado, cnh_categoria, total, total_com_salario=0, soma_salarios=0):
+    """Aplica um incremento (ou decremento) atômico aos contadores de uma combinação."""
+    chave = {'status': status, 'estado': estado, 'cnh_categoria': cnh_categoria}
+    incremento = {
+        'total': F('total') + total,
+        'total_com_salario': F('total_com_salario') + total_com_salario,
+        'soma_salarios': F('soma_salarios') + soma_salarios,
+    }
+    if EstatisticaMotorista.objects.filter(**chave).update(**incremento):
+        return
+
+    try:
+        with transaction.atomic():
+            EstatisticaMotorista.objects.create(
+                total=total, total_com_salario=total_com_salario, soma_salarios=soma_salarios, **chave
+            )
+    except IntegrityError:
+        # Outra transação criou a mesma combinação ao mesmo tempo
+        EstatisticaMotorista.objects.filter(**chave).update(**incremento)
+
+
+def registrar_motorista(status, estado, cnh_categoria, salario, sinal=1):
+    """Soma (sinal=1) ou subtrai (sinal=-1) um motorista dos contadores."""
+    registrar_delta(
+        status, estado, cnh_categoria,
+        total=sinal,
+        total_com_salario=sinal if salario is not None else 0,
+        soma_salarios=sinal * salario if salario is not None else 0,
+    )
+
+
+# ✅ Contadores globais do contexto dos templates: cache local do processo com TTL curto,
+# invalidado pelos signals de Motorista (alterações em massa esperam no máximo o TTL)
+_contadores_globais = {'valores': None, 'expira_em': 0.0}
+_trava_contadores = threading.Lock()
+
+
+def contadores_globais():
+    """Total de motoristas e total de ativos, lidos da tabela materializada (uma consulta pequena)."""
+    with _trava_contadores:
+        if _contadores_globais['valores'] is not None and time.monotonic() < _contadores_globais['expira_em']:
+            return _contadores_globais['valores']
+
+    totais = EstatisticaMotorista.objects.aggregate(
+        soma_total=Sum('total'),
+        soma_ativos=Sum('total', filter=Q(status='ATIVO')),
+    )
+    valores = {'total': totais['soma_total'] or 0, 'ativos': totais['soma_ativos'] or 0}
+    with _trava_contadores:
+        _contadores_globais['valores'] = valores
+        _contadores_globais['expira_em'] = time.monotonic() + getattr(settings, 'CONTADORES_GLOBAIS_TTL', 30)
+    return valores
+
+
+def invalidar_contadores_globais():
+    with _trava_contadores:
+        _contadores_globais['valores'] = None
+
+
+def _snapshot_por_chave():
+    return {
+        tuple(linha[campo] for campo in CAMPOS_CHAVE): linha
+        for linha in EstatisticaMotorista.objects.values(
+            *CAMPOS_CHAVE, 'total', 'total_com_salario', 'soma_salarios'
+        )
+    }
+
+
+def _real_por_chave():
+    return {
+        tuple(linha[campo] for campo in CAMPOS_CHAVE): linha
+        for linha in _linhas_agrupadas(Motorista.objects.all())
+    }
+
+
+def verificar_snapshot():
+    """
+    Compara os contadores materializados com a tabela de motoristas.
+    Retorna a lista de divergências (vazia quando está tudo consistente).
+    """
+    snapshot = _snapshot_por_chave()
+    real = _real_por_chave()
+    vazio = {'total': 0, 'total_com_salario': 0, 'soma_salarios': 0}
+
+    divergencias = []
+    for chave in sorted(set(snapshot) | set(real), key=lambda c: tuple(v or '' for v in c)):
+        esperado = real.get(chave, vazio)
+        atual = snapshot.get(chave, vazio)
+        for campo in ('total', 'total_com_salario', 'soma_salarios'):
+            if (esperado[campo] or 0) != (atual[campo] or 0):
+                divergencias.append({
+                    'chave': chave,
+                    'campo': campo,
+                    'esperado': esperado[campo] or 0,
+                    'atual': atual[campo] or 0,
+                })
+    return divergencias
+
+
+@transaction.atomic
+def recalcular_snapshot():
+    """Reconstrói a tabela EstatisticaMotorista do zero. Retorna o número de combinações gravadas."""
+    EstatisticaMotorista.objects.all().delete()
+    linhas = EstatisticaMotorista.objects.bulk_create([
+        EstatisticaMotorista(
+            total=linha['total'],
+            total_com_salario=linha['total_com_salario'],
+            soma_salarios=linha['soma_salarios'] or 0,
+            **{campo: linha[campo] for campo in CAMPOS_CHAVE}
+        )
+        for linha in _linhas_agrupadas(Motorista.objects.all())
+    ])
+    return len(linhas)
+
+
+def _contagem_por_idade(queryset, hoje):
+    """
+    Agrupa por (ano de nascimento, aniversário ainda não feito no ano corrente).
+    Cada grupo corresponde a exatamente uma idade, então o banco devolve no máximo
+    algumas centenas de linhas, sem carregar nenhum Motorista.
+    """
+    aniversario_pendente = Case(
+        When(
+            Q(data_nascimento__month__gt=hoje.month) |
+            Q(data_nascimento__month=hoje.month, data_nascimento__day__gt=hoje.day),
+            then=Value(1),
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    linhas = (
+        queryset.order_by()
+        .filter(data_nascimento__isnull=False)
+        .annotate(ano=ExtractYear('data_nascimento'), aniversario_pendente=aniversario_pendente)
+        .values('ano', 'aniversario_pendente')
+        .annotate(total=Count('id'))
+    )
+
+    contagem = {}
+    for linha in linhas:
+        idade = hoje.year - linha['ano'] - linha['aniversario_pendente']
+        contagem[idade] = contagem.get(idade, 0) + linha['total']
+    return contagem
+
+
+def _idade_na_posicao(idades_ordenadas, posicao):
+    acumulado = 0
+    for idade, total in idades_ordenadas:
+        acumulado += total
+        if posicao < acumulado:
+            return idade
+    return None
+
+
+def calcular_distribuicao_idades(queryset=None, hoje=None):
+    """
+    Calcula idade média, mediana e histograma por faixa etária direto no banco,
+    a partir de data_nascimento (compatível com SQLite e PostgreSQL).
+    """
+    if queryset is None:
+        queryset = Motorista.objects.all()
+    hoje = hoje or date.today()
+
+    contagem = _contagem_por_idade(queryset, hoje)
+    total = sum(contagem.values())
+
+    idade_media = None
+    idade_mediana = None
+    if total:
+        idades_ordenadas = sorted(contagem.items())
+        idade_media = sum(idade * quantidade for idade, quantidade in idades_ordenadas) / total
+        meio = total // 2
+        if total % 2:
+            idade_mediana = _idade_na_posicao(idades_ordenadas, meio)
+        else:
+            idade_mediana = (
+                _idade_na_posicao(idades_ordenadas, meio - 1) + _idade_na_posicao(idades_ordenadas, meio)
+            ) / 2
+
+    faixas = []
+    menores = sum(quantidade for idade, quantidade in contagem.items() if idade < FAIXAS_ETARIAS[0][0])
+    if menores:
+        faixas.append({'faixa': f'Menos de {FAIXAS_ETARIAS[0][0]}', 'total': menores})
+    for inicio, fim in FAIXAS_ETARIAS:
+        quantidade = sum(
+            q for idade, q in contagem.items() if idade >= inicio and (fim is None or idade <= fim)
+        )
+        faixas.append({'faixa': f'{inicio}–{fim}' if fim else f'{inicio}+', 'total': quantidade})
+
+    for faixa in faixas:
+        faixa['percentual'] = faixa['total'] * 100 / total if total else 0
+
+    return {
+        'total_com_idade': total,
+        'idade_media': idade_media,
+        'idade_mediana': idade_mediana,
+        'faixas_etarias': faixas,
+    }
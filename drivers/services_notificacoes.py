@@ -0,0 +1,214 @@
+# drivers/services_notificacoes.py
+import hashlib
+import json
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import NotificacaoPendente
+
+logger = logging.getLogger(__name__)
+
+MAX_TENTATIVAS = 6
+ESPERA_BASE_SEGUNDOS = 30
+ESPERA_MAXIMA_SEGUNDOS = 6 * 60 * 60
+TAMANHO_LOTE = 500
+
+
+def mensagem_novo_motorista(nome_motorista):
+    agora = datetime.now()
+    return (
+        f"🚗 *NOVO MOTORISTA CADASTRADO!*\n\n"
+        f"👤 *Nome:* {nome_motorista}\n"
+        f"📅 *Data:* {agora.strftime('%d/%m/%Y')}\n"
+        f"⏰ *Hora:* {agora.strftime('%H:%M:%S')}\n\n"
+        f"🔔 *Sistema:* MotoristaPower\n"
+        f"_Cadastro automático_"
+    )
+
+
+def enfileirar_notificacoes(novas):
+    """
+    Grava notificações na fila. `novas` é uma lista de dicts com motorista/nome_motorista,
+    mensagem e (opcional) destino e referencia. Referências já existentes são ignoradas.
+    Retorna quantas foram enfileiradas.
+    """
+    novas = list(novas)
+    referencias = [nova['referencia'] for nova in novas if nova.get('referencia')]
+    existentes = set()
+    for inicio in range(0, len(referencias), TAMANHO_LOTE):
+        existentes.update(NotificacaoPendente.objects.filter(
+            referencia__in=referencias[inicio:inicio + TAMANHO_LOTE]
+        ).values_list('referencia', flat=True))
+
+    objetos = []
+    for nova in novas:
+        referencia = nova.get('referencia')
+        if referencia and referencia in existentes:
+            continue
+        existentes.add(referencia)
+        objetos.append(NotificacaoPendente(**nova))
+
+    # ignore_conflicts cobre outra transação enfileirando a mesma referência ao mesmo tempo
+    NotificacaoPendente.objects.bulk_create(objetos, batch_size=TAMANHO_LOTE, ignore_conflicts=True)
+    return len(objetos)
+
+
+def enfileirar_notificacao(mensagem, motorista=None, nome_motorista=None, destino='', referencia=None):
+    return enfileirar_notificacoes([{
+        'motorista': motorista,
+        'nome_motorista': nome_motorista or (motorista.nome_completo if motorista else ''),
+        'mensagem': mensagem,
+        'destino': destino,
+        'referencia': referencia,
+    }])
+
+
+def reservar_notificacoes(tamanho=50, trabalhador=None):
+    """
+    Reserva atomicamente até `tamanho` notificações prontas para envio e as devolve.
+    Dois senders nunca recebem a mesma notificação:
+    - PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED, cada sender pula as linhas já travadas;
+    - SQLite: um único UPDATE ... WHERE id IN (SELECT ... LIMIT n) marcado com um token
+      (o SQLite serializa as escritas, então o UPDATE inteiro é atômico).
+    """
+    trabalhador = trabalhador or uuid.uuid4().hex
+    agora = timezone.now()
+    prontas = NotificacaoPendente.objects.filter(
+        status='PENDENTE', proxima_tentativa__lte=agora
+    ).order_by('proxima_tentativa', 'id')
+    reserva = {'status': 'PROCESSANDO', 'reservado_por': trabalhador, 'reservado_em': agora}
+
+    connection = connections[router.db_for_write(NotificacaoPendente)]
+    with transaction.atomic(using=connection.alias):
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(prontas.select_for_update(skip_locked=True).values_list('id', flat=True)[:tamanho])
+            NotificacaoPendente.objects.filter(id__in=ids).update(**reserva)
+        else:
+            NotificacaoPendente.objects.filter(
+                id__in=prontas.values('id')[:tamanho], status='PENDENTE'
+            ).update(**reserva)
+
+    return list(
+        NotificacaoPendente.objects.filter(reservado_por=trabalhador, status='PROCESSANDO')
+        .select_related('motorista').order_by('proxima_tentativa', 'id')
+    )
+
+
+def proxima_espera(tentativas):
+    """Backoff exponencial com jitter: 30s, 60s, 2min, 4min... até 6 horas."""
+    espera = min(ESPERA_BASE_SEGUNDOS * 2 ** (tentativas - 1), ESPERA_MAXIMA_SEGUNDOS)
+    return timedelta(seconds=espera * random.uniform(0.8, 1.2))
+
+
+def marcar_enviadas(notificacoes):
+    """Marca um grupo de notificações como enviadas com um único UPDATE."""
+    if not notificacoes:
+        return
+    agora = timezone.now()
+    NotificacaoPendente.objects.filter(
+        pk__in=[notificacao.pk for notificacao in notificacoes],
+        reservado_por=notificacoes[0].reservado_por,
+    ).update(status='ENVIADA', enviada_em=agora, tentativas=F('tentativas') + 1, ultimo_erro='')
+    for notificacao in notificacoes:
+        notificacao.status = 'ENVIADA'
+        notificacao.enviada_em = agora
+
+
+def marcar_enviada(notificacao):
+    marcar_enviadas([notificacao])
+
+
+def registrar_falha(notificacao, erro, max_tentativas=MAX_TENTATIVAS):
+    """Devolve a notificação à fila com backoff, ou marca como FALHOU ao atingir o limite de tentativas."""
+    tentativas = notificacao.tentativas + 1
+    campos = {'tentativas': tentativas, 'ultimo_erro': str(erro)[:2000]}
+    if tentativas >= max_tentativas:
+        campos['status'] = 'FALHOU'
+    else:
+        campos.update(status='PENDENTE', proxima_tentativa=timezone.now() + proxima_espera(tentativas),
+                      reservado_por='', reservado_em=None)
+    NotificacaoPendente.objects.filter(pk=notificacao.pk, reservado_por=notificacao.reservado_por).update(**campos)
+    for campo, valor in campos.items():
+        setattr(notificacao, campo, valor)
+
+
+def devolver_notificacoes(notificacoes):
+    """Devolve à fila, sem contar tentativa, notificações reservadas que não chegaram a ser enviadas."""
+    for notificacao in notificacoes:
+        NotificacaoPendente.objects.filter(
+            pk=notificacao.pk, reservado_por=notificacao.reservado_por, status='PROCESSANDO'
+        ).update(status='PENDENTE', reservado_por='', reservado_em=None)
+
+
+def liberar_travadas(minutos=15):
+    """Devolve à fila notificações reservadas por um sender que morreu no meio do lote."""
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return NotificacaoPendente.objects.filter(status='PROCESSANDO', reservado_em__lt=limite).update(
+        status='PENDENTE', reservado_por='', reservado_em=None
+    )
+
+
+def processar_notificacoes(enviar, tamanho=50, trabalhador=None):
+    """
+    Reserva um lote e chama enviar(notificacao) para cada item; exceções viram falhas com backoff.
+    Retorna (enviadas, falhas) — (0, 0) quando a fila está vazia.
+    """
+    enviadas = []
+    falhas = 0
+    try:
+        for notificacao in reservar_notificacoes(tamanho, trabalhador):
+            try:
+                enviar(notificacao)
+            except Exception as e:
+                logger.warning('Falha ao enviar notificação %s: %s', notificacao.pk, e)
+                registrar_falha(notificacao, e)
+                falhas += 1
+            else:
+                enviadas.append(notificacao)
+    finally:
+        # Um UPDATE por lote; se o processo morrer antes disso, liberar_travadas() devolve o lote à fila
+        marcar_enviadas(enviadas)
+    return len(enviadas), falhas
+
+
+def _data_legado(texto):
+    try:
+        return timezone.make_aware(datetime.strptime(texto, '%d/%m/%Y %H:%M:%S'))
+    except (TypeError, ValueError):
+        return None
+
+
+def importar_notificacoes_json(caminho, incluir_enviadas=False):
+    """
+    Importa o arquivo legado notificacoes_pendentes.json para a fila.
+    Pode ser rodado de novo: cada item ganha uma referência derivada do conteúdo.
+    Retorna (importadas, ignoradas).
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        legado = json.load(f)
+
+    novas = []
+    for item in legado:
+        if item.get('enviada') and not incluir_enviadas:
+            continue
+        referencia = item.get('referencia') or 'legado:' + hashlib.sha1(
+            f"{item.get('motorista')}|{item.get('data_hora')}|{item.get('mensagem')}".encode()
+        ).hexdigest()
+        nova = {
+            'nome_motorista': str(item.get('motorista') or '')[:100],
+            'mensagem': item.get('mensagem') or '',
+            'referencia': referencia,
+            'created_at': _data_legado(item.get('data_hora')) or timezone.now(),
+        }
+        if item.get('enviada'):
+            nova.update(status='ENVIADA', enviada_em=_data_legado(item.get('data_envio')))
+        novas.append(nova)
+
+    importadas = enfileirar_notificacoes(novas)
+    return importadas, len(legado) - importadas
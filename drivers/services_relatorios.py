@@ -0,0 +1,123 @@
+# drivers/services_relatorios.py
+import logging
+import tempfile
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from . import cache_relatorios
+from .models import Motorista, ReportJob
+from .relatorios import gerar_excel_estatisticas, gerar_excel_motoristas, gerar_pdf_motoristas
+from .replicas import lendo_da_replica
+
+logger = logging.getLogger(__name__)
+
+# tipo -> (nome do arquivo, content type)
+ARQUIVOS_RELATORIO = {
+    'EXCEL': ('relatorio_motoristas.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'PDF': ('relatorio_motoristas.pdf', 'application/pdf'),
+    'ESTATISTICAS': ('estatisticas_motoristas.xlsx',
+                     'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+def enfileirar_relatorio(tipo, usuario=None, parametros=None, impressao_digital=''):
+    """
+    Cria um ReportJob pendente; o arquivo é gerado pelo worker processar_relatorios.
+    Se o mesmo relatório (mesma impressão digital) já está na fila, devolve esse job.
+    """
+    if impressao_digital:
+        em_andamento = ReportJob.objects.filter(
+            impressao_digital=impressao_digital, status__in=['PENDENTE', 'PROCESSANDO'],
+        ).first()
+        if em_andamento is not None:
+            return em_andamento
+    return ReportJob.objects.create(
+        tipo=tipo,
+        solicitado_por=usuario if usuario and usuario.is_authenticated else None,
+        parametros=cache_relatorios.normalizar_parametros(parametros),
+        impressao_digital=impressao_digital,
+    )
+
+
+def reservar_proximo_job():
+    """
+    Reserva o job pendente mais antigo. O UPDATE condicional garante que dois
+    workers nunca processem o mesmo job.
+    """
+    while True:
+        job = ReportJob.objects.filter(status='PENDENTE').order_by('created_at').first()
+        if job is None:
+            return None
+        reservado = ReportJob.objects.filter(pk=job.pk, status='PENDENTE').update(
+            status='PROCESSANDO', iniciado_em=timezone.now()
+        )
+        if reservado:
+            job.refresh_from_db()
+            return job
+
+
+def reenfileirar_travados(minutos=30):
+    """Devolve à fila jobs que ficaram em PROCESSANDO (worker interrompido no meio)."""
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return ReportJob.objects.filter(status='PROCESSANDO', iniciado_em__lt=limite).update(
+        status='PENDENTE', iniciado_em=None
+    )
+
+
+def gerar_arquivo_relatorio(tipo, arquivo, parametros):
+    """Escreve o relatório do tipo pedido em um arquivo aberto. Retorna o total de motoristas."""
+    if tipo == 'ESTATISTICAS':
+        return gerar_excel_estatisticas(arquivo)
+
+    motoristas = Motorista.objects.filtrar(
+        status=parametros.get('status'),
+        search=parametros.get('search'),
+    ).order_by('nome_completo', 'id')
+
+    if tipo == 'PDF':
+        return gerar_pdf_motoristas(arquivo, motoristas)
+    return gerar_excel_motoristas(arquivo, motoristas)
+
+
+@lendo_da_replica()
+def gerar_relatorio_em_cache(tipo, parametros):
+    """
+    Devolve (impressão digital, nome relativo a MEDIA_ROOT) do relatório, gerando-o só se os dados
+    mudaram. A impressão é calculada no mesmo banco de onde os dados são lidos (a réplica, se houver):
+    um arquivo nunca fica guardado sob uma impressão mais nova do que o seu conteúdo.
+    """
+    impressao = cache_relatorios.impressao_digital(tipo, parametros)
+    if cache_relatorios.buscar(tipo, impressao) is None:
+        with tempfile.TemporaryFile() as arquivo:
+            gerar_arquivo_relatorio(tipo, arquivo, parametros)
+            arquivo.seek(0)
+            cache_relatorios.guardar(tipo, impressao, arquivo)
+    return impressao, cache_relatorios.nome_em_cache(tipo, impressao)
+
+
+def processar_job(job):
+    """Gera (ou reaproveita do cache) o arquivo do job e registra status, duração e tamanho."""
+    inicio = time.monotonic()
+    if job.status != 'PROCESSANDO':
+        job.status = 'PROCESSANDO'
+        job.iniciado_em = timezone.now()
+        job.save(update_fields=['status', 'iniciado_em'])
+
+    try:
+        job.impressao_digital, job.arquivo.name = gerar_relatorio_em_cache(job.tipo, job.parametros)
+        job.tamanho_bytes = job.arquivo.size
+        job.status = 'CONCLUIDO'
+        job.erro = ''
+    except Exception as e:
+        logger.exception('Erro ao gerar relatório %s', job.pk)
+        job.status = 'ERRO'
+        job.erro = str(e)
+
+    job.duracao_segundos = time.monotonic() - inicio
+    job.concluido_em = timezone.now()
+    job.save(update_fields=[
+        'arquivo', 'impressao_digital', 'tamanho_bytes', 'status', 'erro', 'duracao_segundos', 'concluido_em',
+    ])
+    return job
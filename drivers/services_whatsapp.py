@@ -1,170 +1,206 @@
 # drivers/services_whatsapp.py
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-from datetime import datetime
-import time
+from functools import lru_cache
+from pathlib import Path
 import os
 
+from .services_notificacoes import mensagem_novo_motorista
 
-def enviar_whatsapp_real(nome_motorista):
-    """
-    Envia mensagem REAL para seu WhatsApp - VERSAO CORRIGIDA
-    """
-    driver = None
-    try:
-        print("")
-        print("📱 INICIANDO ENVIO WHATSAPP REAL...")
-        print("=" * 60)
+WHATSAPP_URL = os.environ.get('WHATSAPP_URL', 'https://web.whatsapp.com')
+WHATSAPP_CONTATO = os.environ.get('WHATSAPP_CONTATO', 'Eu')
 
-        # ✅ CONFIGURAR CHROME - VERSAO SIMPLIFICADA
-        chrome_options = Options()
+# Página local que imita os seletores do WhatsApp Web (para testar sem celular nem internet)
+STUB_WHATSAPP = Path(__file__).resolve().parent / 'whatsapp_stub.html'
 
-        # NOVO: Re-introduzir modo headless para rodar em servidores (sem GUI)
-        chrome_options.add_argument("--headless") # ← RE-INSERIDO
+SELETOR_BUSCA = (By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]')
+SELETOR_MENSAGEM = (By.XPATH, '//div[@contenteditable="true"][@data-tab="10"]')
+SELETOR_ENVIAR = (By.XPATH, '//button[@data-tab="11"]')
 
-        # Configurações básicas
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1200,800")
 
-        # Diretório para salvar sessão (evita scan repetido)
-        session_dir = os.path.join(os.getcwd(), 'whatsapp_session')
-        os.makedirs(session_dir, exist_ok=True)
-        chrome_options.add_argument(f"--user-data-dir={session_dir}")
-        chrome_options.add_argument("--profile-directory=Default")
+def seletor_conversa(contato):
+    return By.XPATH, f'//span[@title="{contato}"]'
 
-        print("🚀 Iniciando Chrome...")
 
-        # ✅ INICIAR CHROME - VERSAO SIMPLES
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
-        )
+class SessaoWhatsAppErro(Exception):
+    """Falha de sessão (login expirado, navegador fechado, página fora do ar)."""
 
-        print("✅ Chrome iniciado com sucesso!")
-        print("🌐 Abrindo WhatsApp Web...")
 
-        # ✅ ABRIR WHATSAPP WEB
-        driver.get("https://web.whatsapp.com")
+@lru_cache(maxsize=None)
+def caminho_chromedriver():
+    # ✅ Resolve o chromedriver uma vez por processo (o install() consulta a internet)
+    return os.environ.get('CHROMEDRIVER_PATH') or ChromeDriverManager().install()
 
-        # Aguardar carregamento
-        wait = WebDriverWait(driver, 60)  # 60 segundos para QR Code
 
-        print("⏳ Aguardando autenticação...")
-        print("")
-        print("📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱")
-        print("🚨 IMPORTANTE: ESCANEIE O QR CODE NO NAVEGADOR!")
-        print("📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱 📱")
-        print("")
-        print("💡 Dica: Marque 'Manter conectado' para evitar scans futuros")
-        print("⏰ Você tem 60 segundos para escanear...")
-
-        # ✅ AGUARDAR ATÉ ESTAR LOGADO
-        try:
-            search_box = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]'))
-            )
-            print("")
-            print("✅ ✅ ✅ WhatsApp Web logado com sucesso! ✅ ✅ ✅")
-
-        except Exception as e:
-            print("")
-            print("❌ ❌ ❌ Timeout - QR Code não escaneado em 60 segundos ❌ ❌ ❌")
-            print("💡 Dica: Execute novamente e escaneie mais rápido")
-            driver.quit()
-            return False
-
-        # ✅ BUSCAR CONVERSA
-        print("🔍 Buscando conversa 'Eu'...")
-        search_box.clear()
-        search_box.send_keys("Eu")
+class SessaoWhatsApp:
+    """
+    Uma sessão autenticada do WhatsApp Web mantida aberta entre mensagens.
 
-        time.sleep(3)
+    O Chrome é iniciado uma vez, o login é aguardado uma vez e cada envio só espera
+    os elementos ficarem prontos (sem time.sleep fixo). Se a sessão cair, garantir()
+    fecha o navegador e abre outro com o mesmo perfil, sem precisar de novo QR Code.
+    """
 
-        # ✅ CLICAR NA CONVERSA
-        try:
-            chat = wait.until(
-                EC.element_to_be_clickable((By.XPATH, '//span[@title="Eu"]'))
-            )
-            chat.click()
-            print("✅ Conversa 'Eu' selecionada!")
-
-        except Exception as e:
-            print("❌ Conversa 'Eu' não encontrada")
-            print("💡 Verifique se tem uma conversa com você mesmo")
-            driver.quit()
-            return False
+    def __init__(self, url=None, contato=None, headless=True, session_dir=None,
+                 timeout_login=60, timeout=15):
+        self.url = url or WHATSAPP_URL
+        self.contato = contato or WHATSAPP_CONTATO
+        self.headless = headless
+        # Diretório para salvar sessão (evita scan repetido)
+        self.session_dir = session_dir or os.path.join(os.getcwd(), 'whatsapp_session')
+        self.timeout_login = timeout_login
+        self.timeout = timeout
+        self.driver = None
+        self.conversa_aberta = None
+        self.mensagens_enviadas = 0
+        self.reinicios = 0
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+    def _opcoes_chrome(self):
+        chrome_options = Options()
+        if self.headless:
+            # Modo headless para rodar em servidores (sem GUI)
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--window-size=1200,800")
 
-        time.sleep(2)
+        if not self.url.startswith('file:'):
+            os.makedirs(self.session_dir, exist_ok=True)
+            chrome_options.add_argument(f"--user-data-dir={self.session_dir}")
+            chrome_options.add_argument("--profile-directory=Default")
+        return chrome_options
 
-        # ✅ ENCONTRAR CAIXA DE MENSAGEM
-        print("⌨️  Procurando caixa de mensagem...")
-        try:
-            message_box = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="10"]'))
-            )
-            print("✅ Caixa de mensagem encontrada!")
-
-        except Exception as e:
-            print("❌ Caixa de mensagem não encontrada")
-            driver.quit()
-            return False
+    def _aguardar(self, condicao, timeout=None):
+        return WebDriverWait(self.driver, timeout or self.timeout).until(condicao)
 
-        # ✅ MENSAGEM FORMATADA
-        mensagem = (
-            f"🚗 *NOVO MOTORISTA CADASTRADO!*\n\n"
-            f"👤 *Nome:* {nome_motorista}\n"
-            f"📅 *Data:* {datetime.now().strftime('%d/%m/%Y')}\n"
-            f"⏰ *Hora:* {datetime.now().strftime('%H:%M:%S')}\n\n"
-            f"🔔 *Sistema:* MotoristaPower\n"
-            f"_Cadastro automático_"
+    def iniciar(self):
+        """Abre o Chrome e espera o login (QR Code na primeira vez, sessão salva nas seguintes)."""
+        print("🚀 Iniciando Chrome...")
+        self.driver = webdriver.Chrome(
+            service=Service(caminho_chromedriver()),
+            options=self._opcoes_chrome()
         )
+        self.conversa_aberta = None
 
-        print("💬 Digitando mensagem...")
-        message_box.send_keys(mensagem)
-        time.sleep(2)
+        print(f"🌐 Abrindo {self.url}...")
+        self.driver.get(self.url)
 
-        # ✅ ENVIAR MENSAGEM
-        print("📤 Enviando mensagem...")
+        print("⏳ Aguardando autenticação...")
+        print(f"🚨 Se for o primeiro acesso, escaneie o QR Code (você tem {self.timeout_login} segundos)")
         try:
-            send_button = driver.find_element(By.XPATH, '//button[@data-tab="11"]')
-            send_button.click()
-            print("✅ Mensagem enviada com sucesso!")
+            self._aguardar(EC.presence_of_element_located(SELETOR_BUSCA), self.timeout_login)
+        except TimeoutException:
+            self.encerrar()
+            raise SessaoWhatsAppErro(f"Timeout - login não concluído em {self.timeout_login} segundos")
+        print("✅ WhatsApp Web logado com sucesso!")
+
+    def encerrar(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+        self.driver = None
+        self.conversa_aberta = None
 
-        except Exception as e:
-            print("❌ Botão enviar não encontrado, tentando com ENTER...")
-            from selenium.webdriver.common.keys import Keys
-            message_box.send_keys(Keys.ENTER)
-            print("✅ Mensagem enviada com ENTER!")
+    def saudavel(self):
+        """Health check: navegador respondendo e caixa de busca presente (sessão ainda logada)."""
+        if self.driver is None:
+            return False
+        try:
+            return bool(self.driver.find_elements(*SELETOR_BUSCA))
+        except WebDriverException:
+            return False
 
-        # ✅ CONFIRMAR ENVIO
-        time.sleep(5)
+    def garantir(self):
+        """Recupera a sessão se o navegador caiu ou o login expirou."""
+        if self.saudavel():
+            return
+        if self.driver is not None:
+            print("🔁 Sessão do WhatsApp indisponível, reiniciando navegador...")
+            self.reinicios += 1
+        self.encerrar()
+        self.iniciar()
+
+    def abrir_conversa(self, contato):
+        if self.conversa_aberta == contato:
+            return
+        busca = self._aguardar(EC.element_to_be_clickable(SELETOR_BUSCA))
+        busca.clear()
+        busca.send_keys(contato)
+        try:
+            self._aguardar(EC.element_to_be_clickable(seletor_conversa(contato))).click()
+            self._aguardar(EC.element_to_be_clickable(SELETOR_MENSAGEM))
+        except TimeoutException:
+            raise SessaoWhatsAppErro(f"Conversa '{contato}' não encontrada")
+        self.conversa_aberta = contato
+
+    def enviar(self, mensagem, contato=None):
+        """
+        Envia uma mensagem pela sessão aberta e espera a caixa de texto esvaziar (confirmação do envio).
+        Levanta SessaoWhatsAppErro ou WebDriverException em caso de falha.
+        """
+        contato = contato or self.contato
+        self.garantir()
+        try:
+            self.abrir_conversa(contato)
+            caixa = self._aguardar(EC.element_to_be_clickable(SELETOR_MENSAGEM))
+
+            # Shift+Enter quebra a linha; Enter sozinho enviaria cada linha como uma mensagem
+            linhas = mensagem.split('\n')
+            for i, linha in enumerate(linhas):
+                if linha:
+                    caixa.send_keys(linha)
+                if i < len(linhas) - 1:
+                    caixa.send_keys(Keys.SHIFT, Keys.ENTER)
+
+            botoes = self.driver.find_elements(*SELETOR_ENVIAR)
+            if botoes:
+                botoes[0].click()
+            else:
+                caixa.send_keys(Keys.ENTER)
+
+            self._aguardar(lambda driver: not caixa.text.strip())
+        except (TimeoutException, WebDriverException):
+            # Estado da página desconhecido: a próxima mensagem reabre a conversa
+            self.conversa_aberta = None
+            raise
+
+        self.mensagens_enviadas += 1
+        return True
 
-        # ✅ FECHAR NAVEGADOR
-        print("🔒 Fechando navegador...")
-        driver.quit()
 
+def enviar_whatsapp_real(nome_motorista):
+    """
+    Envia a mensagem de novo cadastro abrindo uma sessão só para ela.
+    Para várias mensagens, use o comando whatsapp_daemon (mantém a sessão aberta).
+    """
+    try:
         print("")
+        print("📱 INICIANDO ENVIO WHATSAPP REAL...")
+        print("=" * 60)
+        with SessaoWhatsApp() as sessao:
+            sessao.enviar(mensagem_novo_motorista(nome_motorista))
         print("🎉 🎉 🎉 WHATSAPP ENVIADO COM SUCESSO! 🎉 🎉 🎉")
         print("=" * 60)
-        print("")
-
         return True
 
     except Exception as e:
         print(f"❌ ERRO: {e}")
-
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
-
         return False
 
 
@@ -185,4 +221,4 @@ def testar_whatsapp():
 
 
 if __name__ == "__main__":
-    testar_whatsapp()
\ No newline at end of file
+    testar_whatsapp()
@@ -0,0 +1,95 @@
+# drivers/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .imagens import remover_renditions
+from .models import Motorista
+from .pos_cadastro import agendar_pos_cadastro
+from .services_cache import invalidar_cache_motoristas_apos_commit
+from .services_estatisticas import invalidar_contadores_globais, registrar_motorista
+
+CAMPOS_ESTATISTICA = ('status', 'estado', 'cnh_categoria', 'salario')
+
+
+def _valores_estatistica(motorista):
+    return tuple(getattr(motorista, campo) for campo in CAMPOS_ESTATISTICA)
+
+
+def _afeta_estatisticas(update_fields):
+    return update_fields is None or any(campo in update_fields for campo in CAMPOS_ESTATISTICA)
+
+
+def _afeta_foto(update_fields):
+    return update_fields is None or 'foto' in update_fields
+
+
+@receiver(pre_save, sender=Motorista)
+def guardar_valores_anteriores(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda status/estado/categoria/salário e a foto atuais do banco para detectar transições no post_save."""
+    instance._estatistica_anterior = None
+    instance._foto_anterior = None
+    if raw or instance._state.adding or not instance.pk:
+        return
+    if not _afeta_estatisticas(update_fields) and not _afeta_foto(update_fields):
+        return
+    anterior = Motorista.objects.filter(pk=instance.pk).values_list(*CAMPOS_ESTATISTICA, 'foto').first()
+    if anterior is not None:
+        instance._estatistica_anterior = anterior[:-1]
+        instance._foto_anterior = anterior[-1] or ''
+
+
+@receiver(post_save, sender=Motorista)
+def atualizar_estatisticas_ao_salvar(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _afeta_estatisticas(update_fields):
+        return
+
+    novo = _valores_estatistica(instance)
+    anterior = getattr(instance, '_estatistica_anterior', None)
+    instance._estatistica_anterior = None
+
+    if not created and anterior is not None:
+        if anterior == novo:
+            return
+        registrar_motorista(*anterior, sinal=-1)
+    registrar_motorista(*novo, sinal=1)
+    # Após o commit: antes dele outra thread ainda leria (e guardaria) os contadores antigos
+    transaction.on_commit(invalidar_contadores_globais)
+
+
+@receiver(post_delete, sender=Motorista)
+def atualizar_estatisticas_ao_excluir(sender, instance, **kwargs):
+    registrar_motorista(*_valores_estatistica(instance), sinal=-1)
+    transaction.on_commit(invalidar_contadores_globais)
+
+
+@receiver(post_save, sender=Motorista)
+@receiver(post_delete, sender=Motorista)
+def invalidar_cache_ao_alterar(sender, instance, raw=False, **kwargs):
+    # Qualquer alteração (inclusive nome, foto, CNH) muda o que os fragmentos do dashboard exibem
+    if not raw:
+        invalidar_cache_motoristas_apos_commit()
+
+
+@receiver(post_delete, sender=Motorista)
+def remover_fotos_reduzidas(sender, instance, **kwargs):
+    if instance.foto:
+        remover_renditions(instance.foto.name, instance.foto.storage)
+
+
+@receiver(post_save, sender=Motorista)
+def processar_foto_alterada(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Foto nova ou trocada: agenda a tarefa FOTO e remove as renditions da foto anterior após o commit."""
+    anterior = '' if created else getattr(instance, '_foto_anterior', None)
+    instance._foto_anterior = None
+    # anterior None: o pre_save não leu a foto (update_fields sem 'foto' ou linha já excluída)
+    if raw or anterior is None or not _afeta_foto(update_fields):
+        return
+    atual = instance.foto.name or ''
+    if atual == anterior:
+        return
+    if anterior:
+        storage = instance.foto.storage
+        transaction.on_commit(lambda: remover_renditions(anterior, storage))
+    if atual:
+        agendar_pos_cadastro(instance, ['FOTO'])
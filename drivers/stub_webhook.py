@@ -0,0 +1,58 @@
+# drivers/stub_webhook.py
+"""
+Servidor HTTP local que imita um gateway de notificações (para testes e benchmark offline).
+Responde 200 ou, numa fração configurável das requisições, 500; pode atrasar cada resposta.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        servidor = self.server
+        corpo = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if servidor.atraso:
+            time.sleep(servidor.atraso)
+
+        falhar = servidor.taxa_falhas and random.random() < servidor.taxa_falhas
+        with servidor.trava:
+            servidor.requisicoes += 1
+            if falhar:
+                servidor.falhas += 1
+            else:
+                servidor.chaves.add(self.headers.get('Idempotency-Key') or corpo)
+
+        self.send_response(500 if falhar else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps({'ok': not falhar}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class StubWebhook(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fila de conexões maior que o padrão (5) para aguentar despachantes com muita concorrência
+    request_queue_size = 256
+
+    def __init__(self, host='127.0.0.1', porta=0, taxa_falhas=0.0, atraso=0.0):
+        super().__init__((host, porta), _Handler)
+        self.taxa_falhas = taxa_falhas
+        self.atraso = atraso
+        self.trava = threading.Lock()
+        self.requisicoes = 0
+        self.falhas = 0
+        self.chaves = set()
+
+    @property
+    def url(self):
+        host, porta = self.server_address[:2]
+        return f'http://{host}:{porta}/'
+
+    def iniciar_em_thread(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
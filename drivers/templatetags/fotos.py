@@ -0,0 +1,38 @@
+from django import template
+from django.utils.html import format_html
+
+from drivers.imagens import TAMANHOS, url_rendition
+
+register = template.Library()
+
+
+@register.filter
+def rendition(foto, tamanho='mini'):
+    """URL JPEG da foto reduzida: {{ motorista.foto|rendition:"pequena" }}"""
+    return url_rendition(foto, tamanho, 'jpeg')
+
+
+@register.simple_tag
+def foto_motorista(motorista, tamanho='mini', classe='', exibir=None):
+    """
+    <picture> com WebP e JPEG reduzidos da foto do motorista, carregado sob demanda:
+    {% foto_motorista motorista 'mini' 'rounded-circle' 40 %}
+    `exibir` é a largura/altura em CSS pixels (padrão: metade do tamanho da rendition).
+    """
+    foto = getattr(motorista, 'foto', None)
+    if not foto:
+        return ''
+    exibir = exibir or TAMANHOS[tamanho] // 2
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}">'
+        '<img src="{}" alt="Foto de {}" class="{}" width="{}" height="{}" loading="lazy" decoding="async"'
+        ' style="object-fit: cover;">'
+        '</picture>',
+        url_rendition(foto, tamanho, 'webp'),
+        url_rendition(foto, tamanho, 'jpeg'),
+        motorista.nome_completo,
+        classe,
+        exibir,
+        exibir,
+    )
@@ -0,0 +1,179 @@
+# drivers/transportes.py
+"""
+Transportes de notificação usados pelo despachante (drivers/despachante.py).
+
+Cada transporte implementa `async enviar(notificacao)` e declara quantos envios
+simultâneos aguenta, quantos por segundo e o timeout de cada envio. Uma exceção
+(ou o timeout) conta como falha e a notificação volta para a fila com backoff.
+"""
+import asyncio
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+class ErroTransporte(Exception):
+    """Envio recusado pelo destino (ex.: webhook respondeu com erro)."""
+
+
+class Transporte:
+    nome = ''
+    concorrencia = 10
+    por_segundo = None
+    timeout = 30.0
+
+    def __init__(self, concorrencia=None, por_segundo=None, timeout=None):
+        if concorrencia is not None:
+            self.concorrencia = concorrencia
+        if por_segundo is not None:
+            self.por_segundo = por_segundo
+        if timeout is not None:
+            self.timeout = timeout
+
+    async def abrir(self):
+        pass
+
+    async def fechar(self):
+        pass
+
+    async def enviar(self, notificacao):
+        raise NotImplementedError
+
+
+class TransporteConsole(Transporte):
+    """Só imprime a mensagem (o antigo modo "SIMULAÇÃO")."""
+    nome = 'console'
+    concorrencia = 1
+
+    async def enviar(self, notificacao):
+        print(f"👤 Motorista: {notificacao.nome_motorista}")
+        print(f"📅 Data: {notificacao.created_at:%d/%m/%Y %H:%M:%S}")
+        print("💬 Mensagem:")
+        print(notificacao.mensagem)
+        print("✅ SIMULAÇÃO: Mensagem seria enviada agora")
+        print("-" * 40)
+
+
+class TransporteMemoria(Transporte):
+    """Fake em memória para testes e benchmarks: guarda as mensagens e pode simular atraso e falhas."""
+    nome = 'memoria'
+    concorrencia = 100
+
+    def __init__(self, atraso=0.0, falhar_a_cada=0, **kwargs):
+        super().__init__(**kwargs)
+        self.atraso = atraso
+        self.falhar_a_cada = falhar_a_cada
+        self.tentativas = 0
+        self.enviadas = []
+
+    async def enviar(self, notificacao):
+        self.tentativas += 1
+        tentativa = self.tentativas
+        if self.atraso:
+            await asyncio.sleep(self.atraso)
+        if self.falhar_a_cada and tentativa % self.falhar_a_cada == 0:
+            raise ErroTransporte('Falha simulada')
+        self.enviadas.append(notificacao.pk)
+
+
+class TransporteWebhook(Transporte):
+    """
+    POST JSON para uma URL (gateway de WhatsApp/SMS, n8n, etc.).
+    Usa urllib em threads para não adicionar dependência; respostas fora de 2xx são falha.
+    """
+    nome = 'webhook'
+    concorrencia = 20
+
+    def __init__(self, url=None, token=None, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url or getattr(settings, 'NOTIFICACOES_WEBHOOK_URL', '')
+        self.token = token or getattr(settings, 'NOTIFICACOES_WEBHOOK_TOKEN', '')
+        if not self.url:
+            raise ValueError('Defina NOTIFICACOES_WEBHOOK_URL para usar o transporte webhook.')
+        self.executor = None
+
+    async def abrir(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.concorrencia, thread_name_prefix='webhook')
+
+    async def fechar(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _post(self, corpo, chave):
+        cabecalhos = {'Content-Type': 'application/json', 'Idempotency-Key': chave}
+        if self.token:
+            cabecalhos['Authorization'] = f'Bearer {self.token}'
+        requisicao = urllib.request.Request(self.url, data=corpo, headers=cabecalhos, method='POST')
+        try:
+            with urllib.request.urlopen(requisicao, timeout=self.timeout) as resposta:
+                resposta.read()
+        except urllib.error.HTTPError as e:
+            raise ErroTransporte(f'HTTP {e.code} de {self.url}')
+
+    async def enviar(self, notificacao):
+        corpo = json.dumps({
+            'id': notificacao.pk,
+            'motorista': notificacao.nome_motorista,
+            'destino': notificacao.destino,
+            'mensagem': notificacao.mensagem,
+            'referencia': notificacao.referencia,
+        }, ensure_ascii=False).encode('utf-8')
+        chave = notificacao.referencia or f'notificacao-{notificacao.pk}'
+        await asyncio.get_running_loop().run_in_executor(self.executor, self._post, corpo, chave)
+
+
+class TransporteWhatsAppWeb(Transporte):
+    """
+    Envia pela sessão persistente do WhatsApp Web (services_whatsapp.SessaoWhatsApp).
+    O Selenium não é thread-safe: todos os envios passam por uma única thread, um de cada vez.
+    """
+    nome = 'whatsapp'
+    concorrencia = 1
+    timeout = 90.0
+
+    def __init__(self, url=None, contato=None, headless=True, **kwargs):
+        super().__init__(**kwargs)
+        self.opcoes_sessao = {'url': url, 'contato': contato, 'headless': headless}
+        self.sessao = None
+        self.executor = None
+
+    async def abrir(self):
+        from .services_whatsapp import SessaoWhatsApp
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='whatsapp')
+        self.sessao = SessaoWhatsApp(**self.opcoes_sessao)
+
+    async def fechar(self):
+        if self.executor:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.sessao.encerrar)
+            self.executor.shutdown(wait=False)
+
+    def _enviar(self, mensagem):
+        try:
+            self.sessao.enviar(mensagem)
+        except Exception:
+            # Força reabrir o navegador no próximo envio (garantir() refaz a sessão)
+            self.sessao.encerrar()
+            raise
+
+    async def enviar(self, notificacao):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self._enviar, notificacao.mensagem)
+
+
+TRANSPORTES = {
+    transporte.nome: transporte
+    for transporte in (TransporteConsole, TransporteMemoria, TransporteWebhook, TransporteWhatsAppWeb)
+}
+
+
+def criar_transporte(nome=None, **opcoes):
+    """Instancia o transporte pelo nome (padrão: settings.NOTIFICACOES_TRANSPORTE)."""
+    nome = nome or getattr(settings, 'NOTIFICACOES_TRANSPORTE', 'console')
+    try:
+        classe = TRANSPORTES[nome]
+    except KeyError:
+        raise ValueError(f"Transporte desconhecido: {nome} (opções: {', '.join(TRANSPORTES)})")
+    return classe(**{chave: valor for chave, valor in opcoes.items() if valor is not None})
@@ -30,4 +30,11 @@ urlpatterns = [
     path('relatorios/excel/', views.relatorio_excel, name='relatorio_excel'),
     path('relatorios/pdf/', views.relatorio_pdf, name='relatorio_pdf'),
     path('relatorios/estatisticas-excel/', views.relatorio_estatisticas_excel, name='relatorio_estatisticas_excel'),
+    path('relatorios/csv/', views.relatorio_csv, name='relatorio_csv'),
+    path('relatorios/ndjson/', views.relatorio_ndjson, name='relatorio_ndjson'),
+
+    # 🔐 PRIVADO: Acompanhamento dos relatórios gerados em segundo plano (só admin)
+    path('relatorios/jobs/<int:pk>/', views.relatorio_job, name='relatorio_job'),
+    path('relatorios/jobs/<int:pk>/status/', views.relatorio_job_status, name='relatorio_job_status'),
+    path('relatorios/jobs/<int:pk>/download/', views.relatorio_job_download, name='relatorio_job_download'),
 ]
\ No newline at end of file
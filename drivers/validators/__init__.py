@@ -0,0 +1,24 @@
+import re
+from django.core.exceptions import ValidationError
+
+# ✅ O dígito verificador do CPF tem uma implementação só, em cpf_validators
+from .cpf_validators import cpf_valido, validar_cpfs, validate_cpf, verificar_cpf
+
+
+def formatar_cpf(cpf):
+    """
+    Formata o CPF para exibição: 000.000.000-00
+    """
+    cpf = re.sub(r'[^0-9]', '', str(cpf))
+    if len(cpf) == 11:
+        return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+    return cpf
+
+
+def validar_categoria_cnh(value):
+    """
+    Valida se a categoria da CNH é E
+    """
+    if value and value != 'E':
+        raise ValidationError('Somente categoria E é permitida.')
+    return value
@@ -1,50 +1,141 @@
 # C:\APPY\MotoristaPower\drivers\validators\cpf_validators.py
-# NENHUMA LINHA DE IMPORTAÇÃO DEVE SER COLOCADA AQUI ALÉM DESTAS ABAIXO.
+# Implementação única do dígito verificador do CPF (formulário, importação, API e auditoria).
+# O DRF é importado só quando pedido: o formulário e os comandos não dependem dele.
 
 import re
 from django.core.exceptions import ValidationError
-from rest_framework.serializers import ValidationError as DRFValidationError
 
+_numpy = None
 
-def clean_cpf_numbers(cpf: str) -> str:
-    """Remove caracteres não numéricos do CPF."""
-    # Garante que, se o CPF for None, retorne uma string vazia para o re.sub funcionar
-    return re.sub(r'\D', '', cpf or '')
+PESOS_PRIMEIRO = tuple(range(10, 1, -1))
+PESOS_SEGUNDO = tuple(range(11, 1, -1))
 
+# Remove a pontuação usual ("000.000.000-00") sem regex
+_PONTUACAO = str.maketrans('', '', '.-/ ')
+# Só 0-9: \d aceitaria dígitos de outros alfabetos
+_NAO_DIGITOS = re.compile(r'[^0-9]')
+# Posições no formato 000.000.000-00
+_COLUNAS_PONTO = [3, 7]
+_COLUNAS_DIGITOS = [0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13]
 
-def calc_cpf_digit(nums):
-    """Calcula um dígito verificador do CPF."""
-    # O range gera os pesos (10 a 2 ou 11 a 2)
-    s = sum(int(n) * w for n, w in zip(nums, range(len(nums) + 1, 1, -1)))
-    r = (s * 10) % 11
-    return r if r < 10 else 0
+# Resultado da verificação -> mensagem (None = válido)
+MENSAGENS = {
+    'tamanho': 'CPF deve ter 11 dígitos.',
+    'repetido': 'CPF inválido: Dígitos sequenciais não são permitidos.',
+    'digito': 'CPF inválido: Dígitos verificadores incorretos.',
+}
 
 
-def validate_cpf(value, is_drf_validation=False):
+def _somente_digitos(valor):
+    cpf = str(valor or '').translate(_PONTUACAO)
+    if len(cpf) == 11 and cpf.isdigit() and cpf.isascii():
+        return cpf
+    return _NAO_DIGITOS.sub('', str(valor or ''))
+
+
+def verificar_cpf(valor):
+    """Caminho rápido escalar: None se o CPF é válido, senão 'tamanho', 'repetido' ou 'digito'."""
+    cpf = _somente_digitos(valor)
+    if len(cpf) != 11:
+        return 'tamanho'
+    if cpf == cpf[0] * 11:
+        return 'repetido'
+    digitos = [ord(c) - 48 for c in cpf]
+    primeiro = sum(d * p for d, p in zip(digitos, PESOS_PRIMEIRO)) * 10 % 11 % 10
+    segundo = sum(d * p for d, p in zip(digitos, PESOS_SEGUNDO)) * 10 % 11 % 10
+    if digitos[9] != primeiro or digitos[10] != segundo:
+        return 'digito'
+    return None
+
+
+def cpf_valido(valor):
+    return verificar_cpf(valor) is None
+
+
+def carregar_numpy():
     """
-    Valida a estrutura e os dígitos verificadores do CPF.
-    Aceita um valor opcional para usar ValidationError do DRF.
+    NumPy é importado só na primeira validação em lote: o formulário de cadastro importa este
+    módulo e não deve pagar ~100 ms de boot por isso. Retorna None se o NumPy não estiver instalado.
     """
-    cpf = clean_cpf_numbers(value)
-    # Define a classe de erro a ser usada (Django padrão ou DRF)
-    ErrorClass = DRFValidationError if is_drf_validation else ValidationError
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - sem NumPy, validar_cpfs usa o caminho em Python puro
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
 
-    if len(cpf) != 11:
-        raise ErrorClass('CPF deve ter 11 dígitos.')
 
-    # 1. Checagem de CPFs com todos os dígitos iguais (ex: 111.111.111-11)
-    if cpf == cpf[0] * 11:
-        raise ErrorClass('CPF inválido: Dígitos sequenciais não são permitidos.')
+def _matriz_formatados(valores, np):
+    """
+    Caminho todo vetorizado para o formato gravado no banco (000.000.000-00): a lista inteira vira
+    uma matriz n x 14 de bytes e as colunas de dígitos são recortadas. None se algum valor fugir disso.
+    """
+    if not all(type(valor) is str and len(valor) == 14 for valor in valores):
+        return None
+    texto = ''.join(valores)
+    if not texto.isascii():
+        return None
+    bruto = np.frombuffer(texto.encode('ascii'), dtype=np.uint8).reshape(-1, 14)
+    if not ((bruto[:, _COLUNAS_PONTO] == ord('.')).all() and (bruto[:, 11] == ord('-')).all()):
+        return None
+    digitos = bruto[:, _COLUNAS_DIGITOS] - 48
+    if (digitos > 9).any():
+        return None
+    return digitos
 
-    # 2. Cálculo do primeiro dígito verificador (usando os primeiros 9 dígitos)
-    first_expected = calc_cpf_digit(cpf[:9])
 
-    # 3. Cálculo do segundo dígito verificador (usando os 9 + o primeiro verificado)
-    second_expected = calc_cpf_digit(cpf[:9] + str(first_expected))
+def _validar_digitos_numpy(np, digitos, tamanho_ok):
+    # Produtos escalares com os pesos (int32: 9 * 11 * 10 cabe folgado)
+    soma1 = digitos[:, :9].astype(np.int32) @ np.array(PESOS_PRIMEIRO, dtype=np.int32)
+    soma2 = digitos[:, :10].astype(np.int32) @ np.array(PESOS_SEGUNDO, dtype=np.int32)
+    primeiro = soma1 * 10 % 11 % 10
+    segundo = soma2 * 10 % 11 % 10
 
-    # 4. Comparação
-    if int(cpf[9]) != first_expected or int(cpf[10]) != second_expected:
-        raise ErrorClass('CPF inválido: Dígitos verificadores incorretos.')
+    repetido = (digitos == digitos[:, :1]).all(axis=1)
+    return tamanho_ok & ~repetido & (digitos[:, 9] == primeiro) & (digitos[:, 10] == segundo)
+
+
+def _validar_cpfs_numpy(np, valores):
+    digitos = _matriz_formatados(valores, np)
+    if digitos is not None:
+        return _validar_digitos_numpy(np, digitos, np.ones(len(valores), dtype=bool))
+
+    cpfs = [_somente_digitos(valor) for valor in valores]
+    tamanho_ok = np.fromiter((len(cpf) == 11 for cpf in cpfs), dtype=bool, count=len(cpfs))
+    # Linhas com tamanho errado viram zeros (reprovados como "repetido" e depois pela máscara)
+    texto = ''.join(cpf if ok else '00000000000' for cpf, ok in zip(cpfs, tamanho_ok))
+    digitos = (np.frombuffer(texto.encode('ascii'), dtype=np.uint8) - 48).reshape(-1, 11)
+    return _validar_digitos_numpy(np, digitos, tamanho_ok)
+
+
+def validar_cpfs(valores):
+    """
+    Valida uma sequência de CPFs (com ou sem pontuação) de uma vez.
+    Retorna uma lista de bool na mesma ordem. Com NumPy, os dígitos viram uma matriz uint8 (n x 11)
+    e os verificadores saem de dois produtos escalares; sem NumPy, usa o caminho escalar.
+    """
+    valores = list(valores)
+    if not valores:
+        return []
+    np = carregar_numpy()
+    if np is None:
+        return [verificar_cpf(valor) is None for valor in valores]
+    return _validar_cpfs_numpy(np, valores).tolist()
+
+
+def validate_cpf(value, is_drf_validation=False):
+    """
+    Valida a estrutura e os dígitos verificadores do CPF.
+    Aceita um valor opcional para usar ValidationError do DRF.
+    """
+    erro = verificar_cpf(value)
+    if erro is None:
+        # ✅ Se passou, retorna o valor original (com pontuações, se houver)
+        return value
 
-    # ✅ Se passou, retorna o valor original (com pontuações, se houver)
-    return value
\ No newline at end of file
+    if is_drf_validation:
+        from rest_framework.serializers import ValidationError as DRFValidationError
+        raise DRFValidationError(MENSAGENS[erro])
+    raise ValidationError(MENSAGENS[erro])
@@ -1,29 +1,29 @@
 import logging
-import io
-import threading
+import os
 from datetime import datetime, date
 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, UpdateView, DeleteView, TemplateView
-from django.urls import reverse_lazy
-from django.db.models import Count, Q, Sum, Avg
-from django.db import IntegrityError
-from django.http import HttpResponse
+from django.urls import reverse, reverse_lazy
+from django.db import IntegrityError, transaction
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-
+from . import cache_relatorios
 from .forms import MotoristaForm
-from .models import Motorista
+from .models import Motorista, ReportJob
+from .paginacao import PaginaCursor, paginar_por_cursor
+from .pos_cadastro import TAREFAS, agendar_pos_cadastro
+from .replicas import LeituraReplicaMixin, banco_leitura, ler_da_replica
+from .relatorios import stream_csv_motoristas, stream_ndjson_motoristas
+from .services_relatorios import ARQUIVOS_RELATORIO, enfileirar_relatorio, processar_job
+from .services_cache import cache_pagina_anonima, estatisticas_em_cache, versao_motoristas
+from .services_estatisticas import calcular_distribuicao_idades, calcular_estatisticas
 
 # Configuração de logger
 logger = logging.getLogger(__name__)
@@ -31,11 +31,13 @@ logger = logging.getLogger(__name__)
 
 # ✅ NOVAS VIEWS PÚBLICAS (SEM LOGIN)
 
+@cache_pagina_anonima
 def pagina_inicial(request):
     """Página inicial pública - qualquer um acessa sem login"""
     return render(request, 'drivers/pagina_inicial.html')
 
 
+@cache_pagina_anonima
 def pagina_sucesso(request):
     """Página de sucesso após cadastro - pública"""
     return render(request, 'drivers/sucesso.html')
@@ -58,7 +60,11 @@ def cadastro_motorista(request):
                 else:
                     motorista.user = None
 
-                motorista.save()
+                # ✅ Notificação e demais efeitos rodam após o commit, fora da requisição
+                with transaction.atomic():
+                    motorista.save()
+                    # A tarefa FOTO já foi agendada pelo post_save (só quando há foto)
+                    agendar_pos_cadastro(motorista, [tipo for tipo in TAREFAS if tipo != 'FOTO'])
 
                 messages.success(request, f"✅ Motorista {motorista.nome_completo} cadastrado com sucesso!")
 
@@ -79,7 +85,7 @@ def cadastro_motorista(request):
 
 # 🔐 VIEWS PRIVADAS (COM LOGIN REQUIRED)
 
-class DashboardView(LoginRequiredMixin, TemplateView):
+class DashboardView(LeituraReplicaMixin, LoginRequiredMixin, TemplateView):
     template_name = 'drivers/dashboard.html'
     login_url = '/accounts/login/'
 
@@ -89,31 +95,29 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         # Se não for Staff, ele não deveria ver esta view, mas o LoginRequiredMixin já protege o acesso.
         # Motoristas comuns (não staff) que logarem, verão o dashboard, mas com dados limitados se for o caso.
 
-        total_motoristas = Motorista.objects.count()
-        motoristas_ativos = Motorista.objects.filter(status='ATIVO').count()
-        motoristas_inativos = Motorista.objects.filter(status='INATIVO').count()
-        estados_stats = Motorista.objects.values('estado').annotate(
-            total=Count('id')
-        ).order_by('-total')[:5]
+        # ✅ Estatísticas e blocos em cache pela versão dos dados: só consulta o banco depois de uma alteração
+        stats = estatisticas_em_cache()
         ultimos_cadastros = Motorista.objects.all().order_by('-created_at')[:5]
 
         context.update({
-            'total_motoristas': total_motoristas,
-            'motoristas_ativos': motoristas_ativos,
-            'motoristas_inativos': motoristas_inativos,
-            'estados_stats': estados_stats,
+            'versao_motoristas': versao_motoristas(),
+            'cache_fragmentos_ttl': settings.CACHE_FRAGMENTOS_TTL,
+            'total_motoristas': stats['total_motoristas'],
+            'motoristas_ativos': stats['motoristas_ativos'],
+            'motoristas_inativos': stats['motoristas_inativos'],
+            'estados_stats': stats['estado_stats'][:5],
             'ultimos_cadastros': ultimos_cadastros,
         })
 
         return context
 
 
-class MotoristaListView(LoginRequiredMixin, ListView):
+class MotoristaListView(LeituraReplicaMixin, LoginRequiredMixin, ListView):
     model = Motorista
     template_name = 'drivers/motorista_list.html'
     context_object_name = 'motoristas'
     paginate_by = 10
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
     login_url = '/accounts/login/'
 
     def get_queryset(self):
@@ -126,32 +130,36 @@ class MotoristaListView(LoginRequiredMixin, ListView):
                 return Motorista.objects.none()
 
         # Admin/Staff veem todos, aplicando filtros de busca
-        queryset = super().get_queryset()
-        status = self.request.GET.get('status')
-        if status:
-            queryset = queryset.filter(status=status)
         search = self.request.GET.get('search')
+        queryset = super().get_queryset().filtrar(
+            status=self.request.GET.get('status'),
+            search=search,
+        )
         if search:
-            queryset = queryset.filter(
-                Q(nome_completo__icontains=search) |
-                Q(cpf__icontains=search) |
-                Q(cnh_numero__icontains=search) |
-                Q(cidade__icontains=search)
-            )
+            queryset = queryset.por_relevancia(search)
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        # Busca ordenada por relevância continua com paginação numerada (poucos resultados)
+        if self.request.GET.get('search'):
+            return super().paginate_queryset(queryset, page_size)
+
+        # ✅ Navegação por cursor em (created_at, id): sem OFFSET e sem COUNT(*) por página
+        pagina = paginar_por_cursor(queryset, self.request.GET.get('cursor'), page_size)
+        return None, pagina, pagina.object_list, pagina.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['modo_cursor'] = isinstance(context.get('page_obj'), PaginaCursor)
         # O Superusuário (is_staff=True) vê o total geral.
         if self.request.user.is_staff:
-            context['total_motoristas'] = Motorista.objects.count()
-            context['motoristas_ativos'] = Motorista.objects.filter(status='ATIVO').count()
-            context['motoristas_inativos'] = Motorista.objects.filter(status='INATIVO').count()
+            stats = estatisticas_em_cache()
         else:
             # O Motorista Comum (is_staff=False) vê apenas seu registro (0 ou 1)
-            context['total_motoristas'] = self.get_queryset().count()
-            context['motoristas_ativos'] = self.get_queryset().filter(status='ATIVO').count()
-            context['motoristas_inativos'] = self.get_queryset().filter(status='INATIVO').count()
+            stats = calcular_estatisticas(self.object_list)
+        context['total_motoristas'] = stats['total_motoristas']
+        context['motoristas_ativos'] = stats['motoristas_ativos']
+        context['motoristas_inativos'] = stats['motoristas_inativos']
 
         context['current_status'] = self.request.GET.get('status', '')
         context['current_search'] = self.request.GET.get('search', '')
@@ -183,7 +191,9 @@ class MotoristaUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         motorista = form.save(commit=False)
         if not motorista.user:
             motorista.user = self.request.user
-        motorista.save()
+        with transaction.atomic():
+            # Foto trocada: o post_save agenda as miniaturas novas e remove as antigas
+            motorista.save()
 
         messages.success(self.request, 'Motorista atualizado com sucesso!')
         return redirect(self.get_success_url())
@@ -223,23 +233,20 @@ def lista_motoristas(request):
 
 
 @login_required
+@ler_da_replica
 def relatorio_estatisticas(request):
     if not request.user.is_staff:
         messages.error(request, "Acesso negado. Apenas administradores podem ver as estatísticas.")
         return redirect('drivers:dashboard')
 
-    total_motoristas = Motorista.objects.count()
-    status_stats = Motorista.objects.values('status').annotate(total=Count('id')).order_by('-total')
-    estado_stats = Motorista.objects.values('estado').annotate(total=Count('id')).order_by('-total')
-    categoria_stats = Motorista.objects.values('cnh_categoria').annotate(total=Count('id')).order_by('-total')
-    total_salarios = Motorista.objects.filter(salario__isnull=False).aggregate(total=Sum('salario'))['total'] or 0
-    salario_medio = Motorista.objects.filter(salario__isnull=False).aggregate(medio=Avg('salario'))['medio'] or 0
+    stats = estatisticas_em_cache()
+    total_motoristas = stats['total_motoristas']
+    total_salarios = stats['total_salarios']
+    salario_medio = stats['salario_medio']
 
-    idade_media = None
-    if total_motoristas > 0:
-        idades = [motorista.idade for motorista in Motorista.objects.all() if motorista.data_nascimento]
-        if idades:
-            idade_media = sum(idades) / len(idades)
+    idades = calcular_distribuicao_idades() if total_motoristas > 0 else None
+    idade_media = idades['idade_media'] if idades else None
+    idade_mediana = idades['idade_mediana'] if idades else None
 
     if salario_medio:
         salario_medio = f'{salario_medio:,.2f}'
@@ -248,235 +255,175 @@ def relatorio_estatisticas(request):
 
     context = {
         'total_motoristas': total_motoristas,
-        'status_stats': status_stats,
-        'estado_stats': estado_stats,
-        'categoria_stats': categoria_stats,
+        'motoristas_ativos': stats['motoristas_ativos'],
+        'motoristas_inativos': stats['motoristas_inativos'],
+        'status_stats': stats['status_stats'],
+        'estado_stats': stats['estado_stats'],
+        'categoria_stats': stats['categoria_stats'],
+        'motoristas_por_estado': stats['estado_stats'],
+        'motoristas_por_categoria': stats['categoria_stats'],
+        'data_geracao': datetime.now().strftime('%d/%m/%Y às %H:%M'),
         'total_salarios': total_salarios,
         'salario_medio': salario_medio,
         'idade_media': f'{idade_media:.2f}' if idade_media else None,
+        'idade_mediana': f'{idade_mediana:.1f}' if idade_mediana else None,
+        'faixas_etarias': idades['faixas_etarias'] if idades else [],
     }
 
     return render(request, 'drivers/relatorio_estatisticas.html', context)
 
 
-@login_required
-def relatorio_excel(request):
-    if not request.user.is_staff:
-        messages.error(request, "Acesso negado. Apenas administradores podem gerar relatórios.")
-        return redirect('drivers:dashboard')
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Relatório Motoristas"
-
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    center_align = Alignment(horizontal='center', vertical='center')
-
-    ws.merge_cells('A1:L1')
-    ws['A1'] = "RELATÓRIO DE MOTORISTAS - MOTORISTAPOWER"
-    ws['A1'].font = Font(bold=True, size=16, color="366092")
-    ws['A1'].alignment = center_align
-
-    ws.merge_cells('A2:L2')
-    ws['A2'] = f"Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
-    ws['A2'].alignment = center_align
-
-    headers = ['ID', 'Nome', 'CPF', 'Data Nasc.', 'Idade', 'Telefone', 'Cidade/UF',
-               'CNH', 'Categoria', 'Status', 'Salário', 'Data Cadastro']
-
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=4, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
-
-    motoristas = Motorista.objects.all().order_by('nome_completo')
-    row = 4
-    for row_num, motorista in enumerate(motoristas, 5):
-        ws.cell(row=row_num, column=1, value=motorista.id)
-        ws.cell(row=row_num, column=2, value=motorista.nome_completo or 'NÃO INFORMADO')
-        ws.cell(row=row_num, column=3, value=motorista.cpf_formatado)
-        ws.cell(row=row_num, column=4,
-                value=motorista.data_nascimento.strftime('%d/%m/%Y') if motorista.data_nascimento else '')
-        ws.cell(row=row_num, column=5, value=motorista.idade)
-        ws.cell(row=row_num, column=6, value=motorista.telefone or '')
-        ws.cell(row=row_num, column=7, value=f"{motorista.cidade or ''}/{motorista.estado or ''}")
-        ws.cell(row=row_num, column=8, value=motorista.cnh_numero or '')
-        ws.cell(row=row_num, column=9, value=motorista.cnh_categoria or '')
-        ws.cell(row=row_num, column=10, value=motorista.get_status_display())
-        ws.cell(row=row_num, column=11, value=float(motorista.salario) if motorista.salario else 0)
-        ws.cell(row=row_num, column=12, value=motorista.created_at.strftime('%d/%m/%Y %H:%M'))
-        row = row_num
-
-    column_widths = [8, 30, 15, 12, 8, 15, 15, 15, 10, 12, 12, 18]
-    for col, width in enumerate(column_widths, 1):
-        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = width
-
-    ws.merge_cells(f'A{row + 2}:L{row + 2}')
-    ws.cell(row=row + 2, column=1, value=f"TOTAL DE MOTORISTAS: {motoristas.count()}")
-    ws.cell(row=row + 2, column=1).font = Font(bold=True, color="366092")
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="relatorio_motoristas.xlsx"'
-
-    wb.save(response)
+def _servir_relatorio(request, tipo, caminho, impressao=''):
+    """
+    Entrega o arquivo com ETag (impressão digital) e Last-Modified (data da geração).
+    Se o navegador já tem esta versão (If-None-Match / If-Modified-Since), responde 304 sem corpo.
+    """
+    nome_arquivo, content_type = ARQUIVOS_RELATORIO[tipo]
+    etag = f'"{impressao}"' if impressao else None
+    ultima_modificacao = int(os.path.getmtime(caminho))
+
+    response = get_conditional_response(request, etag=etag, last_modified=ultima_modificacao)
+    if response is None:
+        response = FileResponse(open(caminho, 'rb'), as_attachment=True, filename=nome_arquivo,
+                                content_type=content_type)
+    if etag:
+        response['ETag'] = etag
+    response['Last-Modified'] = http_date(ultima_modificacao)
+    # Só staff baixa relatórios: nada de cache compartilhado, e o navegador sempre revalida
+    patch_cache_control(response, private=True, no_cache=True)
     return response
 
 
-@login_required
-def relatorio_pdf(request):
+def _solicitar_relatorio(request, tipo, parametros=None):
+    """
+    Entrega o relatório do cache se nenhum motorista do recorte mudou desde a última geração;
+    senão enfileira a geração e leva o usuário para a página de acompanhamento.
+    """
     if not request.user.is_staff:
         messages.error(request, "Acesso negado. Apenas administradores podem gerar relatórios.")
         return redirect('drivers:dashboard')
 
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(
-        name='Center',
-        alignment=1,
-        fontSize=14,
-        spaceAfter=30
-    ))
-
-    elements = []
-
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#366092'),
-        alignment=1,
-        spaceAfter=30
-    )
+    impressao = cache_relatorios.impressao_digital(tipo, parametros)
+    # O navegador já tem exatamente esta versão (mesmo que o arquivo tenha saído do cache)
+    nao_modificado = get_conditional_response(request, etag=f'"{impressao}"')
+    if nao_modificado is not None:
+        nao_modificado['ETag'] = f'"{impressao}"'
+        return nao_modificado
+    caminho = cache_relatorios.buscar(tipo, impressao)
+    if caminho is not None:
+        return _servir_relatorio(request, tipo, caminho, impressao)
 
-    elements.append(Paragraph("RELATÓRIO DE MOTORISTAS", title_style))
-    elements.append(Paragraph(f"<b>MotoristaPower</b> - Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}",
-                              styles['Center']))
-    elements.append(Spacer(1, 20))
-
-    motoristas = Motorista.objects.all().order_by('nome_completo')
-
-    if motoristas:
-        data = [['ID', 'Nome', 'CPF', 'Idade', 'Cidade/UF', 'Status', 'CNH']]
-
-        for motorista in enumerate(motoristas):
-            data.append([
-                str(motorista.id),
-                motorista.nome_completo or 'NÃO INFORMADO',
-                motorista.cpf_formatado,
-                str(motorista.idade),
-                f"{motorista.cidade or ''}/{motorista.estado or ''}",
-                motorista.get_status_display(),
-                motorista.cnh_categoria or 'N/I'
-            ])
-
-        table = Table(data, colWidths=[0.5 * inch, 2 * inch, 1.2 * inch, 0.6 * inch, 1 * inch, 0.8 * inch, 0.6 * inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (0, -1), 1, colors.black),
-            ('GRID', (1, 0), (-1, -1), 1, colors.black)
-        ]))
-
-        elements.append(table)
-        elements.append(Spacer(1, 20))
-
-        elements.append(Paragraph(f"<b>Total de Motoristas:</b> {motoristas.count()}", styles['Normal']))
-        elements.append(Paragraph(f"<b>Ativos:</b> {motoristas.filter(status='ATIVO').count()}", styles['Normal']))
-        elements.append(Paragraph(f"<b>Inativos:</b> {motoristas.filter(status='INATIVO').count()}", styles['Normal']))
+    job = enfileirar_relatorio(tipo, request.user, parametros, impressao)
 
-    else:
-        elements.append(Paragraph("Nenhum motorista cadastrado.", styles['Normal']))
+    # Sem worker rodando (ex.: desenvolvimento local), gera na própria requisição
+    if not settings.RELATORIOS_EM_SEGUNDO_PLANO:
+        processar_job(job)
 
-    doc.build(elements)
+    return redirect('drivers:relatorio_job', pk=job.pk)
 
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="relatorio_motoristas.pdf"'
-    response.write(buffer.getvalue())
-    buffer.close()
 
-    return response
+@login_required
+def relatorio_excel(request):
+    # ✅ Mesmos filtros da lista de motoristas, para exportar só um recorte
+    return _solicitar_relatorio(request, 'EXCEL', {
+        'status': request.GET.get('status'),
+        'search': request.GET.get('search'),
+    })
+
+
+@login_required
+def relatorio_pdf(request):
+    return _solicitar_relatorio(request, 'PDF', {
+        'status': request.GET.get('status'),
+        'search': request.GET.get('search'),
+    })
 
 
 @login_required
 def relatorio_estatisticas_excel(request):
+    return _solicitar_relatorio(request, 'ESTATISTICAS')
+
+
+def _motoristas_para_exportacao(request):
+    # O streaming percorre o cursor depois que a view retorna: o banco é fixado aqui
+    return Motorista.objects.using(banco_leitura(Motorista)).filtrar(
+        status=request.GET.get('status'),
+        search=request.GET.get('search'),
+    ).order_by('id')
+
+
+@login_required
+@ler_da_replica
+def relatorio_csv(request):
+    """Exportação CSV em streaming: as linhas saem do cursor direto para a resposta"""
     if not request.user.is_staff:
         messages.error(request, "Acesso negado. Apenas administradores podem gerar relatórios.")
         return redirect('drivers:dashboard')
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Estatísticas"
-
-    header_font = Font(bold=True, color="FFFFFF", size=14)
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    center_align = Alignment(horizontal='center', vertical='center')
-
-    ws.merge_cells('A1:E1')
-    ws['A1'] = "RELATÓRIO ESTATÍSTICO - MOTORISTAPOWER"
-    ws['A1'].font = header_font
-    ws['A1'].fill = header_fill
-    ws['A1'].alignment = center_align
+    response = StreamingHttpResponse(
+        stream_csv_motoristas(_motoristas_para_exportacao(request)),
+        content_type='text/csv; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'attachment; filename="motoristas.csv"'
+    return response
 
-    ws.merge_cells('A2:E2')
-    ws['A2'] = f"Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
-    ws['A2'].alignment = center_align
 
-    total_motoristas = Motorista.objects.count()
-    ativos = Motorista.objects.filter(status='ATIVO').count()
-    inativos = Motorista.objects.filter(status='INATIVO').count()
-    total_salarios = Motorista.objects.filter(salario__isnull=False).aggregate(total=Sum('salario'))['total'] or 0
+@login_required
+@ler_da_replica
+def relatorio_ndjson(request):
+    """Exportação NDJSON (um objeto JSON por linha) em streaming, para o pipeline de BI"""
+    if not request.user.is_staff:
+        return JsonResponse({'erro': 'Acesso negado.'}, status=403)
 
-    ws['A4'] = "ESTATÍSTICAS GERAIS"
-    ws['A4'].font = Font(bold=True, size=12)
+    return StreamingHttpResponse(
+        stream_ndjson_motoristas(_motoristas_para_exportacao(request)),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
 
-    total_salarios_formatado = f'R$ {total_salarios:,.2f}' if isinstance(total_salarios, (int, float)) else 'R$ 0,00'
 
-    data_geral = [
-        ['Total de Motoristas', total_motoristas],
-        ['Motoristas Ativos', ativos],
-        ['Motoristas Inativos', inativos],
-        ['Folha de Pagamento Total', total_salarios_formatado],
-    ]
+@login_required
+def relatorio_job(request, pk):
+    """Página de acompanhamento de um relatório em segundo plano"""
+    if not request.user.is_staff:
+        messages.error(request, "Acesso negado. Apenas administradores podem gerar relatórios.")
+        return redirect('drivers:dashboard')
 
-    for row, (label, value) in enumerate(data_geral, 5):
-        ws.cell(row=row, column=1, value=label)
-        ws.cell(row=row, column=2, value=value)
-        ws.cell(row=row, column=1).font = Font(bold=True)
+    job = get_object_or_404(ReportJob, pk=pk)
+    return render(request, 'drivers/relatorio_job.html', {'job': job})
 
-    ws['A10'] = "DISTRIBUIÇÃO POR ESTADO"
-    ws['A10'].font = Font(bold=True, size=12)
 
-    estados = Motorista.objects.values('estado').annotate(total=Count('id')).order_by('-total')
-    for row, estado in enumerate(estados, 11):
-        ws.cell(row=row, column=1, value=estado['estado'] or 'NÃO INFORMADO')
-        ws.cell(row=row, column=2, value=estado['total'])
+@login_required
+def relatorio_job_status(request, pk):
+    """Endpoint de polling (JSON) com a situação do relatório"""
+    if not request.user.is_staff:
+        return JsonResponse({'erro': 'Acesso negado.'}, status=403)
 
-    ws['D10'] = "DISTRIBUIÇÃO POR CATEGORIA CNH"
-    ws['D10'].font = Font(bold=True, size=12)
+    job = get_object_or_404(ReportJob, pk=pk)
+    return JsonResponse({
+        'id': job.pk,
+        'tipo': job.tipo,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'tamanho_bytes': job.tamanho_bytes,
+        'duracao_segundos': job.duracao_segundos,
+        'erro': job.erro,
+        'download_url': reverse('drivers:relatorio_job_download', args=[job.pk]) if job.status == 'CONCLUIDO' else None,
+    })
 
-    categorias = Motorista.objects.values('cnh_categoria').annotate(total=Count('id')).order_by('-total')
-    for row, categoria in enumerate(categorias, 11):
-        ws.cell(row=row, column=4, value=categoria['cnh_categoria'] or 'NÃO INFORMADA')
-        ws.cell(row=row, column=5, value=categoria['total'])
 
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['D'].width = 25
-    ws.column_dimensions['E'].width = 15
+@login_required
+def relatorio_job_download(request, pk):
+    if not request.user.is_staff:
+        messages.error(request, "Acesso negado. Apenas administradores podem gerar relatórios.")
+        return redirect('drivers:dashboard')
 
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="estatisticas_motoristas.xlsx"'
+    job = get_object_or_404(ReportJob, pk=pk)
+    if job.status != 'CONCLUIDO' or not job.arquivo:
+        raise Http404('Relatório ainda não está pronto.')
 
-    wb.save(response)
-    return response
\ No newline at end of file
+    caminho = job.arquivo.path
+    try:
+        cache_relatorios.marcar_acesso(caminho)
+    except FileNotFoundError:
+        raise Http404('O arquivo deste relatório foi removido do cache. Solicite o relatório novamente.')
+    return _servir_relatorio(request, job.tipo, caminho, job.impressao_digital)
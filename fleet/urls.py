@@ -25,6 +25,9 @@ urlpatterns = [
     # 🚗 App Drivers (o namespace 'drivers' é definido no drivers/urls.py com app_name)
     path('drivers/', include('drivers.urls')),
 
+    # 🚚 API de leitura dos motoristas (Django REST Framework)
+    path('api/', include('drivers.api_urls')),
+
     # 🏠 Página inicial (raiz) redireciona para o dashboard
     path('', redirect_to_dashboard_or_create, name='home'),
 ]